@@ -0,0 +1,85 @@
+"""
+Раскрытие кронов в процессе против пула процессов ``CronExpander``.
+
+Запуск из ``backend``::
+
+    python -m benchmarks.cron_expander --counts 10000 100000 1000000 --workers 4
+"""
+
+import argparse
+import asyncio
+import functools
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from benchmarks.cron_matcher import _expressions
+from maxhack.core.cron import CronExpander, CronTable
+
+
+async def _measure[T](title: str, func: Callable[[], Awaitable[T]]) -> T:
+    started = time.perf_counter()
+    result = await func()
+    elapsed = time.perf_counter() - started
+    print(f"{title:<40} {elapsed:10.3f} s")
+    return result
+
+
+async def _heartbeat(stop: asyncio.Event) -> float:
+    """Самая долгая пауза цикла событий, пока идёт подсчёт."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - started - 0.01)
+    return worst
+
+
+async def _run(expander: CronExpander, table: CronTable, minutes: int) -> None:
+    left = datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop))
+    await asyncio.sleep(0)
+    counts = await expander.fire_counts(table, left, minutes)
+    rows, _ = await expander.fire_times(table, left, minutes)
+    stop.set()
+    print(
+        f"  срабатываний: {int(counts.sum())} / {len(rows)}, "
+        f"пауза цикла событий: {await heartbeat * 1000:.0f} ms",
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    in_process = CronExpander(workers=1)
+    pool = CronExpander(workers=args.workers, threshold=0)
+    # запуск процессов пула не должен попадать в замеры
+    warmup = CronTable.from_expressions(["* * * * *"] * 64)
+    await pool.fire_counts(warmup, datetime.now(UTC), 1)
+
+    try:
+        for count in args.counts:
+            table = CronTable.from_expressions(_expressions(count, rnd))
+            print(f"{count} кронов, окно {args.minutes} мин")
+            for title, expander in (
+                ("в процессе", in_process),
+                ("пул процессов", pool),
+            ):
+                await _measure(
+                    title,
+                    functools.partial(_run, expander, table, args.minutes),
+                )
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Сравнение скомпилированных кронов с pycron.
+
+Запуск из ``backend``::
+
+    pip install pycron
+    python -m benchmarks.cron_matcher --count 1000000
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from maxhack.core.cron import CronTable, compile_cron
+from maxhack.utils.utils import create_cron_expression
+
+
+def _expressions(count: int, rnd: random.Random) -> list[str]:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    expressions = []
+    for _ in range(count):
+        date = start + timedelta(minutes=rnd.randrange(366 * 24 * 60))
+        flags = [False, False, False]
+        kind = rnd.randrange(4)
+        if kind < len(flags):
+            flags[kind] = True
+        expressions.append(create_cron_expression(date, *flags))
+    return expressions
+
+
+def _measure[T](title: str, func: Callable[[], T]) -> T:
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{title:<40} {elapsed:10.3f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    expressions = _expressions(args.count, rnd)
+    shifts = np.array(
+        [rnd.choice((0, 15, 60, 1440)) for _ in expressions],
+        dtype=np.int64,
+    )
+    left = datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+    right = left + timedelta(minutes=1)
+    print(f"{args.count} выражений, окно [{left}, {right})")
+
+    table = _measure(
+        "compile + pack (CronTable)",
+        lambda: CronTable.from_expressions(expressions),
+    )
+    fired = _measure(
+        "CronTable.fired_between",
+        lambda: table.fired_between(left, right, shifts),
+    )
+
+    def next_after_all() -> None:
+        for expression in expressions:
+            compile_cron(expression).next_after(left)
+
+    _measure("CompiledCron.next_after", next_after_all)
+
+    try:
+        import pycron
+    except ImportError:
+        print("pycron не установлен, сравнение пропущено")
+        return
+
+    def pycron_all() -> list[bool]:
+        return [
+            pycron.has_been(
+                expression,
+                since=left + timedelta(minutes=int(shift)),
+                dt=right + timedelta(minutes=int(shift) - 1),
+            )
+            for expression, shift in zip(expressions, shifts, strict=True)
+        ]
+
+    expected = _measure("pycron.has_been", pycron_all)
+    mismatches = int(np.count_nonzero(fired != np.array(expected)))
+    print(f"сработало: {int(fired.sum())}, расхождений с pycron: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Стоимость сборки напоминаний в рассылке тика: ``MaxMailer.event_notify``
+целиком - группировка по получателям, сборка сообщений и клавиатур -
+с отправкой напрямую и через очередь исходящих сообщений.
+
+Отправка и очередь подменены заглушками, так что измеряется только наша
+часть. Запуск из ``backend``::
+
+    python -m benchmarks.notify_render --recipients 10000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+from maxhack.config import MaxConfig
+from maxhack.core.enums.notify_mode import NotifyMode
+from maxhack.core.event.models import EventNotification
+from maxhack.core.ids import (
+    EventId,
+    EventNotifyId,
+    MaxChatId,
+    NotifyDeliveryId,
+    UserId,
+)
+from maxhack.core.max.mass_mailer import MaxMailer
+from maxhack.core.max.notifier import MaxNotifier
+from maxhack.core.max.outbox import MaxOutbox, OutboundMessage
+from maxhack.core.max.sender import MaxSender
+from maxhack.database.models import EventModel, UserModel
+
+
+class _NullSender:
+    async def send_message(self, **kwargs: Any) -> None:
+        return None
+
+
+class _NullOutbox:
+    async def enqueue(self, messages: Iterable[OutboundMessage]) -> int:
+        return sum(1 for _ in messages)
+
+
+def _notifications(count: int) -> list[EventNotification]:
+    """
+    Тик с двумя событиями: все ``count`` получателей приглашены на первое,
+    каждый второй - ещё и на второе, и получит сводное сообщение.
+    """
+    now = datetime.now(UTC)
+    users = [
+        UserModel(
+            id=UserId(i),
+            max_chat_id=MaxChatId(i),
+            notify_mode=NotifyMode.DEFAULT,
+        )
+        for i in range(count)
+    ]
+    notifications = []
+    for event_id, recipients in ((1, users), (2, users[::2])):
+        notification = EventNotification(
+            notify_id=EventNotifyId(event_id),
+            occurrence_at=now,
+            starts_at=now + timedelta(minutes=15),
+            event=EventModel(id=EventId(event_id), title=f"Планёрка {event_id}"),
+        )
+        for user in recipients:
+            notification.recipients.append((user, None))
+            notification.deliveries[user.id] = NotifyDeliveryId(
+                event_id * count + user.id,
+            )
+        notifications.append(notification)
+    return notifications
+
+
+async def _run(title: str, mailer: MaxMailer, count: int) -> None:
+    # время и память - отдельными прогонами: tracemalloc замедляет выделения
+    notifications = _notifications(count)
+    started = time.perf_counter()
+    await mailer.event_notify(notifications)
+    elapsed = time.perf_counter() - started
+
+    notifications = _notifications(count)
+    tracemalloc.start()
+    await mailer.event_notify(notifications)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_send = elapsed / count * 1_000_000
+    print(
+        f"{title:<10} {elapsed:7.3f} s  {per_send:7.2f} µs/получатель  "
+        f"peak {peak / 1024:9.1f} KiB",
+    )
+
+
+async def _main(count: int) -> None:
+    sender = cast(MaxSender, _NullSender())
+    notifier = MaxNotifier(sender)
+    outbox = cast(MaxOutbox, _NullOutbox())
+    print(f"{count} получателей")
+
+    for title, outbox_enabled in (("напрямую", False), ("очередь", True)):
+        mailer = MaxMailer(
+            max_sender=sender,
+            max_notifier=notifier,
+            max_outbox=outbox,
+            max_config=MaxConfig(token="", outbox_enabled=outbox_enabled),
+        )
+        await _run(title, mailer, count)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(_main(args.recipients))
+
+
+if __name__ == "__main__":
+    main()
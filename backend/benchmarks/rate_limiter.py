@@ -0,0 +1,119 @@
+"""
+Сравнение ``RateLimiter`` (GCRA) с прежней реализацией на deque + lock + sleep
+под конкуренцией: все вызовы приходят одновременно.
+
+Запуск из ``backend``::
+
+    python -m benchmarks.rate_limiter --callers 10000 --rate 5000
+"""
+
+import argparse
+import asyncio
+import collections
+import itertools
+import statistics
+import time
+from types import TracebackType
+from typing import Protocol
+
+from maxhack.core.utils.rate_limiter import RateLimiter
+
+
+class _Limiter(Protocol):
+    async def __aenter__(self) -> object: ...
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None: ...
+
+
+class LegacyRateLimiter:
+    """Прежняя реализация, оставлена только для сравнения."""
+
+    def __init__(self, max_calls: int, period: float = 1.0) -> None:
+        self.calls: collections.deque[float] = collections.deque()
+        self.period = period
+        self.max_calls = max_calls
+        self._lock = asyncio.Lock()
+        self.wakeups = 0
+
+    async def __aenter__(self) -> "LegacyRateLimiter":
+        while True:
+            self.wakeups += 1
+            async with self._lock:
+                current = time.time()
+                while self.calls and current - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(current)
+                    return self
+                until = self.calls[0] + self.period
+                sleeptime = until - current
+            await asyncio.sleep(max(0.0, sleeptime))
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        pass
+
+
+async def _run(title: str, limiter: _Limiter, callers: int) -> None:
+    order: list[int] = []
+    waits: list[float] = []
+
+    async def call(i: int) -> None:
+        started = time.perf_counter()
+        async with limiter:
+            waits.append(time.perf_counter() - started)
+            order.append(i)
+
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(callers)))
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - started_cpu
+
+    # сколько раз вызов обогнал пришедшего раньше
+    inversions = sum(1 for a, b in itertools.pairwise(order) if a > b)
+    waits.sort()
+    p99 = waits[int(len(waits) * 0.99) - 1]
+    print(
+        f"{title:<10} wall {elapsed:7.3f} s  cpu {cpu:7.3f} s  "
+        f"mean wait {statistics.fmean(waits):6.3f} s  p99 {p99:6.3f} s  "
+        f"inversions {inversions}",
+    )
+
+
+async def _main(callers: int, rate: int) -> None:
+    print(f"{callers} одновременных вызовов, лимит {rate}/с")
+    # прежний лимит пропускает сразу rate вызовов, GCRA - ровно по интервалу
+    print(
+        f"идеальное время: legacy {(callers - rate) / rate:.3f} s, "
+        f"gcra {(callers - 1) / rate:.3f} s",
+    )
+
+    legacy = LegacyRateLimiter(max_calls=rate, period=1)
+    await _run("legacy", legacy, callers)
+    print(f"{'':<10} пробуждений: {legacy.wakeups}")
+
+    gcra = RateLimiter(max_calls=rate, period=1)
+    await _run("gcra", gcra, callers)
+    print(f"{'':<10} пробуждений: не больше {gcra.stats.acquired}, одно на вызов")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=10_000)
+    parser.add_argument("--rate", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(_main(args.callers, args.rate))
+
+
+if __name__ == "__main__":
+    main()
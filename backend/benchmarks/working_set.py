@@ -0,0 +1,129 @@
+"""
+Память на напоминание и паузы сборщика мусора для разных представлений
+напоминаний в планировщике: ORM-объекты, словари прежнего набора в памяти,
+``DueNotify`` и столбцы ``NotifyFireTable``.
+
+Запуск из ``backend``::
+
+    python -m benchmarks.working_set --count 1000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from maxhack.core.event.fire_table import NotifyFireTable
+from maxhack.core.event.models import DueNotify
+from maxhack.core.ids import EventId, EventNotifyId
+from maxhack.database.models import EventModel, EventNotifyModel
+
+_Rows = list[tuple[EventNotifyId, EventId, datetime]]
+
+
+def _rows(count: int, rnd: random.Random) -> _Rows:
+    start = datetime(2026, 10, 17, tzinfo=UTC)
+    return [
+        (
+            EventNotifyId(notify_id),
+            EventId(notify_id // 2),
+            start + timedelta(minutes=rnd.randrange(7 * 24 * 60)),
+        )
+        for notify_id in range(count)
+    ]
+
+
+def _orm(rows: _Rows) -> list[tuple[EventNotifyModel, EventModel]]:
+    return [
+        (
+            EventNotifyModel(
+                id=notify_id,
+                event_id=event_id,
+                minutes_before=0,
+                next_fire_at=fire_at,
+            ),
+            EventModel(
+                id=event_id,
+                title="Планёрка",
+                cron="0 9 * * 1",
+                is_cycle=True,
+                type="event",
+                creator_id=1,
+                group_id=1,
+                duration=30,
+            ),
+        )
+        for notify_id, event_id, fire_at in rows
+    ]
+
+
+def _dicts(rows: _Rows) -> tuple[dict[Any, Any], dict[Any, Any]]:
+    fires: dict[EventNotifyId, tuple[EventId, datetime]] = {}
+    by_event: dict[EventId, set[EventNotifyId]] = {}
+    for notify_id, event_id, fire_at in rows:
+        fires[notify_id] = (event_id, fire_at)
+        by_event.setdefault(event_id, set()).add(notify_id)
+    return fires, by_event
+
+
+def _records(rows: _Rows) -> list[DueNotify]:
+    return [
+        DueNotify(
+            notify_id=notify_id,
+            event_id=event_id,
+            cron="0 9 * * 1",
+            is_cycle=True,
+            duration=30,
+            minutes_before=0,
+            next_fire_at=fire_at,
+        )
+        for notify_id, event_id, fire_at in rows
+    ]
+
+
+def _table(rows: _Rows) -> NotifyFireTable:
+    table = NotifyFireTable()
+    table.replace(rows)
+    return table
+
+
+def _measure(title: str, count: int, build: Callable[[], object]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    collect_started = time.perf_counter()
+    gc.collect()
+    pause = time.perf_counter() - collect_started
+    print(
+        f"{title:<24} {size / count:8.0f} B/напоминание "
+        f"gc.collect {pause * 1000:8.1f} ms",
+    )
+    del kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = _rows(args.count, random.Random(args.seed))
+    # сами строки живут во всех замерах и в паузы не входят
+    gc.freeze()
+    print(f"{args.count} напоминаний")
+
+    _measure("ORM-модели", args.count, lambda: _orm(rows))
+    _measure("словари", args.count, lambda: _dicts(rows))
+    _measure("DueNotify", args.count, lambda: _records(rows))
+    _measure("NotifyFireTable", args.count, lambda: _table(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,12 @@ from maxhack.config import RedisConfig
 
 async def init_dispatcher(
     redis_config: RedisConfig,
+) -> tuple[Dispatcher, BgManagerFactory]:
+    return build_dispatcher(redis_config)
+
+
+def build_dispatcher(
+    redis_config: RedisConfig,
 ) -> tuple[Dispatcher, BgManagerFactory]:
     key_builder = DefaultKeyBuilder(with_destiny=True)
 
@@ -78,6 +78,7 @@ _one_group = Window(
             (NotifyMode.DEFAULT.name, "Звук"),
             (NotifyMode.SILENT.name, "Тихо"),
             (NotifyMode.DISABLE.name, "Игнор"),
+            (NotifyMode.DIGEST.name, "Сводка"),
         ),
         on_click=handlers.on_group_notify_mode,
         id="notify_mode",
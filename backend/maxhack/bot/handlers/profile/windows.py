@@ -50,6 +50,7 @@ _profile = Window(
             (NotifyMode.DEFAULT.name, "Звук"),
             (NotifyMode.SILENT.name, "Тихо"),
             (NotifyMode.DISABLE.name, "Игнор"),
+            (NotifyMode.DIGEST.name, "Сводка"),
         ),
         on_click=handlers.on_notify_mode,
         id="notify_mode",
@@ -32,6 +32,9 @@ class CurrentUserMiddleware(BaseMiddleware[Update]):
             container: AsyncContainer = ctx[CONTAINER_NAME]
             user_repo = await container.get(UserRepo)
             db_user = await user_repo.get_by_max_id(max_id)
+            if db_user is not None and db_user.blocked_at is not None:
+                # раз пользователь пишет боту, бот снова может писать ему
+                db_user = await user_repo.update_user(db_user.id, blocked_at=None)
             ctx["current_user"] = db_user
 
         return await next(ctx)
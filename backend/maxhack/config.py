@@ -6,6 +6,29 @@ from pathlib import Path
 @dataclass(slots=True, frozen=True, kw_only=True)
 class MaxConfig:
     token: str
+    # сколько получателей массовой рассылки обрабатывается одновременно
+    mailer_workers: int = 16
+    # раз во сколько получателей рассылка отчитывается о прогрессе
+    mailer_chunk_size: int = 500
+    # о скольких событиях самое большее напоминает одно сводное сообщение
+    notify_coalesce_max_events: int = 5
+    # напоминания уходят через очередь исходящих сообщений в Redis
+    outbox_enabled: bool = False
+    # сколько сообщений отправитель забирает из очереди за раз
+    outbox_batch_size: int = 100
+    # через сколько секунд сообщения упавшего отправителя достаются другому
+    outbox_claim_idle_seconds: float = 60.0
+    # после скольких попыток сообщение уходит в стрим недоставленных
+    outbox_max_deliveries: int = 5
+    # лимит запросов к Max API, общий для всех процессов
+    rate_limit_calls: int = 10
+    rate_limit_period: float = 1.0
+    # сколько запросов из лимита рассылки оставляют ответам пользователям.
+    # Резерв - это бёрст сверх расписания, поэтому постоянная скорость
+    # падает до rate_limit_calls - rate_limit_interactive_reserve за период
+    rate_limit_interactive_reserve: int = 2
+    # через сколько секунд ожидания вызов переходит в полосу срочнее
+    rate_limit_starvation_seconds: float = 30.0
 
 
 @dataclass(slots=True, frozen=True, kw_only=True)
@@ -38,6 +61,48 @@ class RedisConfig:
 @dataclass(slots=True, frozen=True, kw_only=True)
 class SchedulerConfig:
     tasks_key: str = "maxhack"
+    # "memory" - задачи выполняет сам планировщик,
+    # "redis" - задачи уходят в стрим Redis и их выполняют воркеры
+    broker: str = "memory"
+    # сколько задач один воркер выполняет одновременно
+    worker_max_tasks: int = 16
+    # через сколько захваченную, но не отправленную рассылку можно перехватить
+    delivery_lease_seconds: int = 600
+    # сколько получателей забирает один тик
+    delivery_batch_size: int = 10_000
+    # сколько дней хранить журнал отправленных напоминаний
+    delivery_retention_days: int = 7
+    # сколько сработавших напоминаний разбирается за один проход тика
+    due_batch_size: int = 1_000
+    # через сколько секунд после своего времени напоминание считается опоздавшим
+    stale_after_seconds: int = 900
+    # что делать с опоздавшими напоминаниями: SEND, DROP или COALESCE
+    stale_policy: str = "COALESCE"
+    # заблаговременное напоминание срабатывает раньше на постоянный сдвиг
+    # из окна в такую долю от minutes_before, но не больше spread_max_minutes
+    spread_ratio: float = 0.1
+    spread_max_minutes: int = 15
+    # в котором часу по времени пользователя приходит утренняя сводка
+    agenda_hour: int = 8
+    # на сколько минут самое большее сдвигается сводка, чтобы не уходить разом
+    agenda_spread_minutes: int = 30
+    # сколько процессов раскрывают большие наборы кронов, 0 - по числу ядер
+    cron_workers: int = 0
+    # наборы меньше стольких кронов раскрываются прямо в процессе
+    cron_pool_threshold: int = 20_000
+    # на сколько шардов делятся события между репликами планировщика
+    shards: int = 1
+    # сколько секунд реплика владеет шардом без продления
+    shard_lease_seconds: float = 30
+    # сколько секунд реплика остаётся лидером без продления
+    leader_lease_seconds: float = 30
+    # через сколько блокировка тика упавшей реплики освобождается сама
+    tick_lock_seconds: float = 60
+
+    @property
+    def distributed(self) -> bool:
+        """Задачи выполняют отдельные воркеры, а не сам планировщик."""
+        return self.broker == "redis"
 
 
 @dataclass(slots=True, frozen=True, kw_only=True)
@@ -72,7 +137,28 @@ def load_config(env: str | Path | None = None) -> Config:
         load_dotenv(env)
 
     return Config(
-        max=MaxConfig(token=os.environ["MAX_TOKEN"]),
+        max=MaxConfig(
+            token=os.environ["MAX_TOKEN"],
+            mailer_workers=int(os.getenv("MAX_MAILER_WORKERS", 16)),
+            mailer_chunk_size=int(os.getenv("MAX_MAILER_CHUNK_SIZE", 500)),
+            notify_coalesce_max_events=int(
+                os.getenv("MAX_NOTIFY_COALESCE_MAX_EVENTS", 5),
+            ),
+            outbox_enabled=os.getenv("MAX_OUTBOX_ENABLED", "False").lower() == "true",
+            outbox_batch_size=int(os.getenv("MAX_OUTBOX_BATCH_SIZE", 100)),
+            outbox_claim_idle_seconds=float(
+                os.getenv("MAX_OUTBOX_CLAIM_IDLE_SECONDS", 60),
+            ),
+            outbox_max_deliveries=int(os.getenv("MAX_OUTBOX_MAX_DELIVERIES", 5)),
+            rate_limit_calls=int(os.getenv("MAX_RATE_LIMIT_CALLS", 10)),
+            rate_limit_period=float(os.getenv("MAX_RATE_LIMIT_PERIOD", 1.0)),
+            rate_limit_interactive_reserve=int(
+                os.getenv("MAX_RATE_LIMIT_INTERACTIVE_RESERVE", 2),
+            ),
+            rate_limit_starvation_seconds=float(
+                os.getenv("MAX_RATE_LIMIT_STARVATION_SECONDS", 30),
+            ),
+        ),
         db=DbConfig(
             host=os.environ["DB_HOST"],
             port=int(os.environ["DB_PORT"]),
@@ -87,7 +173,30 @@ def load_config(env: str | Path | None = None) -> Config:
             password=os.getenv("REDIS_PASSWORD", None),
             database=int(os.getenv("REDIS_DB", 0)),
         ),
-        scheduler=SchedulerConfig(),
+        scheduler=SchedulerConfig(
+            broker=os.getenv("SCHEDULER_BROKER", "memory"),
+            due_batch_size=int(os.getenv("SCHEDULER_DUE_BATCH_SIZE", 1_000)),
+            stale_after_seconds=int(os.getenv("SCHEDULER_STALE_AFTER_SECONDS", 900)),
+            stale_policy=os.getenv("SCHEDULER_STALE_POLICY", "COALESCE"),
+            spread_ratio=float(os.getenv("SCHEDULER_SPREAD_RATIO", 0.1)),
+            spread_max_minutes=int(os.getenv("SCHEDULER_SPREAD_MAX_MINUTES", 15)),
+            agenda_hour=int(os.getenv("SCHEDULER_AGENDA_HOUR", 8)),
+            agenda_spread_minutes=int(os.getenv("SCHEDULER_AGENDA_SPREAD_MINUTES", 30)),
+            cron_workers=int(os.getenv("SCHEDULER_CRON_WORKERS", 0)),
+            cron_pool_threshold=int(os.getenv("SCHEDULER_CRON_POOL_THRESHOLD", 20_000)),
+            worker_max_tasks=int(os.getenv("SCHEDULER_WORKER_MAX_TASKS", 16)),
+            delivery_lease_seconds=int(
+                os.getenv("SCHEDULER_DELIVERY_LEASE_SECONDS", 600),
+            ),
+            delivery_batch_size=int(os.getenv("SCHEDULER_DELIVERY_BATCH_SIZE", 10_000)),
+            delivery_retention_days=int(
+                os.getenv("SCHEDULER_DELIVERY_RETENTION_DAYS", 7),
+            ),
+            shards=int(os.getenv("SCHEDULER_SHARDS", 1)),
+            shard_lease_seconds=float(os.getenv("SCHEDULER_SHARD_LEASE_SECONDS", 30)),
+            leader_lease_seconds=float(os.getenv("SCHEDULER_LEADER_LEASE_SECONDS", 30)),
+            tick_lock_seconds=float(os.getenv("SCHEDULER_TICK_LOCK_SECONDS", 60)),
+        ),
         app=AppConfig(
             host=os.getenv("API_HOST", "localhost"),
             port=int(os.getenv("API_PORT", 7001)),
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from maxhack.core.ids import AgendaId, EventId
+from maxhack.core.model import DomainModel
+from maxhack.database.models import UserModel
+
+
+@dataclass(kw_only=True)
+class AgendaEntry(DomainModel):
+    event_id: EventId
+    title: str
+    starts_at: datetime
+
+
+@dataclass(kw_only=True)
+class Agenda(DomainModel):
+    """Утренняя сводка: события пользователя на день в его часовом поясе."""
+
+    id: AgendaId
+    user: UserModel
+    day: date
+    entries: list[AgendaEntry] = field(default_factory=list)
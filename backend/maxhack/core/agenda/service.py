@@ -0,0 +1,194 @@
+import zlib
+from collections import defaultdict
+from collections.abc import Collection
+from datetime import UTC, date, datetime, time, timedelta, timezone
+from itertools import batched
+from typing import Any
+
+import numpy as np
+
+from maxhack.config import SchedulerConfig
+from maxhack.core.agenda.models import Agenda, AgendaEntry
+from maxhack.core.cron import CronExpander, CronTable, InvalidCron, compile_cron
+from maxhack.core.cron.table import to_minutes
+from maxhack.core.ids import AgendaId, EventId, UserId
+from maxhack.core.utils.datehelp import datetime_now
+from maxhack.database.models import EventModel, UserModel
+from maxhack.database.repos.agenda import AgendaRepo
+from maxhack.logger.setup import get_logger
+
+logger = get_logger(__name__)
+
+# сколько сводок пишется одним запросом
+_UPSERT_BATCH_SIZE = 1_000
+_MINUTES_PER_DAY = 24 * 60
+
+
+class AgendaService:
+    """
+    Утренние сводки для режима уведомлений ``DIGEST``: вместо отдельных
+    напоминаний пользователь утром получает одно сообщение со всеми
+    событиями дня.
+
+    Сводки считаются заранее фоновым проходом и пересчитываются, пока
+    не отправлены, - так в них попадают и поздние изменения событий.
+    Отправка приходится на ``agenda_hour`` по часовому поясу пользователя
+    со сдвигом до ``agenda_spread_minutes`` минут, чтобы сводки одного
+    пояса не уходили в одну минуту.
+    """
+
+    def __init__(
+        self,
+        agenda_repo: AgendaRepo,
+        cron_expander: CronExpander,
+        scheduler_config: SchedulerConfig,
+    ) -> None:
+        self._agenda_repo = agenda_repo
+        self._cron_expander = cron_expander
+        self._scheduler_config = scheduler_config
+
+    def agenda_slot(self, user: UserModel, now: datetime) -> tuple[date, datetime]:
+        """Ближайший ещё не наступивший день сводки пользователя и время отправки."""
+        tz = timezone(timedelta(minutes=user.timezone))
+        local_now = now.astimezone(tz)
+        spread = self._scheduler_config.agenda_spread_minutes
+        stagger = timedelta(minutes=zlib.crc32(str(user.id).encode()) % (spread + 1))
+
+        day = local_now.date()
+        send_at = datetime.combine(day, time(self._scheduler_config.agenda_hour), tz)
+        send_at += stagger
+        if send_at <= local_now:
+            day += timedelta(days=1)
+            send_at += timedelta(days=1)
+        return day, send_at.astimezone(UTC)
+
+    async def plan_agendas(self) -> int:
+        """Раскрывает события пользователей с ``DIGEST`` в сводки на их день."""
+        time_now = datetime_now()
+        rows = await self._agenda_repo.get_digest_events()
+
+        users: dict[UserId, UserModel] = {}
+        events: defaultdict[UserId, list[EventModel]] = defaultdict(list)
+        for user, event in rows:
+            users[user.id] = user
+            events[user.id].append(event)
+
+        # день сводки каждого пользователя - в его часовом поясе
+        slots: dict[UserId, tuple[date, datetime, datetime]] = {}
+        for user_id, user in users.items():
+            day, send_at = self.agenda_slot(user, time_now)
+            day_start = datetime.combine(
+                day,
+                time(),
+                timezone(timedelta(minutes=user.timezone)),
+            )
+            slots[user_id] = (day, send_at, day_start)
+
+        pairs = [
+            (user_id, event)
+            for user_id, user_events in events.items()
+            for event in user_events
+            if _is_valid_cron(event.cron)
+        ]
+        table = CronTable.from_expressions(event.cron for _, event in pairs)
+        left = np.fromiter(
+            (to_minutes(slots[user_id][2]) for user_id, _ in pairs),
+            np.int64,
+            len(pairs),
+        )
+        fired_rows, fired_at = await self._cron_expander.fire_times(
+            table,
+            left,
+            _MINUTES_PER_DAY,
+        )
+
+        entries: defaultdict[UserId, list[dict[str, Any]]] = defaultdict(list)
+        seen: set[int] = set()
+        for row, moment in zip(fired_rows.tolist(), fired_at.tolist(), strict=True):
+            user_id, event = pairs[row]
+            # разовое событие наступает только один раз
+            if not event.is_cycle and row in seen:
+                continue
+            seen.add(row)
+            entries[user_id].append(
+                {
+                    "event_id": event.id,
+                    "title": event.title,
+                    "starts_at": datetime.fromtimestamp(moment * 60, UTC).isoformat(),
+                },
+            )
+
+        # без событий сводку не пишем, а запланированную раньше - убираем
+        agendas: list[dict[str, Any]] = []
+        empty: list[tuple[UserId, date]] = []
+        for user_id, (day, send_at, _) in slots.items():
+            if not entries[user_id]:
+                empty.append((user_id, day))
+                continue
+            user_entries = sorted(entries[user_id], key=lambda e: e["starts_at"])
+            agendas.append(
+                {
+                    "user_id": user_id,
+                    "day": day,
+                    "send_at": send_at,
+                    "items": user_entries,
+                },
+            )
+
+        for batch in batched(agendas, _UPSERT_BATCH_SIZE):
+            await self._agenda_repo.upsert(list(batch))
+        for batch in batched(empty, _UPSERT_BATCH_SIZE):
+            await self._agenda_repo.discard(batch)
+        logger.info("Planned %d agendas", len(agendas))
+        return len(agendas)
+
+    async def claim_agendas(self) -> list[Agenda]:
+        """Забирает в работу сводки, которые пора отправить."""
+        time_now = datetime_now()
+        claimed_ids = await self._agenda_repo.claim(
+            now=time_now,
+            lease=timedelta(seconds=self._scheduler_config.delivery_lease_seconds),
+            limit=self._scheduler_config.delivery_batch_size,
+        )
+        rows = await self._agenda_repo.get_claimed(claimed_ids)
+
+        # пользователь удалён или недоступен - отправлять некому
+        orphan_ids = set(claimed_ids).difference(agenda.id for agenda, _ in rows)
+        await self._agenda_repo.mark_sent(orphan_ids, time_now)
+
+        logger.info("Claimed %d agendas", len(claimed_ids))
+        return [
+            Agenda(
+                id=agenda.id,
+                user=user,
+                day=agenda.day,
+                entries=[
+                    AgendaEntry(
+                        event_id=EventId(item["event_id"]),
+                        title=item["title"],
+                        starts_at=datetime.fromisoformat(item["starts_at"]),
+                    )
+                    for item in agenda.items
+                ],
+            )
+            for agenda, user in rows
+        ]
+
+    async def mark_agendas_sent(self, agenda_ids: Collection[AgendaId]) -> None:
+        await self._agenda_repo.mark_sent(agenda_ids, datetime_now())
+
+    async def purge_agendas(self) -> None:
+        before = datetime_now() - timedelta(
+            days=self._scheduler_config.delivery_retention_days,
+        )
+        purged = await self._agenda_repo.purge_sent(before)
+        logger.info("Purged %d agendas sent before %s", purged, before)
+
+
+def _is_valid_cron(cron: str) -> bool:
+    try:
+        compile_cron(cron)
+    except InvalidCron:
+        logger.warning("Skipping invalid cron '%s' in agenda", cron)
+        return False
+    return True
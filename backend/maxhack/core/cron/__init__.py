@@ -0,0 +1,11 @@
+from .compiled import CompiledCron, InvalidCron, compile_cron
+from .expander import CronExpander
+from .table import CronTable
+
+__all__ = (
+    "CompiledCron",
+    "CronExpander",
+    "CronTable",
+    "InvalidCron",
+    "compile_cron",
+)
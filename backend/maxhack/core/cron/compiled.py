@@ -0,0 +1,194 @@
+import calendar
+import functools
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Final
+
+from maxhack.core.exceptions import InvalidValue
+from maxhack.core.utils.datehelp import UTC_TIMEZONE
+
+# (минимум, максимум) для минут, часов, дня месяца, месяца и дня недели
+_FIELD_BOUNDS: Final = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# самый редкий валидный крон ("0 0 29 2 *") срабатывает раз в 8 лет
+_HORIZON: Final = timedelta(days=366 * 8 + 1)
+_ONE_MINUTE: Final = timedelta(minutes=1)
+_ALL_WEEKDAYS: Final = 0b111_1111
+_DECEMBER: Final = 12
+
+
+class InvalidCron(InvalidValue):
+    def __init__(self, expression: str) -> None:
+        super().__init__(f"Некорректное cron-выражение: {expression!r}")
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledCron:
+    """
+    Крон, разобранный в битовые маски: бит ``n`` маски выставлен,
+    если значение ``n`` подходит под поле. Время всегда в UTC.
+    Дни недели считаются как в cron: 0 - воскресенье.
+    """
+
+    minutes: int
+    hours: int
+    days: int
+    months: int
+    weekdays: int
+    # если ограничены и день месяца, и день недели - достаточно любого из них
+    day_or: bool
+
+    def matches(self, moment: datetime) -> bool:
+        moment = moment.astimezone(UTC_TIMEZONE)
+        return (
+            bool(self.minutes >> moment.minute & 1)
+            and bool(self.hours >> moment.hour & 1)
+            and self._matches_day(moment.date())
+        )
+
+    def next_after(self, moment: datetime) -> datetime | None:
+        """
+        Ближайшее срабатывание строго позже ``moment``.
+        ``None`` - если крон не срабатывает никогда (например, 31 февраля).
+        """
+        start = moment.astimezone(UTC_TIMEZONE).replace(second=0, microsecond=0)
+        start += _ONE_MINUTE
+
+        day = start.date()
+        limit = day + _HORIZON
+        from_minute = start.hour * 60 + start.minute
+        while day <= limit:
+            if not self.months >> day.month & 1:
+                day = self._next_month(day)
+                from_minute = 0
+                continue
+
+            if self._matches_day(day):
+                found = self._first_minute(from_minute)
+                if found is not None:
+                    hour, minute = divmod(found, 60)
+                    return datetime.combine(
+                        day,
+                        time(hour, minute),
+                        tzinfo=UTC_TIMEZONE,
+                    )
+
+            day = self._next_day(day)
+            from_minute = 0
+
+        return None
+
+    def occurrences(self, after: datetime, until: datetime) -> Iterator[datetime]:
+        """Все срабатывания в полуинтервале ``(after, until]``."""
+        current = self.next_after(after)
+        while current is not None and current <= until:
+            yield current
+            current = self.next_after(current)
+
+    def _matches_day(self, day: date) -> bool:
+        dom = bool(self.days >> day.day & 1)
+        dow = bool(self.weekdays >> day.isoweekday() % 7 & 1)
+        if self.day_or:
+            return (dom or dow) and bool(self.months >> day.month & 1)
+        return dom and dow and bool(self.months >> day.month & 1)
+
+    def _next_month(self, day: date) -> date:
+        """Первое число следующего подходящего месяца."""
+        later_months = self.months >> (day.month + 1) << (day.month + 1)
+        if later_months:
+            return date(day.year, (later_months & -later_months).bit_length() - 1, 1)
+        first_month = (self.months & -self.months).bit_length() - 1
+        return date(day.year + 1, max(first_month, 1), 1)
+
+    def _next_day(self, day: date) -> date:
+        """
+        Следующий день-кандидат: дни без ограничения по дню недели
+        пропускаются сразу.
+        """
+        if self.day_or or self.weekdays != _ALL_WEEKDAYS:
+            return day + timedelta(days=1)
+
+        later_days = self.days >> (day.day + 1) << (day.day + 1)
+        if later_days:
+            next_day = (later_days & -later_days).bit_length() - 1
+            if next_day <= calendar.monthrange(day.year, day.month)[1]:
+                return day.replace(day=next_day)
+        return _next_month(day)
+
+    def _first_minute(self, from_minute: int) -> int | None:
+        """Первая подходящая минута суток, начиная с ``from_minute``."""
+        from_hour, minute = divmod(from_minute, 60)
+        hours = self.hours >> from_hour << from_hour
+        while hours:
+            hour = (hours & -hours).bit_length() - 1
+            minutes = self.minutes
+            if hour == from_hour:
+                minutes = minutes >> minute << minute
+            if minutes:
+                return hour * 60 + (minutes & -minutes).bit_length() - 1
+            hours &= hours - 1
+        return None
+
+
+@functools.lru_cache(maxsize=2**16)
+def compile_cron(expression: str) -> CompiledCron:
+    parts = expression.split()
+    if len(parts) != len(_FIELD_BOUNDS):
+        raise InvalidCron(expression)
+
+    try:
+        masks = [
+            _parse_field(part, low, high)
+            for part, (low, high) in zip(parts, _FIELD_BOUNDS, strict=True)
+        ]
+    except ValueError as e:
+        raise InvalidCron(expression) from e
+
+    minutes, hours, days, months, weekdays = masks
+    if weekdays >> 7 & 1:  # 7 - тоже воскресенье
+        weekdays = (weekdays | 1) & ~(1 << 7)
+
+    return CompiledCron(
+        minutes=minutes,
+        hours=hours,
+        days=days,
+        months=months,
+        weekdays=weekdays,
+        day_or="*" not in parts[2] and "*" not in parts[4],
+    )
+
+
+def _parse_field(value: str, low: int, high: int) -> int:
+    if value.isdigit():  # самый частый случай - одно число
+        number = int(value)
+        if not low <= number <= high:
+            raise ValueError(value)
+        return 1 << number
+
+    mask = 0
+    for item in value.split(","):
+        body, _, step_str = item.partition("/")
+        step = int(step_str) if step_str else 1
+
+        if body == "*":
+            start, end = low, high
+        elif "-" in body:
+            start_str, end_str = body.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(body)
+            end = high if step_str else start
+
+        if step <= 0 or not low <= start <= end <= high:
+            raise ValueError(item)
+
+        for number in range(start, end + 1, step):
+            mask |= 1 << number
+
+    return mask
+
+
+def _next_month(day: date) -> date:
+    if day.month == _DECEMBER:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
@@ -0,0 +1,144 @@
+import asyncio
+import functools
+import itertools
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from maxhack.core.cron.table import CronTable, MinuteArray, to_minutes
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CronExpander:
+    """
+    Раскрытие больших наборов кронов в пуле процессов, чтобы тяжёлый
+    подсчёт не останавливал цикл событий бота и API.
+
+    Таблица кронов делится по строкам на ``workers`` частей, в процессы
+    уходят только её NumPy-массивы (битовые маски полей, сдвиги, веса),
+    а результаты частей сливаются обратно. Таблицы меньше ``threshold``
+    строк считаются прямо в процессе: передача в пул им дороже самого счёта.
+
+    Пул создаётся при первой большой таблице. Процессы запускаются
+    через ``spawn``: форк процесса с циклом событий и потоками небезопасен.
+    """
+
+    def __init__(self, workers: int | None = None, threshold: int = 20_000) -> None:
+        self._workers = workers or os.cpu_count() or 1
+        self._threshold = threshold
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def fire_counts(
+        self,
+        table: CronTable,
+        left: datetime,
+        minutes: int,
+        shift_minutes: MinuteArray | int = 0,
+        weights: MinuteArray | int = 1,
+    ) -> MinuteArray:
+        """``CronTable.fire_counts``: гистограммы частей складываются."""
+        shift = np.broadcast_to(np.asarray(shift_minutes, np.int64), len(table))
+        weights = np.broadcast_to(np.asarray(weights, np.int64), len(table))
+        results = await self._map(
+            table,
+            lambda part, rows: functools.partial(
+                _fire_counts,
+                part,
+                left,
+                minutes,
+                shift[rows],
+                weights[rows],
+            ),
+        )
+        return sum(results, np.zeros(minutes, dtype=np.int64))
+
+    async def fire_times(
+        self,
+        table: CronTable,
+        left: datetime | MinuteArray,
+        minutes: int,
+    ) -> tuple[MinuteArray, MinuteArray]:
+        """
+        ``CronTable.fire_times``: пары (номер крона, минута срабатывания),
+        номера - в исходной таблице.
+        """
+        if isinstance(left, datetime):
+            left = np.asarray(to_minutes(left), np.int64)
+        left = np.broadcast_to(left, len(table))
+        results = await self._map(
+            table,
+            lambda part, rows: functools.partial(
+                _fire_times,
+                part,
+                left[rows],
+                minutes,
+                rows.start,
+            ),
+        )
+        if not results:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        rows, moments = zip(*results, strict=True)
+        return np.concatenate(rows), np.concatenate(moments)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def _map[T](
+        self,
+        table: CronTable,
+        make_job: Callable[[CronTable, slice], Callable[[], T]],
+    ) -> list[T]:
+        if len(table) < self._threshold or self._workers == 1:
+            return [make_job(table, slice(0, len(table)))()]
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        bounds = np.linspace(0, len(table), self._workers + 1, dtype=np.int64)
+        parts = [
+            slice(int(start), int(stop)) for start, stop in itertools.pairwise(bounds)
+        ]
+        logger.debug("Expanding %d crons in %d processes", len(table), len(parts))
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, make_job(table[rows], rows))
+                    for rows in parts
+                ),
+            ),
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+
+def _fire_counts(
+    table: CronTable,
+    left: datetime,
+    minutes: int,
+    shift: MinuteArray,
+    weights: MinuteArray,
+) -> MinuteArray:
+    return table.fire_counts(left, minutes, shift, weights)
+
+
+def _fire_times(
+    table: CronTable,
+    left: MinuteArray,
+    minutes: int,
+    offset: int,
+) -> tuple[MinuteArray, MinuteArray]:
+    rows, moments = table.fire_times(left, minutes)
+    return rows + offset, moments
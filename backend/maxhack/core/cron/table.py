@@ -0,0 +1,143 @@
+import math
+from collections.abc import Iterable
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from maxhack.core.cron.compiled import CompiledCron, compile_cron
+
+# 1970-01-01 - четверг, в нотации cron это 4
+_EPOCH_WEEKDAY = 4
+
+MinuteArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+
+class CronTable:
+    """
+    Набор кронов, упакованный в параллельные NumPy-массивы битовых масок.
+    Проверяет сразу все кроны за один векторизованный проход.
+
+    Моменты времени - целые минуты от начала эпохи (UTC).
+    """
+
+    __slots__ = ("day_or", "days", "hours", "minutes", "months", "weekdays")
+
+    def __init__(self, crons: Iterable[CompiledCron]) -> None:
+        crons = list(crons)
+        self.minutes = np.fromiter((c.minutes for c in crons), np.uint64, len(crons))
+        self.hours = np.fromiter((c.hours for c in crons), np.uint64, len(crons))
+        self.days = np.fromiter((c.days for c in crons), np.uint64, len(crons))
+        self.months = np.fromiter((c.months for c in crons), np.uint64, len(crons))
+        self.weekdays = np.fromiter((c.weekdays for c in crons), np.uint64, len(crons))
+        self.day_or = np.fromiter((c.day_or for c in crons), np.bool_, len(crons))
+
+    @classmethod
+    def from_expressions(cls, expressions: Iterable[str]) -> "CronTable":
+        return cls(compile_cron(expression) for expression in expressions)
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def __getitem__(self, rows: slice | MinuteArray) -> "CronTable":
+        """Часть кронов - например, чтобы раздать таблицу по процессам."""
+        table = CronTable(())
+        table.minutes = self.minutes[rows]
+        table.hours = self.hours[rows]
+        table.days = self.days[rows]
+        table.months = self.months[rows]
+        table.weekdays = self.weekdays[rows]
+        table.day_or = self.day_or[rows]
+        return table
+
+    def matches(self, moments: MinuteArray | int) -> BoolArray:
+        """
+        Срабатывает ли каждый крон в свой момент.
+        ``moments`` - число (общий момент) или массив по одному на крон.
+        """
+        moments = np.asarray(moments, dtype=np.int64)
+        days = moments // 1440
+        dates = days.astype("datetime64[D]")
+        month_starts = dates.astype("datetime64[M]")
+
+        minute = (moments % 60).astype(np.uint64)
+        hour = (moments // 60 % 24).astype(np.uint64)
+        day = ((dates - month_starts).astype(np.int64) + 1).astype(np.uint64)
+        month = (month_starts.astype(np.int64) % 12 + 1).astype(np.uint64)
+        weekday = ((days + _EPOCH_WEEKDAY) % 7).astype(np.uint64)
+
+        one = np.uint64(1)
+        dom_ok = (self.days >> day) & one == one
+        dow_ok = (self.weekdays >> weekday) & one == one
+        day_ok = np.where(self.day_or, dom_ok | dow_ok, dom_ok & dow_ok)
+
+        return (
+            ((self.minutes >> minute) & one == one)
+            & ((self.hours >> hour) & one == one)
+            & ((self.months >> month) & one == one)
+            & day_ok
+        )
+
+    def fired_between(
+        self,
+        left: datetime,
+        right: datetime,
+        shift_minutes: MinuteArray | int = 0,
+    ) -> BoolArray:
+        """
+        Было ли хотя бы одно срабатывание в полуинтервале ``[left, right)``.
+        ``shift_minutes`` сдвигает окно вперёд для каждого крона отдельно
+        (например, на ``minutes_before`` напоминания).
+        """
+        shift = np.asarray(shift_minutes, dtype=np.int64)
+        fired = np.zeros(len(self), dtype=np.bool_)
+        for moment in range(to_minutes(left), to_minutes(right)):
+            fired |= self.matches(moment + shift)
+        return fired
+
+    def fire_counts(
+        self,
+        left: datetime,
+        minutes: int,
+        shift_minutes: MinuteArray | int = 0,
+        weights: npt.NDArray[np.int64] | int = 1,
+    ) -> npt.NDArray[np.int64]:
+        """
+        Гистограмма срабатываний по минутам: ``result[i]`` - сумма весов
+        кронов, сработавших в минуту ``i`` от ``left`` (с учётом сдвига
+        ``shift_minutes``, как в ``fired_between``).
+        """
+        shift = np.asarray(shift_minutes, dtype=np.int64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.int64), len(self))
+        start = to_minutes(left)
+        counts = np.zeros(minutes, dtype=np.int64)
+        for i in range(minutes):
+            counts[i] = weights[self.matches(start + i + shift)].sum()
+        return counts
+
+    def fire_times(
+        self,
+        left: MinuteArray | int,
+        minutes: int,
+    ) -> tuple[MinuteArray, MinuteArray]:
+        """
+        Все срабатывания в ``[left, left + minutes)``, где ``left`` - число
+        или массив по одному на крон (например, начало дня в поясе получателя).
+        Возвращает пары (номер крона, минута срабатывания), упорядоченные
+        по удалённости от ``left``.
+        """
+        left = np.broadcast_to(np.asarray(left, dtype=np.int64), len(self))
+        rows, moments = [], []
+        for i in range(minutes):
+            fired = np.flatnonzero(self.matches(left + i))
+            rows.append(fired)
+            moments.append(left[fired] + i)
+        if not rows:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        return np.concatenate(rows).astype(np.int64), np.concatenate(moments)
+
+
+def to_minutes(moment: datetime) -> int:
+    """Первая целая минута от начала эпохи, не раньше ``moment``."""
+    return math.ceil(moment.timestamp() / 60)
@@ -5,3 +5,4 @@ class NotifyMode(StrEnum):
     DEFAULT = "DEFAULT"  # все уведомления со звуком
     SILENT = "SILENT"  # все уведомления без звука
     DISABLE = "DISABLE"  # никаких уведомлений
+    DIGEST = "DIGEST"  # вместо напоминаний - утренняя сводка событий на день
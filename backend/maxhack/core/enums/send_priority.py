@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class SendPriority(StrEnum):
+    INTERACTIVE = "INTERACTIVE"  # ответы пользователю, он ждёт их прямо сейчас
+    URGENT = "URGENT"  # напоминания о событиях, которые вот-вот начнутся
+    REMINDER = "REMINDER"  # заблаговременные напоминания
+    BULK = "BULK"  # рассылки, могут подождать
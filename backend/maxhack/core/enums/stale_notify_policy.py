@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class StaleNotifyPolicy(StrEnum):
+    SEND = "SEND"  # отправлять все опоздавшие напоминания
+    DROP = "DROP"  # не отправлять опоздавшие напоминания
+    COALESCE = "COALESCE"  # из опоздавших напоминаний события отправить последнее
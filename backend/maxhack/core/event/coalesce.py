@@ -0,0 +1,42 @@
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from maxhack.core.event.models import EventNotification, NotifyDigest
+
+if TYPE_CHECKING:
+    from maxhack.core.ids import UserId
+
+
+def coalesce_notifications(
+    notifications: Iterable[EventNotification],
+    max_events: int,
+) -> list[NotifyDigest]:
+    """
+    Группирует срабатывания тика по получателям: каждому - одно сообщение
+    с напоминаниями о всех его событиях, но не больше чем о ``max_events``
+    событиях в одном сообщении. Несколько сработавших напоминаний об одном
+    событии (разные ``minutes_before``) дают одно упоминание события.
+    """
+    if max_events <= 0:
+        msg = "max_events should be > 0"
+        raise ValueError(msg)
+
+    digests: list[NotifyDigest] = []
+    current: dict[UserId, NotifyDigest] = {}
+    for notification in notifications:
+        event = notification.event
+        for user, membership in notification.recipients:
+            digest = current.get(user.id)
+            known = digest is not None and any(
+                known_event.id == event.id for known_event, _ in digest.events
+            )
+            if digest is None or (not known and len(digest.events) >= max_events):
+                digest = NotifyDigest(user=user, starts_at=notification.starts_at)
+                current[user.id] = digest
+                digests.append(digest)
+
+            if not known:
+                digest.events.append((event, membership))
+            digest.starts_at = min(digest.starts_at, notification.starts_at)
+            digest.deliveries.append(notification.deliveries[user.id])
+    return digests
@@ -0,0 +1,75 @@
+from collections.abc import Collection, Iterable
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+
+from maxhack.core.ids import EventId, EventNotifyId
+from maxhack.core.utils.shard_leases import ShardSet
+
+_IdArray = npt.NDArray[np.int64]
+# (id напоминания, id события, next_fire_at в секундах эпохи)
+_ROW = np.dtype((np.int64, 3))
+
+
+class NotifyFireTable:
+    """
+    Ближайшие срабатывания напоминаний параллельными NumPy-столбцами:
+    id напоминания, id события и ``next_fire_at`` в секундах эпохи -
+    24 байта на напоминание вместо кортежей, словарей и ``datetime``.
+
+    Массивы не содержат Python-объектов, так что сборщик мусора их не
+    обходит, а поиск наступивших напоминаний - одно векторное сравнение.
+    """
+
+    def __init__(self) -> None:
+        self._notify_ids: _IdArray = np.zeros(0, np.int64)
+        self._event_ids: _IdArray = np.zeros(0, np.int64)
+        self._fire_at: _IdArray = np.zeros(0, np.int64)
+
+    def __len__(self) -> int:
+        return len(self._notify_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return self._notify_ids.nbytes + self._event_ids.nbytes + self._fire_at.nbytes
+
+    def replace(
+        self,
+        rows: Iterable[tuple[EventNotifyId, EventId, datetime]],
+        event_ids: Collection[EventId] | None = None,
+    ) -> None:
+        """
+        Заменяет напоминания событий ``event_ids`` (``None`` - всех)
+        строками ``rows`` (напоминание, событие, ``next_fire_at``).
+        """
+        new = np.fromiter(
+            (
+                (notify_id, event_id, int(fire_at.timestamp()))
+                for notify_id, event_id, fire_at in rows
+            ),
+            dtype=_ROW,
+        )
+        notify_ids, new_event_ids, fire_at = new.T
+        if event_ids is not None:
+            keep = ~np.isin(self._event_ids, _ids(event_ids))
+            notify_ids = np.concatenate((self._notify_ids[keep], notify_ids))
+            new_event_ids = np.concatenate((self._event_ids[keep], new_event_ids))
+            fire_at = np.concatenate((self._fire_at[keep], fire_at))
+
+        # столбцы не должны ссылаться на временную таблицу строк
+        self._notify_ids = np.ascontiguousarray(notify_ids)
+        self._event_ids = np.ascontiguousarray(new_event_ids)
+        self._fire_at = np.ascontiguousarray(fire_at)
+
+    def has_due(self, now: datetime, shards: ShardSet | None = None) -> bool:
+        """Есть ли наступившие к ``now`` напоминания в шардах ``shards``."""
+        due = self._fire_at <= now.timestamp()
+        if shards is None:
+            return bool(due.any())
+        owned = _ids(shards.owned)
+        return bool(np.isin(self._event_ids[due] % shards.total, owned).any())
+
+
+def _ids(ids: Collection[int]) -> _IdArray:
+    return np.fromiter(ids, np.int64, len(ids))
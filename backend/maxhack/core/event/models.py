@@ -2,8 +2,16 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Literal, override
 
-from maxhack.core.ids import GroupId, TagId, UserId
+from maxhack.core.ids import (
+    EventId,
+    EventNotifyId,
+    GroupId,
+    NotifyDeliveryId,
+    TagId,
+    UserId,
+)
 from maxhack.core.model import DomainModel
+from maxhack.database.models import EventModel, UserModel, UsersToGroupsModel
 from maxhack.utils.utils import create_cron_expression
 
 EventType = Literal["event"]
@@ -64,3 +72,62 @@ class EventUpdate(DomainModel):
         if self.cron:
             obj["cron"] = self.cron.expression
         return obj
+
+
+@dataclass(kw_only=True)
+class EventNotification(DomainModel):
+    """Одно срабатывание напоминания и те его получатели, что взяты в работу."""
+
+    notify_id: EventNotifyId
+    occurrence_at: datetime
+    # когда начинается событие, о котором напоминание
+    starts_at: datetime
+    event: EventModel
+    recipients: list[tuple[UserModel, UsersToGroupsModel | None]] = field(
+        default_factory=list,
+    )
+    # строка журнала отправок для каждого получателя
+    deliveries: dict[UserId, NotifyDeliveryId] = field(default_factory=dict)
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DueNotify:
+    """
+    Наступившее напоминание для тика рассылки: только нужные тику столбцы
+    напоминания и события, без ORM-объектов и карты идентичности сессии.
+    """
+
+    notify_id: EventNotifyId
+    event_id: EventId
+    cron: str
+    is_cycle: bool
+    duration: int
+    minutes_before: int
+    next_fire_at: datetime
+
+
+@dataclass(kw_only=True)
+class NotifyDigest(DomainModel):
+    """Напоминания одного тика, которые получатель получит одним сообщением."""
+
+    user: UserModel
+    # события и членство получателя в их группах, без повторов
+    events: list[tuple[EventModel, UsersToGroupsModel | None]] = field(
+        default_factory=list,
+    )
+    # когда начинается самое раннее из событий
+    starts_at: datetime
+    deliveries: list[NotifyDeliveryId] = field(default_factory=list)
+
+
+@dataclass(kw_only=True)
+class NotifyBacklog(DomainModel):
+    """Сколько работы рассылки напоминаний ещё не разобрано."""
+
+    # сработавшие, но ещё не разложенные в журнал напоминания
+    due: int
+    # строки журнала, которые можно взять в работу
+    pending: int
+
+    def __bool__(self) -> bool:
+        return bool(self.due or self.pending)
@@ -0,0 +1,26 @@
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Protocol
+
+from maxhack.core.ids import EventNotifyId
+
+
+class NotifyScheduler(Protocol):
+    """
+    Разовые задачи на срабатывания напоминаний.
+
+    Реализация - в слое планировщика. Напоминания без времени
+    срабатывания (``None``) пропускаются.
+    """
+
+    async def schedule(
+        self,
+        next_fires: Mapping[EventNotifyId, datetime | None],
+    ) -> None:
+        """Ставит задачи на срабатывания ``next_fires``."""
+
+    async def unschedule(
+        self,
+        next_fires: Mapping[EventNotifyId, datetime | None],
+    ) -> None:
+        """Снимает задачи на срабатывания ``next_fires``."""
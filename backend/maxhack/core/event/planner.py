@@ -0,0 +1,78 @@
+import zlib
+from datetime import datetime, timedelta
+
+from maxhack.config import SchedulerConfig
+from maxhack.core.ids import EventId
+from maxhack.core.utils.cron import next_fire_at
+
+_MINUTE = timedelta(minutes=1)
+
+
+class NotifyPlanner:
+    """
+    Планирует время срабатывания напоминаний.
+
+    События обычно ставят на круглое время, и заблаговременные напоминания
+    о них приходятся на одну минуту - а лимит запросов к Max растягивает
+    такой всплеск в долгую очередь. Поэтому напоминание за ``minutes_before``
+    минут срабатывает раньше своего времени на сдвиг из окна
+    ``minutes_before * spread_ratio`` (не больше ``spread_max_minutes``) минут.
+    Сдвиг выбирается по событию заранее и не меняется от срабатывания
+    к срабатыванию, так что всплеск равномерно размазывается по окну.
+    Напоминания "событие началось" (``minutes_before == 0``) не сдвигаются.
+    """
+
+    def __init__(self, scheduler_config: SchedulerConfig) -> None:
+        self._ratio = scheduler_config.spread_ratio
+        self._max_minutes = scheduler_config.spread_max_minutes
+
+    def window(self, minutes_before: int) -> int:
+        """На сколько минут раньше своего времени может сработать напоминание."""
+        return max(0, min(int(minutes_before * self._ratio), self._max_minutes))
+
+    def offset(self, event_id: EventId, minutes_before: int) -> timedelta:
+        window = self.window(minutes_before)
+        if not window:
+            return timedelta()
+        key = zlib.crc32(f"{event_id}:{minutes_before}".encode())
+        return timedelta(minutes=key % (window + 1))
+
+    def fire_at(
+        self,
+        cron: str,
+        event_id: EventId,
+        minutes_before: int,
+        after: datetime,
+    ) -> datetime | None:
+        """
+        Ближайшее срабатывание напоминания после ``after`` со сдвигом.
+        Сдвиг не уводит его раньше ``after``: иначе срабатывание
+        обогнало бы предыдущее.
+        """
+        occurrence = next_fire_at(cron, minutes_before, after)
+        if occurrence is None:
+            return None
+        earliest = after.replace(second=0, microsecond=0) + _MINUTE
+        return max(occurrence - self.offset(event_id, minutes_before), earliest)
+
+    def occurrence(self, cron: str, minutes_before: int, fire_at: datetime) -> datetime:
+        """Время срабатывания напоминания ``fire_at`` без сдвига."""
+        # между сдвинутым и исходным временем других срабатываний нет
+        return next_fire_at(cron, minutes_before, fire_at - _MINUTE) or fire_at
+
+    def next_fire_at(
+        self,
+        cron: str,
+        event_id: EventId,
+        minutes_before: int,
+        fired_at: datetime,
+        now: datetime,
+    ) -> datetime | None:
+        """Следующее срабатывание после того, что сработало в ``fired_at``."""
+        after = max(now, self.occurrence(cron, minutes_before, fired_at))
+        return self.fire_at(cron, event_id, minutes_before, after)
+
+    def starts_at(self, cron: str, minutes_before: int, fire_at: datetime) -> datetime:
+        """Начало события, о котором напоминание, сработавшее в ``fire_at``."""
+        occurrence = self.occurrence(cron, minutes_before, fire_at)
+        return occurrence + timedelta(minutes=minutes_before)
@@ -1,9 +1,17 @@
+from collections.abc import Collection
 from datetime import datetime, timedelta
 
-import pycron
-from redis.asyncio import Redis
-
-from maxhack.core.event.models import EventCreate, EventUpdate
+from maxhack.config import SchedulerConfig
+from maxhack.core.enums.stale_notify_policy import StaleNotifyPolicy
+from maxhack.core.event.models import (
+    DueNotify,
+    EventCreate,
+    EventNotification,
+    EventUpdate,
+    NotifyBacklog,
+)
+from maxhack.core.event.notify_scheduler import NotifyScheduler
+from maxhack.core.event.planner import NotifyPlanner
 from maxhack.core.exceptions import (
     EventNotFound,
     GroupNotFound,
@@ -11,22 +19,29 @@ from maxhack.core.exceptions import (
     NotEnoughRights,
 )
 from maxhack.core.group.service import GroupService
-from maxhack.core.ids import EventId, GroupId, TagId, UserId
+from maxhack.core.ids import (
+    EventId,
+    EventNotifyId,
+    GroupId,
+    NotifyDeliveryId,
+    TagId,
+    UserId,
+)
 from maxhack.core.responds.service import RespondService
 from maxhack.core.role.ids import CREATOR_ROLE_ID, EDITOR_ROLE_ID
 from maxhack.core.service import BaseService
 from maxhack.core.tag.service import TagService
 from maxhack.core.utils.datehelp import UTC_TIMEZONE, datetime_now
+from maxhack.core.utils.shard_leases import ShardSet
 from maxhack.database.models import (
     EventModel,
     EventNotifyModel,
     RespondModel,
-    UserModel,
-    UsersToGroupsModel,
 )
 from maxhack.database.repos.event import EventRepo
 from maxhack.database.repos.group import GroupRepo
 from maxhack.database.repos.invite import InviteRepo
+from maxhack.database.repos.notify_delivery import NotifyDeliveryRepo
 from maxhack.database.repos.respond import RespondRepo
 from maxhack.database.repos.role import RoleRepo
 from maxhack.database.repos.tag import TagRepo
@@ -36,6 +51,9 @@ from maxhack.logger.setup import get_logger
 
 logger = get_logger(__name__)
 
+# через сколько повторить напоминание, которое не удалось запланировать
+_RETRY_FAILED_AFTER = timedelta(minutes=1)
+
 
 class EventService(BaseService):
     def __init__(
@@ -50,8 +68,11 @@ class EventService(BaseService):
         respond_service: RespondService,
         group_service: GroupService,
         role_repo: RoleRepo,
-        redis: Redis,
         tag_service: TagService,
+        notify_delivery_repo: NotifyDeliveryRepo,
+        scheduler_config: SchedulerConfig,
+        notify_scheduler: NotifyScheduler,
+        notify_planner: NotifyPlanner,
     ) -> None:
         super().__init__(
             event_repo=event_repo,
@@ -65,8 +86,11 @@ class EventService(BaseService):
         )
         self._respond_service = respond_service
         self._group_service = group_service
-        self._redis = redis
         self._tag_service = tag_service
+        self._notify_delivery_repo = notify_delivery_repo
+        self._scheduler_config = scheduler_config
+        self._notify_scheduler = notify_scheduler
+        self._notify_planner = notify_planner
 
     async def get_event(self, event_id: EventId, user_id: UserId) -> EventModel:
         logger.debug(f"Getting event {event_id} for user {user_id}")
@@ -163,11 +187,23 @@ class EventService(BaseService):
                     [u.id for u, _ in users],
                 )
 
+        time_now = datetime_now()
         notifies = await self._event_repo.create_notify(
             event_id=event.id,
-            minutes_before=event_create_scheme.minutes_before,
+            next_fires={
+                minutes: self._notify_planner.fire_at(
+                    event.cron,
+                    event.id,
+                    minutes,
+                    time_now,
+                )
+                for minutes in {0, *event_create_scheme.minutes_before}
+            },
         )
         logger.debug(f"Created {len(notifies)} notifies for event {event.id}")
+        await self._notify_scheduler.schedule(
+            {notify.id: notify.next_fire_at for notify in notifies},
+        )
 
         return event, notifies
 
@@ -194,8 +230,10 @@ class EventService(BaseService):
             raise NotEnoughRights
 
         is_cycle = event.is_cycle
+        event_happened = event.event_happened
         if event_update_model.cron:
             is_cycle = any([event_update_model.cron.to_dict(exclude={"date"}).values()])
+            event_happened = False
 
         updated_event = await self._event_repo.update(
             event_id,
@@ -204,93 +242,104 @@ class EventService(BaseService):
                 exclude={"participants_ids", "tags_ids"},
             ),
             is_cycle=is_cycle,
+            event_happened=event_happened,
         )
         if updated_event is None:
             logger.error(f"Event {event_id} not found for update")
             raise EventNotFound
 
+        if event_update_model.cron:
+            await self._reschedule_notifies(updated_event)
+
         if event_update_model.tags_ids is not None:
-            logger.debug(
-                f"Updating tags for event {event_id} to {event_update_model.tags_ids}",
-            )
-            if event_update_model.tags_ids:
-                tags = [
-                    await self._ensure_tag_exists(tag_id)
-                    for tag_id in event_update_model.tags_ids
-                ]
-                if event.group_id is not None:
-                    invalid_tags = [
-                        tag.id for tag in tags if tag.group_id != event.group_id
-                    ]
-                    if invalid_tags:
-                        logger.warning(
-                            f"Invalid tags {invalid_tags} for event {event_id}",
-                        )
-                        raise InvalidValue(
-                            f"Теги не принадлежат группе события: {invalid_tags}",
-                        )
-            await self._event_repo.update_event_tags(
-                event_id,
+            await self._update_event_tags(
+                event,
                 event_update_model.tags_ids,
+                event_update_model.participants_ids,
             )
 
-            if event.type == "event" and event.group_id is not None:
-                user_ids_from_tags = []
-                for tag_id in event_update_model.tags_ids:
-                    users = await self._tag_repo.list_tag_users(
-                        group_id=event.group_id,
-                        tag_id=tag_id,
-                    )
-                    for user, _ in users:
-                        user_ids_from_tags.append(user.id)
-                current_user_ids = set(
-                    await self._event_repo.get_event_user_ids(event_id),
-                )
-                if event_update_model.participants_ids is not None:
-                    all_user_ids = set(event_update_model.participants_ids) | set(
-                        user_ids_from_tags,
-                    )
-                else:
-                    all_user_ids = current_user_ids | set(user_ids_from_tags)
-                if all_user_ids != current_user_ids:
-                    await self._event_repo.update_event_users(
-                        event_id,
-                        list(all_user_ids),
-                    )
-                    new_user_ids_from_tags = set(user_ids_from_tags) - current_user_ids
-                    if new_user_ids_from_tags:
-                        await self._respond_service.create(
-                            list(new_user_ids_from_tags),
-                            event.id,
-                            status="mb",
-                        )
-
         if event_update_model.participants_ids is not None:
-            logger.debug(
-                f"Updating users for event {event_id} to {event_update_model.participants_ids}",
-            )
-            for target_user_id in event_update_model.participants_ids:
-                await self._ensure_user_exists(target_user_id)
-                if event.group_id is not None:
-                    target_membership = await self._users_to_groups_repo.get_membership(
-                        user_id=target_user_id,
-                        group_id=event.group_id,
-                    )
-                    if target_membership is None:
-                        logger.warning(
-                            f"User {target_user_id} is not in group {event.group_id}",
-                        )
-                        raise InvalidValue(
-                            f"Пользователь {target_user_id} не состоит в группе события",
-                        )
-            await self._event_repo.update_event_users(
-                event_id,
+            await self._update_event_participants(
+                event,
                 event_update_model.participants_ids,
             )
 
         logger.info(f"Event {event_id} updated successfully")
         return updated_event
 
+    async def _update_event_tags(
+        self,
+        event: EventModel,
+        tags_ids: list[TagId],
+        participants_ids: list[UserId] | None,
+    ) -> None:
+        logger.debug(f"Updating tags for event {event.id} to {tags_ids}")
+        if tags_ids:
+            tags = [await self._ensure_tag_exists(tag_id) for tag_id in tags_ids]
+            if event.group_id is not None:
+                invalid_tags = [
+                    tag.id for tag in tags if tag.group_id != event.group_id
+                ]
+                if invalid_tags:
+                    logger.warning(
+                        f"Invalid tags {invalid_tags} for event {event.id}",
+                    )
+                    raise InvalidValue(
+                        f"Теги не принадлежат группе события: {invalid_tags}",
+                    )
+        await self._event_repo.update_event_tags(event.id, tags_ids)
+
+        if event.type == "event" and event.group_id is not None:
+            user_ids_from_tags = []
+            for tag_id in tags_ids:
+                users = await self._tag_repo.list_tag_users(
+                    group_id=event.group_id,
+                    tag_id=tag_id,
+                )
+                for user, _ in users:
+                    user_ids_from_tags.append(user.id)
+            current_user_ids = set(
+                await self._event_repo.get_event_user_ids(event.id),
+            )
+            if participants_ids is not None:
+                all_user_ids = set(participants_ids) | set(user_ids_from_tags)
+            else:
+                all_user_ids = current_user_ids | set(user_ids_from_tags)
+            if all_user_ids != current_user_ids:
+                await self._event_repo.update_event_users(
+                    event.id,
+                    list(all_user_ids),
+                )
+                new_user_ids_from_tags = set(user_ids_from_tags) - current_user_ids
+                if new_user_ids_from_tags:
+                    await self._respond_service.create(
+                        list(new_user_ids_from_tags),
+                        event.id,
+                        status="mb",
+                    )
+
+    async def _update_event_participants(
+        self,
+        event: EventModel,
+        participants_ids: list[UserId],
+    ) -> None:
+        logger.debug(f"Updating users for event {event.id} to {participants_ids}")
+        for target_user_id in participants_ids:
+            await self._ensure_user_exists(target_user_id)
+            if event.group_id is not None:
+                target_membership = await self._users_to_groups_repo.get_membership(
+                    user_id=target_user_id,
+                    group_id=event.group_id,
+                )
+                if target_membership is None:
+                    logger.warning(
+                        f"User {target_user_id} is not in group {event.group_id}",
+                    )
+                    raise InvalidValue(
+                        f"Пользователь {target_user_id} не состоит в группе события",
+                    )
+        await self._event_repo.update_event_users(event.id, participants_ids)
+
     async def delete_event(self, event_id: EventId, user_id: UserId) -> None:
         logger.debug(f"Deleting event {event_id} by user {user_id}")
         event = await self._ensure_event_exists(event_id)
@@ -306,11 +355,16 @@ class EventService(BaseService):
             logger.warning(f"User {user_id} has no rights to delete event {event_id}")
             raise NotEnoughRights
 
+        notifies = await self._event_repo.get_event_notifies(event_id)
         success = await self._event_repo.delete(event_id)
         if not success:
             logger.error(f"Event {event_id} not found for deletion")
             raise GroupNotFound
 
+        await self._notify_scheduler.unschedule(
+            {notify.id: notify.next_fire_at for notify in notifies},
+        )
+
         logger.info(f"Event {event_id} deleted successfully")
 
     async def add_tag_to_event(
@@ -517,68 +571,209 @@ class EventService(BaseService):
 
     async def get_notify_by_date_interval(
         self,
-    ) -> list[tuple[list[tuple[UserModel, UsersToGroupsModel | None]], EventModel]]:
-        logger.debug("Getting notifications by date interval")
+        shards: ShardSet | None = None,
+        notify_ids: Collection[EventNotifyId] | None = None,
+        *,
+        due: bool = True,
+    ) -> list[EventNotification]:
+        """
+        Тик рассылки напоминаний по шардам ``shards`` (по умолчанию - по всем)
+        или только по напоминаниям ``notify_ids``. ``due=False`` - наступивших
+        напоминаний заведомо нет, разбирается только журнал.
+
+        Сработавшие напоминания сначала раскладываются в журнал отправок
+        (по строке на получателя), и только потом сдвигается их ``next_fire_at``.
+        Затем из журнала забирается пачка неотправленных строк - в том числе
+        оставшихся от тиков, упавших посреди рассылки. На новые ``next_fire_at``
+        ставятся разовые задачи.
+
+        За раз разбирается не больше ``due_batch_size`` самых ранних
+        напоминаний, опоздавшие отсеиваются по ``stale_policy``: после простоя
+        пропущенное догоняется проходами, а не одним огромным тиком.
+        """
+        logger.debug("Getting due notifications")
         time_now = datetime_now()
-        last_start_str = await self._redis.get("last_start")
-        if last_start_str:
-            last_start = datetime.fromisoformat(last_start_str.decode())
-            logger.debug(f"Last start time found in redis: {last_start}")
-        else:
-            last_start = time_now
-            logger.debug("Last start time not found in redis, using current time")
 
-        last_start -= timedelta(seconds=5)  # подпёр костылём
-
-        events_with_notifies = await self._event_repo.get_notifies()
-        logger.debug(f"Found {len(events_with_notifies)} events with notifies")
-        matching_notify: list[
-            tuple[list[tuple[UserModel, UsersToGroupsModel | None]], EventModel]
-        ] = []
+        due_notifies: list[DueNotify] = []
+        if due:
+            due_notifies = await self._event_repo.get_due_notifies(
+                time_now,
+                shards,
+                notify_ids,
+                limit=self._scheduler_config.due_batch_size,
+            )
+        logger.debug(f"Found {len(due_notifies)} due notifies")
+        fired: list[DueNotify] = []
+        happened_ids: set[EventId] = set()
+        next_fires: dict[EventNotifyId, datetime | None] = {}
 
-        for event_notify, event in events_with_notifies:
+        for notify in due_notifies:
             try:
-                left_time = last_start + timedelta(minutes=event_notify.minutes_before)
-                right_time = time_now + timedelta(minutes=event_notify.minutes_before)
-                if pycron.has_been(event.cron, since=left_time, dt=right_time):
-                    logger.debug(
-                        f"Event {event.id} Notify {event_notify.id} matches cron expression",
+                # разовое событие напоминает о себе только один раз
+                next_fires[notify.notify_id] = (
+                    self._notify_planner.next_fire_at(
+                        notify.cron,
+                        notify.event_id,
+                        notify.minutes_before,
+                        notify.next_fire_at,
+                        time_now,
                     )
-                    if not event.is_cycle and event_notify.minutes_before == 0:
-                        await self._event_repo.update(event.id, event_happened=True)
-                        logger.debug(f"Event {event.id} marked as happened")
-
-                    users = await self._event_repo.get_event_users(event.id)
-                    logger.debug(f"Found {len(users)} users for event {event.id}")
-                    users_with_group_info: list[
-                        tuple[UserModel, UsersToGroupsModel | None]
-                    ] = []
-
-                    for user in users:
-                        membership: UsersToGroupsModel | None = None
-                        if event.group_id:
-                            membership = (
-                                await self._users_to_groups_repo.get_membership(
-                                    user_id=user.id,
-                                    group_id=event.group_id,
-                                )
-                            )
-                        users_with_group_info.append((user, membership))
-
-                    matching_notify.append((users_with_group_info, event))
-                    logger.debug(f"Event {event.id} added to matching notifications")
-
-            except Exception as e:
-                logger.error(
-                    f"Error processing event {event.id} with cron '{event.cron}': {e}",
+                    if notify.is_cycle
+                    else None
+                )
+            except Exception:
+                # не выключаем напоминание навсегда: попробуем в следующем тике
+                next_fires[notify.notify_id] = time_now + _RETRY_FAILED_AFTER
+                logger.exception(
+                    f"Error processing event {notify.event_id} "
+                    f"with cron '{notify.cron}'",
+                )
+                continue
+
+            if not notify.is_cycle and notify.minutes_before == 0:
+                happened_ids.add(notify.event_id)
+
+            fired.append(notify)
+            logger.debug(
+                f"Event {notify.event_id} Notify {notify.notify_id} "
+                "added to matching notifications",
+            )
+
+        fired_ids = self._drop_stale_notifies(fired, time_now)
+        await self._notify_delivery_repo.add_pending(fired_ids)
+        await self._event_repo.mark_happened(happened_ids)
+        await self._event_repo.set_notifies_next_fire_at(next_fires)
+        await self._notify_scheduler.schedule(next_fires)
+
+        claimed_ids = await self._notify_delivery_repo.claim(
+            now=time_now,
+            lease=timedelta(seconds=self._scheduler_config.delivery_lease_seconds),
+            limit=self._scheduler_config.delivery_batch_size,
+            shards=shards,
+            notify_ids=notify_ids,
+        )
+        rows = await self._notify_delivery_repo.get_claimed(claimed_ids)
+
+        notifications: dict[tuple[EventNotifyId, datetime], EventNotification] = {}
+        for delivery, event, user, membership, minutes_before in rows:
+            key = (delivery.notify_id, delivery.occurrence_at)
+            if key not in notifications:
+                notifications[key] = EventNotification(
+                    notify_id=delivery.notify_id,
+                    occurrence_at=delivery.occurrence_at,
+                    starts_at=self._notify_planner.starts_at(
+                        event.cron,
+                        minutes_before,
+                        delivery.occurrence_at,
+                    ),
+                    event=event,
                 )
+            notifications[key].recipients.append((user, membership))
+            notifications[key].deliveries[user.id] = delivery.id
+
+        # событие или пользователь удалены - отправлять больше некому
+        orphan_ids = set(claimed_ids).difference(delivery.id for delivery, *_ in rows)
+        await self._notify_delivery_repo.mark_sent(orphan_ids, time_now)
+
+        logger.info(
+            f"Claimed {len(claimed_ids)} deliveries "
+            f"for {len(notifications)} matching notifications",
+        )
+        return list(notifications.values())
+
+    async def notify_backlog(self, shards: ShardSet | None = None) -> NotifyBacklog:
+        time_now = datetime_now()
+        return NotifyBacklog(
+            due=await self._event_repo.count_due_notifies(time_now, shards),
+            pending=await self._notify_delivery_repo.count_claimable(
+                now=time_now,
+                lease=timedelta(seconds=self._scheduler_config.delivery_lease_seconds),
+                shards=shards,
+            ),
+        )
+
+    def _drop_stale_notifies(
+        self,
+        fired: list[DueNotify],
+        now: datetime,
+    ) -> list[EventNotifyId]:
+        """
+        Отсеивает напоминания, опоздавшие больше чем на ``stale_after_seconds``
+        (например, после простоя планировщика). При ``DROP`` они не отправляются,
+        при ``COALESCE`` от каждого события остаётся только последнее из них,
+        и то если у события нет свежего напоминания. Кроме ``SEND``, напоминания
+        о уже закончившихся событиях не отправляются вовсе.
+        """
+        policy = StaleNotifyPolicy(self._scheduler_config.stale_policy)
+        if policy == StaleNotifyPolicy.SEND:
+            return [notify.notify_id for notify in fired]
+
+        stale_after = timedelta(seconds=self._scheduler_config.stale_after_seconds)
+        kept: list[EventNotifyId] = []
+        fresh_event_ids: set[EventId] = set()
+        latest_stale: dict[EventId, DueNotify] = {}
+        for notify in fired:
+            fire_at = notify.next_fire_at
+            if now - fire_at <= stale_after:
+                kept.append(notify.notify_id)
+                fresh_event_ids.add(notify.event_id)
                 continue
 
-        await self._redis.set("last_start", time_now.isoformat())
-        logger.debug(f"New last start time set to redis: {time_now}")
+            starts_at = self._notify_planner.starts_at(
+                notify.cron,
+                notify.minutes_before,
+                fire_at,
+            )
+            if now > starts_at + timedelta(minutes=notify.duration):
+                continue
 
-        logger.info(f"Found {len(matching_notify)} matching notifications")
-        return matching_notify
+            latest = latest_stale.get(notify.event_id)
+            if policy == StaleNotifyPolicy.COALESCE and (
+                latest is None or latest.next_fire_at < fire_at
+            ):
+                latest_stale[notify.event_id] = notify
+
+        kept.extend(
+            notify.notify_id
+            for event_id, notify in latest_stale.items()
+            if event_id not in fresh_event_ids
+        )
+        if dropped := len(fired) - len(kept):
+            logger.info(f"Dropped {dropped} stale notifies by {policy} policy")
+        return kept
+
+    async def mark_deliveries_sent(
+        self,
+        delivery_ids: Collection[NotifyDeliveryId],
+    ) -> None:
+        await self._notify_delivery_repo.mark_sent(delivery_ids, datetime_now())
+        logger.debug(f"Marked {len(delivery_ids)} deliveries as sent")
+
+    async def purge_notify_deliveries(self) -> None:
+        before = datetime_now() - timedelta(
+            days=self._scheduler_config.delivery_retention_days,
+        )
+        purged = await self._notify_delivery_repo.purge_sent(before)
+        logger.info(f"Purged {purged} notify deliveries sent before {before}")
+
+    async def _reschedule_notifies(self, event: EventModel) -> None:
+        time_now = datetime_now()
+        notifies = await self._event_repo.get_event_notifies(event.id)
+        next_fires = {
+            notify.id: self._notify_planner.fire_at(
+                event.cron,
+                event.id,
+                notify.minutes_before,
+                time_now,
+            )
+            for notify in notifies
+        }
+        await self._event_repo.set_notifies_next_fire_at(next_fires)
+        await self._notify_scheduler.unschedule(
+            {notify.id: notify.next_fire_at for notify in notifies},
+        )
+        await self._notify_scheduler.schedule(next_fires)
+        logger.debug(f"Rescheduled {len(notifies)} notifies for event {event.id}")
 
     async def get_by_user(
         self,
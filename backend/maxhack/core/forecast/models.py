@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from maxhack.core.model import DomainModel
+
+
+@dataclass(kw_only=True)
+class ForecastMinute(DomainModel):
+    at: datetime
+    # сколько сообщений планировщик попытается отправить в эту минуту
+    messages: int
+    over_capacity: bool
+
+
+@dataclass(kw_only=True)
+class LoadForecast(DomainModel):
+    """Прогноз нагрузки рассылки напоминаний по минутам."""
+
+    start: datetime
+    # сколько сообщений в минуту пропускает лимит Max API
+    capacity_per_minute: int
+    minutes: list[ForecastMinute] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(minute.messages for minute in self.minutes)
+
+    @property
+    def peak(self) -> ForecastMinute | None:
+        return max(self.minutes, key=lambda minute: minute.messages, default=None)
+
+    @property
+    def overloaded(self) -> list[ForecastMinute]:
+        return [minute for minute in self.minutes if minute.over_capacity]
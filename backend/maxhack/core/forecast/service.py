@@ -0,0 +1,86 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from maxhack.config import MaxConfig
+from maxhack.core.cron import CronExpander, CronTable
+from maxhack.core.event.planner import NotifyPlanner
+from maxhack.core.forecast.models import ForecastMinute, LoadForecast
+from maxhack.core.utils.datehelp import datetime_now
+from maxhack.database.repos.event import EventRepo
+from maxhack.logger.setup import get_logger
+
+logger = get_logger(__name__)
+
+
+class ForecastService:
+    """
+    Прогноз того, сколько сообщений в минуту планировщик попытается
+    отправить: кроны всех действующих напоминаний раскладываются по минутам
+    с учётом ``minutes_before``, сдвига ``NotifyPlanner`` и числа участников.
+
+    Прогноз - верхняя граница: сводные сообщения, режимы уведомлений
+    и недоступные чаты его только уменьшают.
+    """
+
+    def __init__(
+        self,
+        event_repo: EventRepo,
+        notify_planner: NotifyPlanner,
+        cron_expander: CronExpander,
+        max_config: MaxConfig,
+    ) -> None:
+        self._event_repo = event_repo
+        self._notify_planner = notify_planner
+        self._cron_expander = cron_expander
+        self._capacity = int(
+            max_config.rate_limit_calls / max_config.rate_limit_period * 60,
+        )
+
+    async def forecast(
+        self,
+        hours: int = 24,
+        start: datetime | None = None,
+    ) -> LoadForecast:
+        start = (start or datetime_now()).replace(second=0, microsecond=0)
+        rows = await self._event_repo.get_notify_load()
+
+        # одинаковые (крон, сдвиг) считаются один раз - их обычно большинство
+        load: Counter[tuple[str, int]] = Counter()
+        for event_id, cron, minutes_before, participants in rows:
+            offset = self._notify_planner.offset(event_id, minutes_before)
+            shift = minutes_before + offset // timedelta(minutes=1)
+            load[cron, shift] += participants
+
+        minutes = hours * 60
+        counts = np.zeros(minutes, dtype=np.int64)
+        if load:
+            table = CronTable.from_expressions(cron for cron, _ in load)
+            counts = await self._cron_expander.fire_counts(
+                table,
+                start,
+                minutes,
+                shift_minutes=np.fromiter((shift for _, shift in load), np.int64),
+                weights=np.fromiter(load.values(), np.int64),
+            )
+        logger.info(
+            "Forecast for %d notifies (%d distinct) over %d h: %d messages",
+            len(rows),
+            len(load),
+            hours,
+            int(counts.sum()),
+        )
+
+        return LoadForecast(
+            start=start,
+            capacity_per_minute=self._capacity,
+            minutes=[
+                ForecastMinute(
+                    at=start + timedelta(minutes=i),
+                    messages=int(messages),
+                    over_capacity=messages > self._capacity,
+                )
+                for i, messages in enumerate(counts)
+            ],
+        )
@@ -1,9 +1,10 @@
 from datetime import UTC, datetime, timedelta, timezone
+from itertools import islice
 from typing import TypedDict
 
-from croniter import croniter
 from icalendar import Calendar, Event as ICalEvent
 
+from maxhack.core.cron import InvalidCron, compile_cron
 from maxhack.core.event.models import Cron, EventCreate
 from maxhack.core.event.service import EventService
 from maxhack.core.exceptions import GroupNotFound
@@ -94,6 +95,9 @@ class IcsService(BaseService):
             end_date = start_date + timedelta(days=365)
 
         current_time = datetime.now(UTC)
+        period_start = max(start_date.replace(tzinfo=user_timezone), current_time)
+        period_end = end_date.replace(tzinfo=user_timezone)
+        max_events = 1000
 
         for event in events:
             if event.event_happened and not event.is_cycle:
@@ -102,62 +106,38 @@ class IcsService(BaseService):
             organizer_name = group.name if group else "Unknown Group"
 
             try:
-                event_start_date = start_date.replace(tzinfo=user_timezone)
-                cron = croniter(event.cron, event_start_date)
-            except Exception:
+                cron = compile_cron(event.cron)
+            except InvalidCron:
                 continue
 
-            event_count = 0
-            max_events = 1000
-            last_date = None
-
-            while event_count < max_events:
-                try:
-                    next_date = cron.get_next(datetime)
-                    if next_date.tzinfo is None:
-                        next_date = next_date.replace(tzinfo=user_timezone)
-                    else:
-                        next_date = next_date.astimezone(user_timezone)
-
-                    if next_date > end_date.replace(tzinfo=user_timezone):
-                        break
-
-                    if last_date and next_date <= last_date:
-                        break
+            occurrences = cron.occurrences(period_start, period_end)
+            limit = max_events if event.is_cycle else 1
 
-                    if next_date < current_time.replace(tzinfo=user_timezone):
-                        continue
+            for occurrence in islice(occurrences, limit):
+                next_date = occurrence.astimezone(user_timezone)
 
-                    ical_event = ICalEvent()
-                    ical_event.add("summary", event.title)
-                    ical_event.add("dtstart", next_date)
-                    ical_event.add("dtstamp", datetime.now(UTC))
+                ical_event = ICalEvent()
+                ical_event.add("summary", event.title)
+                ical_event.add("dtstart", next_date)
+                ical_event.add("dtstamp", current_time)
 
-                    if event.duration:
-                        end_datetime = next_date + timedelta(minutes=event.duration)
-                        ical_event.add("dtend", end_datetime)
-                    else:
-                        ical_event.add("dtend", next_date + timedelta(hours=1))
-
-                    if event.description:
-                        ical_event.add("description", event.description)
+                if event.duration:
+                    end_datetime = next_date + timedelta(minutes=event.duration)
+                    ical_event.add("dtend", end_datetime)
+                else:
+                    ical_event.add("dtend", next_date + timedelta(hours=1))
 
-                    ical_event.add("organizer", f"CN={organizer_name}:mailto:")
+                if event.description:
+                    ical_event.add("description", event.description)
 
-                    ical_event.add(
-                        "uid",
-                        f"event-{event.id}-{int(next_date.timestamp())}@maxhack",
-                    )
+                ical_event.add("organizer", f"CN={organizer_name}:mailto:")
 
-                    cal.add_component(ical_event)
-                    event_count += 1
-                    last_date = next_date
-
-                    if not event.is_cycle:
-                        break
+                ical_event.add(
+                    "uid",
+                    f"event-{event.id}-{int(next_date.timestamp())}@maxhack",
+                )
 
-                except Exception:
-                    break
+                cal.add_component(ical_event)
 
         ics_bytes = cal.to_ical()
         return ics_bytes
@@ -12,4 +12,6 @@ InviteId = NewType("InviteId", int)
 InviteKey = NewType("InviteKey", str)
 RespondId = NewType("RespondId", int)
 NotifyId = NewType("NotifyId", int)
+NotifyDeliveryId = NewType("NotifyDeliveryId", int)
+AgendaId = NewType("AgendaId", int)
 SchedulerTaskId = NewType("SchedulerTaskId", str)
@@ -1,9 +1,10 @@
 from .deeplinker import QRCoder
 from .mass_mailer import MaxMailer
-from .sender import MaxSender
+from .sender import MaxSendError, MaxSender
 
 __all__ = (
     "MaxMailer",
+    "MaxSendError",
     "MaxSender",
     "QRCoder",
 )
@@ -1,45 +1,175 @@
-import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from itertools import batched
 
 from maxo.fsm import State
 
-from maxhack.core.max.notifier import MaxNotifier
+from maxhack.config import MaxConfig
+from maxhack.core.agenda.models import Agenda
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.event.coalesce import coalesce_notifications
+from maxhack.core.event.models import EventNotification, NotifyDigest
+from maxhack.core.max.notifier import MaxNotifier, NotifyRenders
+from maxhack.core.max.outbox import MaxOutbox, OutboundMessage
 from maxhack.core.max.sender import MaxSender
-from maxhack.database.models import EventModel, UserModel, UsersToGroupsModel
+from maxhack.core.utils.fan_out import FanOutChunk, FanOutStats, fan_out
+from maxhack.database.models import UserModel
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("maxo", "max"))
 
 
 class MaxMailer:
-    def __init__(self, max_sender: MaxSender, max_notifier: MaxNotifier) -> None:
+    """
+    Массовые рассылки. Получатели обрабатываются ограниченным числом воркеров,
+    поэтому на большой рассылке не создаются тысячи корутин разом,
+    а скорость упирается только в лимит ``MaxSender``.
+    """
+
+    def __init__(
+        self,
+        max_sender: MaxSender,
+        max_notifier: MaxNotifier,
+        max_outbox: MaxOutbox,
+        max_config: MaxConfig,
+    ) -> None:
         self._max_sender = max_sender
         self._max_notifier = max_notifier
+        self._max_outbox = max_outbox if max_config.outbox_enabled else None
+        self._workers = max_config.mailer_workers
+        self._chunk_size = max_config.mailer_chunk_size
+        self._coalesce_max_events = max_config.notify_coalesce_max_events
+
+    async def default_message(
+        self,
+        text: str,
+        users: Iterable[UserModel],
+    ) -> FanOutStats:
+        async def send(user: UserModel) -> None:
+            await self._max_sender.send_message(
+                text=text,
+                chat_id=user.max_chat_id,
+                priority=SendPriority.BULK,
+                raise_on_failure=True,
+            )
 
-    async def default_message(self, text: str, users: list[UserModel]) -> None:
-        await asyncio.gather(
-            *(
-                self._max_sender.send_message(text=text, chat_id=user.max_chat_id)
-                for user in users
-            ),
+        return await fan_out(
+            _reachable(users),
+            send,
+            workers=self._workers,
+            chunk_size=self._chunk_size,
+            name="default_message",
         )
 
-    async def start_dialog(self, state: State, users: list[UserModel]) -> None:
-        await asyncio.gather(
-            *(
-                self._max_sender.start_dialog(
-                    state=state,
-                    user_id=user.max_id,
-                    chat_id=user.max_chat_id,
-                )
-                for user in users
-            ),
+    async def start_dialog(
+        self,
+        state: State,
+        users: Iterable[UserModel],
+    ) -> FanOutStats:
+        async def start(user: UserModel) -> None:
+            await self._max_sender.start_dialog(
+                state=state,
+                user_id=user.max_id,
+                chat_id=user.max_chat_id,
+                priority=SendPriority.BULK,
+                raise_on_failure=True,
+            )
+
+        return await fan_out(
+            _reachable(users),
+            start,
+            workers=self._workers,
+            chunk_size=self._chunk_size,
+            name="start_dialog",
         )
 
     async def event_notify(
         self,
-        event: EventModel,
-        users: list[tuple[UserModel, UsersToGroupsModel]],
-    ) -> None:
-        await asyncio.gather(
-            *(
-                self._max_notifier.event_notify(event, user, membership)
-                for user, membership in users
-            ),
+        notifications: Iterable[EventNotification],
+        on_chunk: Callable[[FanOutChunk[NotifyDigest]], Awaitable[None]] | None = None,
+    ) -> FanOutStats:
+        """
+        Рассылает срабатывания тика: каждый получатель получает одно сообщение
+        обо всех своих событиях (не больше ``notify_coalesce_max_events``
+        в сообщении). ``on_chunk`` получает каждую обработанную пачку сообщений.
+        Недоступных пользователей отсеивает ещё журнал доставки.
+
+        С очередью исходящих сообщений пачки не отправляются, а только
+        складываются в очередь: тогда ``on_chunk`` получает пачки,
+        переданные очереди, и тик не ждёт лимита Max API.
+        """
+        digests = coalesce_notifications(notifications, self._coalesce_max_events)
+        # получатели одних и тех же событий получают одно собранное сообщение
+        renders: NotifyRenders = {}
+
+        def message(digest: NotifyDigest) -> OutboundMessage | None:
+            return self._max_notifier.event_notify_message(
+                digest.user,
+                digest.events,
+                digest.starts_at,
+                renders,
+            )
+
+        if self._max_outbox is not None:
+            return await self._enqueue(
+                self._max_outbox,
+                digests,
+                message,
+                on_chunk,
+                name="event_notify",
+            )
+
+        async def notify(digest: NotifyDigest) -> None:
+            outbound = message(digest)
+            if outbound is not None:
+                await self._max_notifier.send(outbound)
+
+        return await fan_out(
+            digests,
+            notify,
+            workers=self._workers,
+            chunk_size=self._chunk_size,
+            on_chunk=on_chunk,
+            name="event_notify",
+        )
+
+    async def agenda(
+        self,
+        agendas: Iterable[Agenda],
+        on_chunk: Callable[[FanOutChunk[Agenda]], Awaitable[None]] | None = None,
+    ) -> FanOutStats:
+        return await fan_out(
+            agendas,
+            self._max_notifier.agenda,
+            workers=self._workers,
+            chunk_size=self._chunk_size,
+            on_chunk=on_chunk,
+            name="agenda",
         )
+
+    async def _enqueue[T](
+        self,
+        max_outbox: MaxOutbox,
+        items: list[T],
+        message: Callable[[T], OutboundMessage | None],
+        on_chunk: Callable[[FanOutChunk[T]], Awaitable[None]] | None,
+        name: str,
+    ) -> FanOutStats:
+        """Складывает сообщения в очередь пачками по ``mailer_chunk_size``."""
+        stats = FanOutStats()
+        for index, chunk in enumerate(batched(items, self._chunk_size)):
+            queued = await max_outbox.enqueue(
+                outbound for outbound in map(message, chunk) if outbound is not None
+            )
+            stats.done += len(chunk)
+            stats.chunks += 1
+            logger.debug("%s: chunk %d queued %d messages", name, index, queued)
+            if on_chunk is not None:
+                await on_chunk(FanOutChunk(index=index, done=list(chunk)))
+
+        logger.info("%s: queued %d in %d chunks", name, stats.done, stats.chunks)
+        return stats
+
+
+def _reachable(users: Iterable[UserModel]) -> Iterator[UserModel]:
+    """Пропускает пользователей, которым бот не может написать."""
+    return (user for user in users if user.blocked_at is None)
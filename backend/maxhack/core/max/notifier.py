@@ -1,61 +1,200 @@
+import functools
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
 from maxo.types import InlineKeyboardAttachmentRequest
 from maxo.types.callback_keyboard_button import CallbackKeyboardButton
 
 from maxhack.bot.filters.respond import RespondData
+from maxhack.core.agenda.models import Agenda
 from maxhack.core.enums.notify_mode import NotifyMode
 from maxhack.core.enums.respond_action import RespondStatus
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.ids import EventId
+from maxhack.core.max.outbox import OutboundMessage
 from maxhack.core.max.sender import MaxSender
+from maxhack.core.utils.datehelp import datetime_now
 from maxhack.database.models import EventModel, UserModel, UsersToGroupsModel
 
+# напоминания о событиях, до начала которых меньше этого, идут срочной полосой
+URGENT_NOTIFY_WINDOW: Final = timedelta(minutes=5)
+# сколько символов названия события помещается на кнопку сводного напоминания
+_BUTTON_TITLE_LENGTH: Final = 24
+# режимы, в которых отдельные напоминания не отправляются
+_SKIP_REMINDER_MODES: Final = frozenset({NotifyMode.DISABLE, NotifyMode.DIGEST})
+# ряды кнопок клавиатуры: (текст, payload)
+_Keyboard = tuple[tuple[tuple[str, str], ...], ...]
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EventNotifyMessage:
+    """Готовое напоминание о событиях: одинаковое для всех получателей."""
+
+    text: str
+    # ряды кнопок клавиатуры: (текст, payload)
+    keyboard: list[list[tuple[str, str]]]
+
+
+# собранные за рассылку напоминания по id событий
+NotifyRenders = dict[tuple[EventId, ...], EventNotifyMessage]
+
 
 class MaxNotifier:
     def __init__(self, max_sender: MaxSender) -> None:
         self._max_sender = max_sender
 
-    async def event_notify(
+    @staticmethod
+    def notify_priority(starts_at: datetime, now: datetime) -> SendPriority:
+        """Полоса отправки напоминания: чем ближе начало события, тем срочнее."""
+        if starts_at - now <= URGENT_NOTIFY_WINDOW:
+            return SendPriority.URGENT
+        return SendPriority.REMINDER
+
+    @staticmethod
+    def render_events_notify(events: list[EventModel]) -> EventNotifyMessage:
+        """
+        Одно сообщение с напоминаниями о нескольких событиях:
+        под каждым событием - свой ряд кнопок отклика.
+        """
+        if len(events) == 1:
+            return MaxNotifier.render_event_notify(events[0])
+
+        keyboard = []
+        for event in events:
+            title = event.title
+            if len(title) > _BUTTON_TITLE_LENGTH:
+                title = title[: _BUTTON_TITLE_LENGTH - 1] + "…"
+            keyboard.append(
+                [
+                    (f"✅ {title}", _respond_payload(event, RespondStatus.OK)),
+                    ("🤷", _respond_payload(event, RespondStatus.MAYBE)),
+                    ("❌", _respond_payload(event, RespondStatus.NO)),
+                ],
+            )
+        titles = "\n".join(f"• {event.title}" for event in events)
+        return EventNotifyMessage(
+            text=f"🔔 Напоминания о событиях:\n{titles}",
+            keyboard=keyboard,
+        )
+
+    @staticmethod
+    def render_event_notify(event: EventModel) -> EventNotifyMessage:
+        """
+        Собирает текст и клавиатуру напоминания. От получателя зависит только
+        флаг ``notify``, поэтому на рассылку достаточно собрать сообщение один раз.
+        """
+        keyboard = [
+            [("✅ Буду", _respond_payload(event, RespondStatus.OK))],
+            [("🤷 Не уверен", _respond_payload(event, RespondStatus.MAYBE))],
+            [("❌ Не смогу", _respond_payload(event, RespondStatus.NO))],
+        ]
+        return EventNotifyMessage(
+            text=f"🔔 Напоминание о событии {event.title}",
+            keyboard=keyboard,
+        )
+
+    def event_notify_message(
         self,
-        event: EventModel,
         user: UserModel,
-        membership: UsersToGroupsModel,
-    ) -> None:
-        if NotifyMode.DISABLE in (user.notify_mode, membership.notify_mode):
-            return
+        events: list[tuple[EventModel, UsersToGroupsModel | None]],
+        starts_at: datetime,
+        renders: NotifyRenders | None = None,
+    ) -> OutboundMessage | None:
+        """
+        Напоминание ``user`` о событиях ``events`` одним сообщением.
+        События из групп, где уведомления отключены или приходят
+        утренней сводкой, пропускаются; ``None``, если не осталось ни одного.
 
-        text = f"🔔 Напоминание о событии {event.title}"
-        keyboard = [
-            [
-                CallbackKeyboardButton(
-                    text="✅ Буду",
-                    payload=RespondData(
-                        event_id=event.id,
-                        status=RespondStatus.OK,
-                    ).pack(),
-                ),
-            ],
-            [
-                CallbackKeyboardButton(
-                    text="🤷 Не уверен",
-                    payload=RespondData(
-                        event_id=event.id,
-                        status=RespondStatus.MAYBE,
-                    ).pack(),
-                ),
-            ],
-            [
-                CallbackKeyboardButton(
-                    text="❌ Не смогу",
-                    payload=RespondData(
-                        event_id=event.id,
-                        status=RespondStatus.NO,
-                    ).pack(),
-                ),
-            ],
+        ``renders`` - собранные за рассылку сообщения по id событий:
+        получатели одного набора событий делят одно сообщение.
+        """
+        modes = {
+            event.id: membership.notify_mode if membership else user.notify_mode
+            for event, membership in events
+        }
+        events_to_send = [
+            event
+            for event, _ in events
+            if not _SKIP_REMINDER_MODES & {user.notify_mode, modes[event.id]}
         ]
-        attachments = [InlineKeyboardAttachmentRequest.factory(keyboard)]
+        if not events_to_send:
+            return None
 
-        await self._max_sender.send_message(
-            text=text,
+        key = tuple(event.id for event in events_to_send)
+        message = renders.get(key) if renders is not None else None
+        if message is None:
+            message = self.render_events_notify(events_to_send)
+            if renders is not None:
+                renders[key] = message
+
+        return OutboundMessage(
             chat_id=user.max_chat_id,
-            attachments=attachments,
-            notify=user.notify_mode == membership.notify_mode == NotifyMode.DEFAULT,
+            text=message.text,
+            keyboard=message.keyboard,
+            notify=user.notify_mode == NotifyMode.DEFAULT
+            and all(modes[event.id] == NotifyMode.DEFAULT for event in events_to_send),
+            starts_at=starts_at,
+        )
+
+    async def send(self, message: OutboundMessage) -> None:
+        """
+        Отправляет готовое сообщение. Полоса напоминания выбирается
+        по началу события прямо перед отправкой: пока длинная рассылка
+        идёт, события приближаются и она становится срочнее.
+        Временная ошибка Max API пробрасывается как ``MaxSendError``.
+        """
+        priority = message.priority
+        if message.starts_at is not None:
+            priority = self.notify_priority(message.starts_at, datetime_now())
+
+        keyboard = tuple(
+            tuple((text, payload) for text, payload in row) for row in message.keyboard
+        )
+        await self._max_sender.send_message(
+            text=message.text,
+            chat_id=message.chat_id,
+            attachments=[_keyboard_attachment(keyboard)] if keyboard else [],
+            notify=message.notify,
+            priority=priority,
+            raise_on_failure=True,
         )
+
+    async def agenda(self, agenda: Agenda) -> None:
+        """Утренняя сводка: события дня по времени пользователя."""
+        if not agenda.entries:
+            return
+
+        tz = timezone(timedelta(minutes=agenda.user.timezone))
+        lines = "\n".join(
+            f"{entry.starts_at.astimezone(tz):%H:%M} — {entry.title}"
+            for entry in agenda.entries
+        )
+        await self._max_sender.send_message(
+            text=f"🗓 События на {agenda.day:%d.%m}:\n{lines}",
+            chat_id=agenda.user.max_chat_id,
+            notify=agenda.user.notify_mode != NotifyMode.SILENT,
+            priority=SendPriority.REMINDER,
+            raise_on_failure=True,
+        )
+
+
+def _respond_payload(event: EventModel, status: RespondStatus) -> str:
+    return RespondData(event_id=event.id, status=status).pack()
+
+
+@functools.lru_cache(maxsize=1024)
+def _keyboard_attachment(keyboard: _Keyboard) -> InlineKeyboardAttachmentRequest:
+    """
+    Вложение с клавиатурой. Собирается один раз на одинаковые кнопки:
+    у всех получателей одного напоминания клавиатура общая.
+    """
+    return InlineKeyboardAttachmentRequest.factory(
+        [
+            [
+                CallbackKeyboardButton(text=text, payload=payload)
+                for text, payload in row
+            ]
+            for row in keyboard
+        ],
+    )
@@ -0,0 +1,288 @@
+import asyncio
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Final
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.ids import MaxChatId
+from maxhack.core.max.sender import MaxSendError
+from maxhack.core.utils.fan_out import FanOutChunk, fan_out
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("redis", "max"))
+
+_MESSAGE_FIELD: Final = b"message"
+# пауза перед новой попыткой, если Redis недоступен
+_RETRY_DELAY: Final = 1.0
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class OutboundMessage:
+    """Сообщение, готовое к отправке: всё, что нужно ``MaxSender``."""
+
+    chat_id: MaxChatId
+    text: str
+    # ряды кнопок клавиатуры: (текст, payload)
+    keyboard: list[list[tuple[str, str]]] = field(default_factory=list)
+    notify: bool = True
+    priority: SendPriority = SendPriority.REMINDER
+    # начало события: по нему полоса пересчитывается прямо перед отправкой
+    starts_at: datetime | None = None
+
+
+# запись стрима и сообщение из неё, ``None`` - запись битая
+_Entry = tuple[bytes, OutboundMessage | None]
+
+
+class MaxOutbox:
+    """
+    Очередь исходящих сообщений в стриме Redis.
+
+    Тик только складывает готовые сообщения в стрим одной пачкой
+    и заканчивается, а отправляют их отправители (``run``) из группы
+    потребителей: каждое сообщение достаётся одному из них и удаляется
+    из стрима после отправки. Сообщения упавшего отправителя остаются
+    в стриме неподтверждёнными и через ``claim_idle`` секунд достаются
+    другому - очередь переживает перезапуск любого процесса.
+
+    Доставка «хотя бы раз»: при падении посреди пачки её неподтверждённая
+    часть (не больше ``workers`` сообщений) отправится повторно. Так же
+    через ``claim_idle`` повторяются сообщения, которые ``handler`` не смог
+    отправить из-за временной ошибки Max API (``MaxSendError``). После
+    ``max_deliveries`` попыток такое сообщение переносится в стрим
+    недоставленных ``<key>:dead`` и из очереди удаляется.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        key: str,
+        batch_size: int,
+        claim_idle: float,
+        workers: int,
+        max_deliveries: int,
+    ) -> None:
+        if min(batch_size, workers, claim_idle, max_deliveries) <= 0:
+            msg = (
+                "`batch_size`, `workers`, `claim_idle` and `max_deliveries` must be > 0"
+            )
+            raise ValueError(msg)
+
+        self._redis = redis
+        self._stream = key
+        self._group = f"{key}:senders"
+        self._dead_stream = f"{key}:dead"
+        self._batch_size = batch_size
+        self._claim_idle_ms = round(claim_idle * 1000)
+        self._workers = workers
+        self._max_deliveries = max_deliveries
+        self._group_ready = False
+
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def enqueue(self, messages: Iterable[OutboundMessage]) -> int:
+        """Кладёт сообщения в очередь за один запрос к Redis."""
+        count = 0
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.xadd(self._stream, {_MESSAGE_FIELD: _dump(message)})
+                count += 1
+            if count:
+                await pipe.execute()
+        return count
+
+    async def drain(
+        self,
+        handler: Callable[[OutboundMessage], Awaitable[object]],
+        block: float | None = None,
+    ) -> int:
+        """
+        Один проход отправителя: забирает зависшие у упавших отправителей
+        сообщения и новые, не больше ``batch_size``, и отдаёт их ``handler``.
+        Новых сообщений ждёт до ``block`` секунд. Возвращает, сколько разобрано.
+        """
+        await self._ensure_group()
+
+        _, claimed, *_ = await self._redis.xautoclaim(
+            self._stream,
+            self._group,
+            self.consumer,
+            min_idle_time=self._claim_idle_ms,
+            start_id="0-0",
+            count=self._batch_size,
+        )
+        entries = [_parse(entry_id, fields) for entry_id, fields in claimed]
+        if entries:
+            logger.warning(
+                "Перехвачено %d сообщений упавших отправителей",
+                len(entries),
+            )
+
+        if len(entries) < self._batch_size:
+            streams = await self._redis.xreadgroup(
+                self._group,
+                self.consumer,
+                {self._stream: ">"},
+                count=self._batch_size - len(entries),
+                block=None if entries or block is None else round(block * 1000),
+            )
+            for _, stream_entries in streams or ():
+                entries.extend(
+                    _parse(entry_id, fields) for entry_id, fields in stream_entries
+                )
+        if not entries:
+            return 0
+
+        retry: set[bytes] = set()
+
+        async def send(entry: _Entry) -> None:
+            entry_id, message = entry
+            if message is None:
+                logger.error("Битое сообщение %s в очереди, пропущено", entry_id)
+                return
+            try:
+                await handler(message)
+            except MaxSendError:
+                retry.add(entry_id)
+                raise
+
+        async def ack(chunk: FanOutChunk[_Entry]) -> None:
+            # временные ошибки Max API не подтверждаются: сообщение остаётся
+            # в стриме и через claim_idle повторится, пока не кончатся попытки.
+            # Остальные упавшие подтверждаются - повтор дал бы ту же ошибку
+            await self._ack(
+                [
+                    entry_id
+                    for entry_id, _ in (*chunk.done, *chunk.failed)
+                    if entry_id not in retry
+                ],
+                dead=await self._exhausted(
+                    [entry for entry in chunk.failed if entry[0] in retry],
+                ),
+            )
+
+        await fan_out(
+            entries,
+            send,
+            workers=self._workers,
+            chunk_size=self._workers,
+            on_chunk=ack,
+            name="outbox",
+        )
+        return len(entries)
+
+    async def run(
+        self,
+        handler: Callable[[OutboundMessage], Awaitable[object]],
+    ) -> None:
+        """Отправляет сообщения из очереди, пока задачу не отменят."""
+        logger.info("Отправитель %s разбирает очередь сообщений", self.consumer)
+        while True:
+            try:
+                await self.drain(handler, block=_RETRY_DELAY)
+            except (RedisError, OSError) as e:
+                logger.warning("Не удалось разобрать очередь сообщений", exc_info=e)
+                self._group_ready = False
+                await asyncio.sleep(_RETRY_DELAY)
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self._redis.xgroup_create(
+                self._stream,
+                self._group,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as e:
+            # группу уже создал другой отправитель
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _exhausted(self, entries: list[_Entry]) -> list[_Entry]:
+        """Записи из ``entries``, у которых кончились попытки доставки."""
+        if not entries:
+            return []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for entry_id, _ in entries:
+                pipe.xpending_range(
+                    self._stream,
+                    self._group,
+                    min=entry_id,
+                    max=entry_id,
+                    count=1,
+                )
+            pending = await pipe.execute()
+        return [
+            entry
+            for entry, info in zip(entries, pending, strict=True)
+            if info and info[0]["times_delivered"] >= self._max_deliveries
+        ]
+
+    async def _ack(self, entry_ids: list[bytes], dead: list[_Entry]) -> None:
+        """
+        Подтверждает и удаляет записи ``entry_ids``, а ``dead`` перед этим
+        переносит в стрим недоставленных.
+        """
+        for entry_id, message in dead:
+            logger.error(
+                "Сообщение %s в чат %s не отправлено за %d попыток, перенесено в %s",
+                entry_id,
+                message and message.chat_id,
+                self._max_deliveries,
+                self._dead_stream,
+            )
+        entry_ids = [*entry_ids, *(entry_id for entry_id, _ in dead)]
+        if not entry_ids:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for _, message in dead:
+                if message is not None:
+                    pipe.xadd(self._dead_stream, {_MESSAGE_FIELD: _dump(message)})
+            pipe.xack(self._stream, self._group, *entry_ids)
+            pipe.xdel(self._stream, *entry_ids)
+            await pipe.execute()
+
+
+def _dump(message: OutboundMessage) -> bytes:
+    return orjson.dumps(
+        {
+            "chat_id": message.chat_id,
+            "text": message.text,
+            "keyboard": message.keyboard,
+            "notify": message.notify,
+            "priority": message.priority,
+            "starts_at": message.starts_at and message.starts_at.isoformat(),
+        },
+    )
+
+
+def _parse(entry_id: bytes, fields: dict[bytes, bytes] | None) -> _Entry:
+    """Сообщение из записи стрима; ``None``, если запись битая или удалена."""
+    raw = (fields or {}).get(_MESSAGE_FIELD)
+    if raw is None:
+        return entry_id, None
+    try:
+        data = orjson.loads(raw)
+        return entry_id, OutboundMessage(
+            chat_id=MaxChatId(data["chat_id"]),
+            text=data["text"],
+            keyboard=[
+                [(text, payload) for text, payload in row] for row in data["keyboard"]
+            ],
+            notify=data["notify"],
+            priority=SendPriority(data["priority"]),
+            starts_at=data["starts_at"] and datetime.fromisoformat(data["starts_at"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return entry_id, None
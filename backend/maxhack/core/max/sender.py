@@ -1,5 +1,6 @@
-from collections.abc import Coroutine
-from typing import Any
+from collections.abc import Callable, Coroutine
+from http import HTTPStatus
+from typing import Any, Final
 
 from maxo import Bot
 from maxo.bot.method_results import SendMessageResult
@@ -7,44 +8,73 @@ from maxo.dialogs import BgManagerFactory, ShowMode, StartMode
 from maxo.errors import MaxBotBadRequestError, MaxBotForbiddenError, MaxBotNotFoundError
 from maxo.fsm import State
 
+from maxhack.core.enums.send_priority import SendPriority
 from maxhack.core.ids import MaxChatId, MaxId
-from maxhack.core.utils.rate_limiter import RateLimiter
+from maxhack.core.max.unreachable import UnreachableChats
+from maxhack.core.utils.shared_rate_limiter import SharedRateLimiter
 from maxhack.logger import get_logger
 
 logger = get_logger(__name__, groups=("maxo", "max"))
 
+# сколько раз запрос встаёт обратно в очередь, если Max API просит притормозить
+_MAX_THROTTLED_ATTEMPTS: Final = 5
+_DEFAULT_RETRY_AFTER: Final = 1.0
+
+
+class MaxSendError(Exception):
+    """
+    Запрос к Max API не выполнен, но может получиться позже: Max API
+    слишком долго просит притормозить, сеть или ошибка на стороне Max.
+    """
+
 
 class MaxSender:
-    def __init__(self, bot: Bot, bg_factory: BgManagerFactory) -> None:
+    def __init__(
+        self,
+        bot: Bot,
+        bg_factory: BgManagerFactory,
+        rate_limiter: SharedRateLimiter,
+        unreachable: UnreachableChats,
+    ) -> None:
         self._bot = bot
         self._bg_factory = bg_factory
+        self._rate_limiter = rate_limiter
+        self._unreachable = unreachable
 
-    @RateLimiter(max_calls=10, period=1)
     async def send_message(
         self,
         text: str,
         chat_id: int,
+        *,
+        priority: SendPriority = SendPriority.INTERACTIVE,
+        raise_on_failure: bool = False,
         **kwargs: Any,
     ) -> SendMessageResult | None:
-        task = self._bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            **kwargs,
+        return await self._limited_call(
+            lambda: self._bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                **kwargs,
+            ),
+            priority,
+            chat_id=MaxChatId(chat_id),
+            raise_on_failure=raise_on_failure,
         )
-        return await self._exception_logger(task)
 
     async def callback_answer(
         self,
         query_id: str,
         text: str | None = None,
     ) -> bool:
-        task = self._bot.callback_answer(
-            callback_id=query_id,
-            notification=text,
+        result = await self._limited_call(
+            lambda: self._bot.callback_answer(
+                callback_id=query_id,
+                notification=text,
+            ),
+            SendPriority.INTERACTIVE,
         )
-        return await self._exception_logger(task)
+        return bool(result)
 
-    @RateLimiter(max_calls=10, period=1)
     async def start_dialog(
         self,
         state: State,
@@ -53,36 +83,124 @@ class MaxSender:
         *,
         start_mode: StartMode = StartMode.RESET_STACK,
         show_mode: ShowMode = ShowMode.DELETE_AND_SEND,
+        priority: SendPriority = SendPriority.INTERACTIVE,
+        raise_on_failure: bool = False,
         **start_kwargs: Any,
     ) -> None:
         fg_manager = self._bg_factory.bg(self._bot, user_id, chat_id)
-        task = fg_manager.start(
-            state=state,
-            mode=start_mode,
-            show_mode=show_mode,
-            **start_kwargs,
+        await self._limited_call(
+            lambda: fg_manager.start(
+                state=state,
+                mode=start_mode,
+                show_mode=show_mode,
+                **start_kwargs,
+            ),
+            priority,
+            chat_id=chat_id,
+            raise_on_failure=raise_on_failure,
         )
-        return await self._exception_logger(task)
 
-    async def _exception_logger[T](self, task: Coroutine[None, None, T]) -> T | None:
+    async def _limited_call[T](
+        self,
+        make_task: Callable[[], Coroutine[None, None, T]],
+        priority: SendPriority,
+        chat_id: MaxChatId | None = None,
+        *,
+        raise_on_failure: bool = False,
+    ) -> T | None:
+        """
+        Выполняет запрос в пределах общего лимита. Если Max API просит
+        притормозить, запрос не теряется, а снова встаёт в очередь лимитера.
+        Если чат ``chat_id`` недоступен, он исключается из рассылок.
+
+        Окончательные ошибки (чат недоступен, неверный запрос) только
+        логируются. Временные с ``raise_on_failure`` пробрасываются как
+        ``MaxSendError``, чтобы рассылка повторила отправку позже,
+        а без него тоже только логируются.
+        """
+        for attempt in range(1, _MAX_THROTTLED_ATTEMPTS + 1):
+            await self._rate_limiter.acquire(priority)
+            try:
+                return await self._exception_logger(make_task(), chat_id)
+            except _TransientError as e:
+                if raise_on_failure:
+                    raise MaxSendError from e.__cause__
+                return None
+            except _ThrottledError as e:
+                await self._rate_limiter.throttled(e.retry_after)
+                logger.info(
+                    "Запрос отложен на %.1f с из-за торможения, попытка %d",
+                    e.retry_after,
+                    attempt,
+                )
+
+        logger.error("Запрос не выполнен: Max API слишком долго просит притормозить")
+        if raise_on_failure:
+            raise MaxSendError
+        return None
+
+    async def _exception_logger[T](
+        self,
+        task: Coroutine[None, None, T],
+        chat_id: MaxChatId | None = None,
+    ) -> T | None:
         try:
             result = await task
-        except (MaxBotNotFoundError, MaxBotForbiddenError) as e:
-            logger.warning(
-                "Не удалось выполнить запрос, бот заблокирован или неверный chat_id",
-                exc_info=e,
-            )
-        except MaxBotBadRequestError:
-            logger.exception("Ошибка от телеграма")
-        except Exception:
-            logger.exception("Неизвестная ошибка")
-        else:
-            logger.debug(
-                "Успешное выполнение таски '%s', результат: %s(%s)",
-                task.__name__,
-                result.__class__.__name__,
-                result,
-            )
-            return result
+        except Exception as e:
+            retry_after = _throttle_retry_after(e)
+            if retry_after is not None:
+                raise _ThrottledError(retry_after) from e
+            _log_exception(e)
+            if isinstance(e, MaxBotNotFoundError | MaxBotForbiddenError):
+                if chat_id is not None:
+                    await self._unreachable.mark(chat_id)
+                return None
+            if isinstance(e, MaxBotBadRequestError):
+                return None
+            raise _TransientError from e
+
+        logger.debug(
+            "Успешное выполнение таски '%s', результат: %s(%s)",
+            task.__name__,
+            result.__class__.__name__,
+            result,
+        )
+        return result
+
+
+class _TransientError(Exception):
+    pass
+
 
+class _ThrottledError(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+def _throttle_retry_after(error: Exception) -> float | None:
+    """
+    Если ошибка - ответ 429 от Max API, возвращает паузу из Retry-After
+    (или секунду, если её нет), иначе ``None``.
+    """
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    retry_after = getattr(error, "retry_after", None)
+    if status != HTTPStatus.TOO_MANY_REQUESTS and retry_after is None:
         return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return _DEFAULT_RETRY_AFTER
+
+
+def _log_exception(error: Exception) -> None:
+    if isinstance(error, MaxBotNotFoundError | MaxBotForbiddenError):
+        logger.warning(
+            "Не удалось выполнить запрос, бот заблокирован или неверный chat_id",
+            exc_info=error,
+        )
+    elif isinstance(error, MaxBotBadRequestError):
+        logger.error("Ошибка от телеграма", exc_info=error)
+    else:
+        logger.error("Неизвестная ошибка", exc_info=error)
@@ -0,0 +1,31 @@
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from maxhack.core.ids import MaxChatId
+from maxhack.core.utils.datehelp import datetime_now
+from maxhack.database.repos.user import UserRepo
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("maxo", "max"))
+
+
+class UnreachableChats:
+    """
+    Запоминает пользователей, которым бот больше не может писать.
+
+    ``MaxSender`` живёт всё время работы приложения и не привязан к запросу,
+    поэтому отметка пишется в своей короткой транзакции.
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        self._sessionmaker = sessionmaker
+
+    async def mark(self, chat_id: MaxChatId) -> None:
+        try:
+            async with self._sessionmaker() as session:
+                await UserRepo(session).mark_blocked(chat_id, datetime_now())
+                await session.commit()
+        except SQLAlchemyError:
+            logger.exception("Не удалось отметить чат %s недоступным", chat_id)
+        else:
+            logger.info("Чат %s недоступен, рассылки в него отключены", chat_id)
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta
+
+from maxhack.core.cron import compile_cron
+
+
+def next_fire_at(cron: str, minutes_before: int, after: datetime) -> datetime | None:
+    """
+    Ближайшее время отправки напоминания (в UTC), строго позже ``after``
+
+    :param cron: крон события (в UTC)
+    :param minutes_before: за сколько минут до события напомнить
+    :param after: момент, после которого ищется следующее напоминание
+    :return: ``None``, если событие больше никогда не наступит
+    """
+    shift = timedelta(minutes=minutes_before)
+    occurrence = compile_cron(cron).next_after(after + shift)
+    if occurrence is None:
+        return None
+    return occurrence - shift
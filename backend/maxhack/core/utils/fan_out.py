@@ -0,0 +1,150 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups="fan_out")
+
+
+@dataclass(slots=True, kw_only=True)
+class FanOutChunk[T]:
+    """Очередные ``chunk_size`` обработанных элементов."""
+
+    index: int
+    done: list[T] = field(default_factory=list)
+    failed: list[T] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.done) + len(self.failed)
+
+
+@dataclass(slots=True, kw_only=True)
+class FanOutStats:
+    done: int = 0
+    failed: int = 0
+    chunks: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.done + self.failed
+
+
+async def fan_out[T](
+    items: Iterable[T],
+    handler: Callable[[T], Awaitable[object]],
+    *,
+    workers: int,
+    chunk_size: int,
+    on_chunk: Callable[[FanOutChunk[T]], Awaitable[None]] | None = None,
+    name: str = "fan-out",
+) -> FanOutStats:
+    """
+    Обрабатывает ``items`` фиксированным числом воркеров.
+
+    Элементы забираются из итератора лениво через ограниченную очередь,
+    так что одновременно в памяти не больше ``workers * 2`` ожидающих
+    элементов, сколько бы их ни было всего. Ошибка обработчика не
+    останавливает рассылку, а учитывается в чанке.
+
+    ``on_chunk`` вызывается после каждых ``chunk_size`` обработанных элементов
+    (и для последнего неполного чанка). Вызовы идут строго по одному;
+    если ``on_chunk`` упал, рассылка останавливается и ошибка пробрасывается.
+    """
+    if workers <= 0 or chunk_size <= 0:
+        msg = "workers and chunk_size should be > 0"
+        raise ValueError(msg)
+
+    return await _FanOut(handler, chunk_size, on_chunk, name).run(items, workers)
+
+
+class _FanOut[T]:
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[object]],
+        chunk_size: int,
+        on_chunk: Callable[[FanOutChunk[T]], Awaitable[None]] | None,
+        name: str,
+    ) -> None:
+        self._handler = handler
+        self._chunk_size = chunk_size
+        self._on_chunk = on_chunk
+        self._name = name
+        self._stats = FanOutStats()
+        self._chunk: FanOutChunk[T] = FanOutChunk(index=0)
+        self._chunk_lock = asyncio.Lock()
+        self._failure: Exception | None = None
+
+    async def run(self, items: Iterable[T], workers: int) -> FanOutStats:
+        queue: asyncio.Queue[T] = asyncio.Queue(maxsize=workers * 2)
+        tasks = [asyncio.create_task(self._work(queue)) for _ in range(workers)]
+        try:
+            for item in items:
+                if self._failure is not None:
+                    break
+                await queue.put(item)
+            await queue.join()
+            await self._flush()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._failure is not None:
+            raise self._failure
+
+        logger.info(
+            "%s: done=%d failed=%d in %d chunks",
+            self._name,
+            self._stats.done,
+            self._stats.failed,
+            self._stats.chunks,
+        )
+        return self._stats
+
+    async def _work(self, queue: asyncio.Queue[T]) -> None:
+        while True:
+            item = await queue.get()
+            try:
+                # учёт прогресса сломался - дальше не рассылаем,
+                # только разбираем очередь
+                if self._failure is None:
+                    await self._handle(item)
+            finally:
+                queue.task_done()
+
+    async def _handle(self, item: T) -> None:
+        try:
+            await self._handler(item)
+        except Exception:
+            logger.exception("%s: handler failed", self._name)
+            self._stats.failed += 1
+            self._chunk.failed.append(item)
+        else:
+            self._stats.done += 1
+            self._chunk.done.append(item)
+
+        if len(self._chunk) >= self._chunk_size:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not len(self._chunk):
+            return
+        ready, self._chunk = self._chunk, FanOutChunk(index=self._chunk.index + 1)
+        self._stats.chunks += 1
+        logger.debug(
+            "%s: chunk %d done=%d failed=%d, total=%d",
+            self._name,
+            ready.index,
+            len(ready.done),
+            len(ready.failed),
+            self._stats.total,
+        )
+        if self._on_chunk is None:
+            return
+        async with self._chunk_lock:
+            try:
+                await self._on_chunk(ready)
+            # любую ошибку учёта прогресса пробрасываем из fan_out как есть
+            except Exception as e:  # noqa: BLE001
+                self._failure = e
@@ -1,8 +1,8 @@
 import asyncio
-import collections
 import functools
 import time
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from types import TracebackType
 from typing import Any, ParamSpec, TypeVar
 
@@ -14,19 +14,74 @@ class RateLimitError(ValueError):
     pass
 
 
+@dataclass(slots=True, kw_only=True)
+class RateLimiterStats:
+    # сколько вызовов прямо сейчас ждут своего слота
+    waiting: int = 0
+    acquired: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+def gcra_schedule(max_calls: int, period: float, burst: int) -> tuple[float, float]:
+    """
+    (интервал между слотами, допустимое опережение расписания) для GCRA,
+    при которых ``burst`` вызовов подряд и все последующие укладываются
+    в ``max_calls`` за любые ``period`` секунд.
+
+    После бёрста в окно ``period`` попадают ещё ``period / interval - 1``
+    слотов, отсюда ``interval = period / (max_calls - burst + 1)``.
+    """
+    interval = period / (max_calls - burst + 1)
+    return interval, (burst - 1) * interval
+
+
 class RateLimiter:
-    def __init__(self, max_calls: int, period: float = 1.0) -> None:
+    """
+    Ограничитель частоты по алгоритму GCRA (виртуальное расписание).
+
+    Каждый вызов сразу получает свой слот на шкале времени и спит ровно
+    один раз - до этого слота. Слоты раздаются в порядке прихода, поэтому
+    очередь честная (FIFO), а ожидающие не просыпаются толпой.
+
+    ``burst`` - сколько вызовов можно сделать подряд без ожидания.
+    Слоты после бёрста раздаются реже, с интервалом
+    ``period / (max_calls - burst + 1)``, так что бёрст вместе с тем,
+    что успевает накопиться за ``period``, не превышает ``max_calls``:
+    за любые ``period`` секунд проходит не больше ``max_calls`` вызовов.
+    По умолчанию бёрста нет и вызовы идут ровно через ``period / max_calls``.
+    """
+
+    def __init__(
+        self,
+        max_calls: int,
+        period: float = 1.0,
+        burst: int = 1,
+    ) -> None:
         if period <= 0:
-            raise RateLimitError("Rate limiting period should be > 0")
+            msg = "Rate limiting period should be > 0"
+            raise RateLimitError(msg)
         if max_calls <= 0:
-            raise RateLimitError("Rate limiting number of calls should be > 0")
-
-        self.calls: collections.deque[float] = collections.deque()
+            msg = "Rate limiting number of calls should be > 0"
+            raise RateLimitError(msg)
+        if not 0 < burst <= max_calls:
+            msg = "Rate limiting burst should be in (0, max_calls]"
+            raise RateLimitError(msg)
 
         self.period = period
         self.max_calls = max_calls
+        self.burst = burst
+
+        # интервал между вызовами и допустимое опережение расписания
+        self._interval, self._tolerance = gcra_schedule(max_calls, period, burst)
+        # theoretical arrival time - когда освободится следующий слот
+        self._tat = 0.0
 
-        self._lock = asyncio.Lock()
+        self.stats = RateLimiterStats()
 
     def __call__(self, f: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
         @functools.wraps(f)
@@ -36,18 +91,34 @@ class RateLimiter:
 
         return wrapped
 
+    def reserve(self) -> float:
+        """Занимает ближайший слот и возвращает, сколько секунд до него ждать."""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self._interval
+        return max(0.0, tat - self._tolerance - now)
+
+    def pause(self, seconds: float) -> None:
+        """Не выдавать слоты ближайшие ``seconds`` секунд (например, по Retry-After)."""
+        self._tat = max(self._tat, time.monotonic() + seconds + self._tolerance)
+
     async def __aenter__(self) -> "RateLimiter":
-        while True:
-            async with self._lock:
-                current = time.time()
-                while self.calls and current - self.calls[0] >= self.period:
-                    self.calls.popleft()
-                if len(self.calls) < self.max_calls:
-                    self.calls.append(current)
-                    return self
-                until = self.calls[0] + self.period
-                sleeptime = until - current
-            await asyncio.sleep(max(0.0, sleeptime))
+        # резерв без await, поэтому в рамках event loop он атомарен и без лока
+        delay = self.reserve()
+        if delay > 0:
+            self.stats.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release_slot()
+                raise
+            finally:
+                self.stats.waiting -= 1
+
+        self.stats.acquired += 1
+        self.stats.total_wait += delay
+        self.stats.max_wait = max(self.stats.max_wait, delay)
+        return self
 
     async def __aexit__(
         self,
@@ -56,3 +127,9 @@ class RateLimiter:
         exc_tb: TracebackType | None,
     ) -> None:
         pass
+
+    def _release_slot(self) -> None:
+        # отменённый вызов сдвигает расписание назад, чтобы слот не пропадал;
+        # слоты ждущих за ним не трогаем - они уже получили своё время
+        if self.stats.waiting <= 1:
+            self._tat -= self._interval
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Final
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("redis", "scheduler"))
+
+# KEYS[1] - живые воркеры (zset: воркер -> до какого момента жив, мс),
+# KEYS[2..] - шарды (строка: воркер-владелец, живёт до конца аренды).
+# ARGV: воркер, аренда в мс. Возвращает номера шардов воркера.
+_HEARTBEAT_SCRIPT: Final = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local worker = ARGV[1]
+local lease = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('ZADD', KEYS[1], now + lease, worker)
+redis.call('PEXPIRE', KEYS[1], lease * 2)
+local fair = math.ceil((#KEYS - 1) / redis.call('ZCARD', KEYS[1]))
+
+local owned = {}
+local free = {}
+for i = 2, #KEYS do
+    local owner = redis.call('GET', KEYS[i])
+    if owner == worker then
+        if #owned < fair then
+            redis.call('PEXPIRE', KEYS[i], lease)
+            table.insert(owned, i - 2)
+        else
+            -- появились новые воркеры: лишние шарды отдаём им
+            redis.call('DEL', KEYS[i])
+        end
+    elseif not owner then
+        table.insert(free, i)
+    end
+end
+for _, i in ipairs(free) do
+    if #owned >= fair then
+        break
+    end
+    redis.call('SET', KEYS[i], worker, 'PX', lease)
+    table.insert(owned, i - 2)
+end
+return owned
+"""
+
+# Отдаёт все шарды воркера, ARGV[1] - воркер.
+_RELEASE_SCRIPT: Final = """
+for i = 2, #KEYS do
+    if redis.call('GET', KEYS[i]) == ARGV[1] then
+        redis.call('DEL', KEYS[i])
+    end
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+"""
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ShardSet:
+    # на сколько шардов поделены события (шард события - event_id % total)
+    total: int
+    # шарды, которые сейчас обрабатывает этот воркер
+    owned: frozenset[int]
+
+
+class ShardLeases:
+    """
+    Делит рассылку напоминаний между репликами планировщика.
+
+    События поделены на ``shards`` шардов по ``event_id % shards``. Каждый
+    воркер раз в треть аренды продлевает свои шарды в Redis и забирает
+    свободные - не больше своей доли от живых воркеров. Шарды упавшего
+    воркера освобождаются по истечении аренды и достаются остальным,
+    а при появлении нового воркера лишние шарды отдаются ему.
+
+    Пока шард переходит от воркера к воркеру, оба могут успеть взять его
+    в работу - от двойной отправки защищает журнал доставки. Если продлить
+    аренду не удалось, по её истечении воркер считает, что шардов у него нет.
+    """
+
+    def __init__(self, redis: Redis, key: str, shards: int, lease: float) -> None:
+        if shards < 1 or lease <= 0:
+            msg = "`shards` and `lease` must be positive"
+            raise ValueError(msg)
+
+        self._redis = redis
+        self._shards = shards
+        self._lease = lease
+        self._keys = [f"{key}:workers", *(f"{key}:{i}" for i in range(shards))]
+        self._heartbeat_script = redis.register_script(_HEARTBEAT_SCRIPT)
+        self._release_script = redis.register_script(_RELEASE_SCRIPT)
+
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._owned: frozenset[int] = frozenset()
+        self._valid_until = 0.0
+
+    def current(self) -> ShardSet | None:
+        """Шарды воркера; ``None``, если события на шарды не делятся."""
+        if self._shards == 1:
+            return None
+
+        owned = self._owned if time.monotonic() < self._valid_until else frozenset()
+        return ShardSet(total=self._shards, owned=owned)
+
+    async def heartbeat(self) -> ShardSet | None:
+        if self._shards == 1:
+            return None
+
+        # аренда отсчитывается с момента запроса, а не ответа
+        started = time.monotonic()
+        owned = await self._heartbeat_script(
+            keys=self._keys,
+            args=[self.worker, round(self._lease * 1000)],
+        )
+        owned = frozenset(int(shard) for shard in owned)
+        if owned != self._owned:
+            logger.info("Воркер %s обрабатывает шарды %s", self.worker, sorted(owned))
+
+        self._owned = owned
+        self._valid_until = started + self._lease
+        return self.current()
+
+    async def run(self) -> None:
+        """Продлевает аренду, пока задачу не отменят."""
+        if self._shards == 1:
+            return
+
+        while True:
+            try:
+                await self.heartbeat()
+            except (RedisError, OSError) as e:
+                logger.warning("Не удалось продлить аренду шардов", exc_info=e)
+            await asyncio.sleep(self._lease / 3)
+
+    async def release(self) -> None:
+        """Сразу отдаёт шарды другим воркерам, не дожидаясь конца аренды."""
+        if self._shards == 1:
+            return
+
+        self._owned = frozenset()
+        try:
+            await self._release_script(keys=self._keys, args=[self.worker])
+        except (RedisError, OSError) as e:
+            logger.warning("Не удалось освободить шарды", exc_info=e)
@@ -0,0 +1,322 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Final
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.utils.rate_limiter import (
+    RateLimitError,
+    RateLimiter,
+    gcra_schedule,
+)
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("redis", "max"))
+
+# Все скрипты берут время у Redis, чтобы расхождение часов между процессами
+# не влияло на лимит. Все величины - в микросекундах.
+#
+# Состояние торможения (KEYS[2]) - хеш:
+#   factor - доля от полного лимита сразу после последнего снижения;
+#   since - когда это снижение было;
+#   pause_until - до какого момента запросы не отправляются вовсе (Retry-After).
+# Текущая доля растёт линейно со временем: factor + recovery * (now - since),
+# recovery передаётся последним аргументом.
+_BACKOFF_LUA: Final = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local backoff = redis.call('HMGET', KEYS[2], 'factor', 'since', 'pause_until')
+local factor = 1
+local pause_until = 0
+if backoff[1] then
+    local recovery = tonumber(ARGV[#ARGV])
+    factor = math.min(1, tonumber(backoff[1]) + recovery * (now - tonumber(backoff[2])))
+    pause_until = tonumber(backoff[3] or 0)
+end
+"""
+
+# GCRA. ARGV: интервал между вызовами, допустимое опережение расписания,
+# максимальное ожидание, на которое вызов согласен занять слот, скорость восстановления.
+# Возвращает {1, ожидание} если слот занят, {0, через сколько повторить} если нет.
+_GCRA_SCRIPT: Final = (
+    _BACKOFF_LUA
+    + """
+local interval = tonumber(ARGV[1]) / factor
+local tolerance = tonumber(ARGV[2])
+local max_delay = tonumber(ARGV[3])
+if factor < 1 then
+    -- пока лимит снижен, бёрстов нет
+    tolerance = 0
+end
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+tat = math.max(tat, now, pause_until)
+
+local delay = math.max(0, tat - tolerance - now)
+if delay > max_delay then
+    return {0, delay - max_delay}
+end
+
+local new_tat = tat + interval
+-- без %.0f Lua запишет число в экспоненциальной записи и потеряет точность
+local ttl = math.ceil((new_tat - now) / 1000) + 1000
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', ttl)
+return {1, delay}
+"""
+)
+
+# Сигнал о торможении от Max API. ARGV: во сколько раз снизить долю,
+# минимальная доля, пауза (Retry-After), сколько ждать между снижениями,
+# скорость восстановления. Возвращает новую долю в миллионных.
+_THROTTLE_SCRIPT: Final = (
+    _BACKOFF_LUA
+    + """
+local decrease = tonumber(ARGV[1])
+local min_factor = tonumber(ARGV[2])
+local pause = tonumber(ARGV[3])
+local cooldown = tonumber(ARGV[4])
+local recovery = tonumber(ARGV[5])
+
+pause_until = math.max(pause_until, now + pause)
+-- один всплеск 429 ловят сразу многие запросы: снижаем не чаще раза в cooldown
+if not backoff[1] or now - tonumber(backoff[2]) >= cooldown then
+    factor = math.max(min_factor, factor * decrease)
+    redis.call(
+        'HSET', KEYS[2],
+        'factor', string.format('%.6f', factor),
+        'since', string.format('%.0f', now)
+    )
+end
+redis.call('HSET', KEYS[2], 'pause_until', string.format('%.0f', pause_until))
+
+-- ключ живёт, пока лимит не восстановится полностью
+local recover_for = (1 - factor) / recovery
+local ttl = math.ceil(math.max(recover_for, pause_until - now) / 1000) + 1000
+redis.call('PEXPIRE', KEYS[2], ttl)
+return math.floor(factor * 1000000)
+"""
+)
+
+# Текущее состояние торможения: {доля в миллионных, сколько ещё пауза}.
+_STATE_SCRIPT: Final = (
+    _BACKOFF_LUA
+    + """
+return {math.floor(factor * 1000000), math.max(0, pause_until - now)}
+"""
+)
+
+_MICROSECONDS: Final = 1_000_000
+# сколько не ходить в Redis после ошибки, обходясь локальным лимитом
+_REDIS_RETRY_AFTER: Final = 5.0
+# "ждать сколько угодно", но в пределах точности чисел Lua
+_WAIT_FOREVER: Final = 2**53
+# полосы от самой срочной к самой терпеливой
+_LANES: Final = (
+    SendPriority.INTERACTIVE,
+    SendPriority.URGENT,
+    SendPriority.REMINDER,
+    SendPriority.BULK,
+)
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ThrottleState:
+    # текущий лимит, запросов в секунду
+    rate: float
+    # доля от полного лимита, 1 - торможения нет
+    factor: float
+    # сколько ещё секунд запросы на паузе по Retry-After
+    paused_for: float
+    # сколько раз этот процесс получил сигнал о торможении
+    throttled: int
+    # работает ли процесс на локальном лимите из-за недоступности Redis
+    local_fallback: bool
+
+
+class SharedRateLimiter:
+    """
+    Общий для всех процессов ограничитель частоты запросов к Max API.
+
+    Расписание слотов (GCRA) хранится в Redis и обновляется атомарно
+    Lua-скриптом, поэтому бот, планировщик и веб вместе не превышают лимит.
+
+    Приоритеты (полосы):
+      * ``INTERACTIVE`` сразу занимает ближайший слот, сколько бы ни ждать;
+      * ``URGENT``, ``REMINDER`` и ``BULK`` не бронируют слоты впрок, а ждут,
+        пока слот не станет ближайшим. Поэтому их очередь не копится в общем
+        расписании, и ответ пользователю обгоняет её;
+      * бёрст - ``interactive_reserve + 1`` слотов: ``BULK`` не может занять
+        последние ``interactive_reserve`` из них, ``REMINDER`` и ``URGENT`` -
+        всё меньшую их часть. Пока лимит выбран, слот достаётся самой срочной
+        из ждущих полос.
+
+    Интервал между слотами подобран так же, как в ``RateLimiter``: бёрст
+    вместе с тем, что успевает накопиться за ``period``, не превышает
+    ``max_calls``. Поэтому все процессы вместе укладываются в ``max_calls``
+    за любые ``period`` секунд, а постоянная скорость -
+    ``max_calls - interactive_reserve`` запросов за ``period``.
+
+    Чтобы нижние полосы не голодали, вызов, прождавший дольше
+    ``starvation_timeout``, переходит в полосу выше.
+
+    Торможение (AIMD): на ответ 429 лимит для всех процессов умножается
+    на ``decrease`` (не ниже ``min_factor``) и выдерживается пауза
+    Retry-After, затем лимит линейно растёт на ``recovery`` в секунду
+    до полного.
+
+    Если Redis недоступен, используется локальный ``RateLimiter`` с тем же
+    лимитом - до следующей попытки через несколько секунд.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        key: str,
+        max_calls: int,
+        period: float = 1.0,
+        interactive_reserve: int = 0,
+        *,
+        decrease: float = 0.5,
+        min_factor: float = 0.1,
+        recovery: float = 0.05,
+        decrease_cooldown: float = 1.0,
+        starvation_timeout: float = 30.0,
+    ) -> None:
+        if not 0 <= interactive_reserve < max_calls:
+            msg = "Interactive reserve should be in [0, max_calls)"
+            raise RateLimitError(msg)
+        if not 0 < min_factor <= decrease < 1 or recovery <= 0:
+            msg = "Invalid throttling parameters"
+            raise RateLimitError(msg)
+
+        self._redis = redis
+        self._keys = [key, f"{key}:backoff"]
+        self._script = redis.register_script(_GCRA_SCRIPT)
+        self._throttle_script = redis.register_script(_THROTTLE_SCRIPT)
+        self._state_script = redis.register_script(_STATE_SCRIPT)
+        burst = interactive_reserve + 1
+        self._local = RateLimiter(max_calls=max_calls, period=period, burst=burst)
+
+        interval, tolerance = gcra_schedule(max_calls, period, burst)
+        self._max_rate = 1 / interval
+        self._interval = round(interval * _MICROSECONDS)
+        # (допустимое опережение, максимальное ожидание) для каждой полосы:
+        # каждая следующая полоса оставляет верхним всё больше резерва
+        self._limits = {
+            SendPriority.INTERACTIVE: (
+                round(tolerance * _MICROSECONDS),
+                _WAIT_FOREVER,
+            ),
+        }
+        bottom = len(_LANES) - 1
+        for rank, lane in enumerate(_LANES[1:], start=1):
+            reserve = interactive_reserve * rank / bottom
+            self._limits[lane] = (
+                round((interactive_reserve - reserve) * interval * _MICROSECONDS),
+                self._interval,
+            )
+        self._starvation_timeout = starvation_timeout
+        self._decrease = decrease
+        self._min_factor = min_factor
+        self._decrease_cooldown = round(decrease_cooldown * _MICROSECONDS)
+        # из "доли в секунду" в "долю в микросекунду"
+        self._recovery = repr(recovery / _MICROSECONDS)
+
+        self._redis_down_until = 0.0
+        self._throttled = 0
+
+    async def acquire(self, priority: SendPriority = SendPriority.INTERACTIVE) -> None:
+        if self._local_fallback:
+            async with self._local:
+                return
+
+        tolerance, max_delay = self._limits[priority]
+        waiting_since = time.monotonic()
+        while True:
+            if (
+                priority != SendPriority.INTERACTIVE
+                and time.monotonic() - waiting_since > self._starvation_timeout
+            ):
+                priority = _LANES[_LANES.index(priority) - 1]
+                tolerance, max_delay = self._limits[priority]
+                waiting_since = time.monotonic()
+                logger.info("Вызов ждёт слишком долго, повышен до полосы %s", priority)
+
+            try:
+                reserved, delay = await self._script(
+                    keys=self._keys,
+                    args=[self._interval, tolerance, max_delay, self._recovery],
+                )
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+                async with self._local:
+                    return
+
+            if delay:
+                await asyncio.sleep(int(delay) / _MICROSECONDS)
+            if reserved:
+                return
+
+    async def throttled(self, retry_after: float) -> None:
+        """Max API просит притормозить: снижаем общий лимит и выдерживаем паузу."""
+        self._throttled += 1
+        self._local.pause(retry_after)
+        if self._local_fallback:
+            return
+
+        try:
+            factor = await self._throttle_script(
+                keys=self._keys,
+                args=[
+                    self._decrease,
+                    self._min_factor,
+                    round(retry_after * _MICROSECONDS),
+                    self._decrease_cooldown,
+                    self._recovery,
+                ],
+            )
+        except (RedisError, OSError) as e:
+            self._redis_failed(e)
+            return
+
+        logger.warning(
+            "Max API просит притормозить: пауза %.1f с, лимит %.1f запросов/с",
+            retry_after,
+            self._max_rate * int(factor) / _MICROSECONDS,
+        )
+
+    async def state(self) -> ThrottleState:
+        factor, paused_for = 1.0, 0.0
+        if not self._local_fallback:
+            try:
+                raw_factor, raw_pause = await self._state_script(
+                    keys=self._keys,
+                    args=[self._recovery],
+                )
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+            else:
+                factor = int(raw_factor) / _MICROSECONDS
+                paused_for = int(raw_pause) / _MICROSECONDS
+
+        return ThrottleState(
+            rate=self._max_rate * factor,
+            factor=factor,
+            paused_for=paused_for,
+            throttled=self._throttled,
+            local_fallback=self._local_fallback,
+        )
+
+    @property
+    def _local_fallback(self) -> bool:
+        return time.monotonic() < self._redis_down_until
+
+    def _redis_failed(self, error: BaseException) -> None:
+        logger.warning(
+            "Redis недоступен, лимит запросов только локальный",
+            exc_info=error,
+        )
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_AFTER
@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Final
+
+import psycopg
+
+from maxhack.config import DbConfig
+from maxhack.core.ids import EventId
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("database", "scheduler"))
+
+# канал, в который триггеры сообщают id изменённых событий
+EVENT_CHANGES_CHANNEL: Final = "event_changes"
+# сколько ждать следующих изменений, чтобы отдать их одной пачкой
+_DEBOUNCE: Final = 0.2
+_RECONNECT_DELAY: Final = 5.0
+
+# ``None`` - изменения могли потеряться, перечитать нужно всё
+EventChangesHandler = Callable[[set[EventId] | None], Awaitable[None]]
+
+
+class EventChangeFeed:
+    """
+    Лента изменений событий из Postgres: триггеры на ``events``,
+    ``events_notifies``, ``users_to_events`` и ``tags_to_events``
+    сообщают через ``pg_notify`` id изменённого события, а лента отдаёт
+    подписчикам накопившиеся за ``_DEBOUNCE`` секунд id пачкой.
+
+    Сообщения, пришедшие без подключения, теряются, поэтому после каждого
+    (пере)подключения подписчики получают ``None`` и перечитывают всё.
+    Слушает отдельное соединение вне пула: ``LISTEN`` держит его всё время.
+    """
+
+    def __init__(self, db_config: DbConfig) -> None:
+        self._db_config = db_config
+        self._handlers: list[EventChangesHandler] = []
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        """Слушает ли лента изменения прямо сейчас."""
+        return self._connected
+
+    def subscribe(self, handler: EventChangesHandler) -> None:
+        self._handlers.append(handler)
+
+    async def run(self) -> None:
+        """Слушает изменения, пока задачу не отменят."""
+        while True:
+            try:
+                await self._listen()
+            except (psycopg.Error, OSError) as e:
+                logger.warning("Лента изменений событий оборвалась", exc_info=e)
+            finally:
+                self._connected = False
+            await asyncio.sleep(_RECONNECT_DELAY)
+
+    async def _listen(self) -> None:
+        async with await psycopg.AsyncConnection.connect(
+            host=self._db_config.host,
+            port=self._db_config.port,
+            user=self._db_config.user,
+            password=self._db_config.password,
+            dbname=self._db_config.db_name,
+            autocommit=True,
+        ) as conn:
+            await conn.execute(f"LISTEN {EVENT_CHANGES_CHANNEL}")
+            self._connected = True
+            logger.info("Лента изменений событий подключена")
+            await self._publish(None)
+
+            while True:
+                changed: set[EventId] = set()
+                async for notify in conn.notifies(stop_after=1):
+                    _collect(changed, notify.payload)
+                async for notify in conn.notifies(timeout=_DEBOUNCE):
+                    _collect(changed, notify.payload)
+                if changed:
+                    await self._publish(changed)
+
+    async def _publish(self, event_ids: set[EventId] | None) -> None:
+        for handler in self._handlers:
+            try:
+                await handler(event_ids)
+            except Exception:
+                logger.exception("Подписчик ленты изменений событий упал")
+
+
+def _collect(changed: set[EventId], payload: str) -> None:
+    try:
+        changed.add(EventId(int(payload)))
+    except ValueError:
+        logger.warning("Непонятное сообщение ленты изменений: %r", payload)
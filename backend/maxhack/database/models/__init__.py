@@ -2,11 +2,13 @@
 Инициализация моделей
 """
 
+from .agenda import AgendaModel
 from .base import BaseAlchemyModel
 from .event import EventModel
 from .event_notify import EventNotifyModel
 from .group import GroupModel
 from .invite import InviteModel
+from .notify_delivery import NotifyDeliveryModel
 from .respond import RespondModel
 from .role import RoleModel
 from .tag import TagModel
@@ -17,11 +19,13 @@ from .users_to_groups import UsersToGroupsModel
 from .users_to_tags import UsersToTagsModel
 
 __all__ = (
+    "AgendaModel",
     "BaseAlchemyModel",
     "EventModel",
     "EventNotifyModel",
     "GroupModel",
     "InviteModel",
+    "NotifyDeliveryModel",
     "RespondModel",
     "RoleModel",
     "TagModel",
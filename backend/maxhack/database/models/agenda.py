@@ -0,0 +1,46 @@
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from maxhack.core.ids import AgendaId, UserId
+from maxhack.database.models._mixins import IdMixin
+from maxhack.database.models.base import BaseAlchemyModel
+
+
+class AgendaModel(BaseAlchemyModel, IdMixin[AgendaId]):
+    """Утренняя сводка событий пользователя на день, посчитанная заранее."""
+
+    __tablename__ = "agendas"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day"),
+        Index(
+            None,
+            "send_at",
+            postgresql_where="agendas.sent_at IS NULL",
+        ),
+    )
+
+    user_id: Mapped[UserId] = mapped_column(
+        ForeignKey("users.id"),
+        nullable=False,
+    )
+    # день в часовом поясе пользователя
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    send_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    # [{"event_id": ..., "title": ..., "starts_at": ISO-время в UTC}, ...]
+    items: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False)
+    # когда сводку взял в работу тик; протухший захват можно перехватить
+    claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
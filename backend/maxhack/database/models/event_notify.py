@@ -1,4 +1,6 @@
-from sqlalchemy import ForeignKey, Integer
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from maxhack.core.ids import EventId, EventNotifyId
@@ -8,6 +10,18 @@ from maxhack.database.models.base import BaseAlchemyModel
 
 class EventNotifyModel(BaseAlchemyModel, IdMixin[EventNotifyId]):
     __tablename__ = "events_notifies"
+    __table_args__ = (
+        Index(
+            None,
+            "next_fire_at",
+            postgresql_where="events_notifies.deleted_at IS NULL",
+        ),
+    )
 
     event_id: Mapped[EventId] = mapped_column(ForeignKey("events.id"), nullable=False)
     minutes_before: Mapped[int] = mapped_column(Integer, nullable=False)
+    # NULL - напоминание больше не сработает (разовое событие уже прошло)
+    next_fire_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from maxhack.core.ids import EventNotifyId, NotifyDeliveryId, UserId
+from maxhack.database.models._mixins import IdMixin
+from maxhack.database.models.base import BaseAlchemyModel
+
+
+class NotifyDeliveryModel(BaseAlchemyModel, IdMixin[NotifyDeliveryId]):
+    """Журнал отправки напоминаний: одна строка на получателя срабатывания."""
+
+    __tablename__ = "notify_deliveries"
+    __table_args__ = (
+        UniqueConstraint("notify_id", "occurrence_at", "user_id"),
+        Index(
+            None,
+            "occurrence_at",
+            postgresql_where="notify_deliveries.sent_at IS NULL",
+        ),
+    )
+
+    notify_id: Mapped[EventNotifyId] = mapped_column(
+        ForeignKey("events_notifies.id"),
+        nullable=False,
+    )
+    # на какое срабатывание напоминания (его next_fire_at) отправка
+    occurrence_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    user_id: Mapped[UserId] = mapped_column(
+        ForeignKey("users.id"),
+        nullable=False,
+    )
+    # когда отправку взял в работу тик; протухший захват можно перехватить
+    claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
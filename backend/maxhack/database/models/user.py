@@ -1,4 +1,6 @@
-from sqlalchemy import Integer, String
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from maxhack.core.enums.notify_mode import NotifyMode
@@ -29,3 +31,9 @@ class UserModel(BaseAlchemyModel, IdMixin[UserId]):
         nullable=False,
         default=NotifyMode.DEFAULT,
     )
+    # когда бот последний раз не смог написать пользователю (заблокирован, чат удалён);
+    # таким пользователям рассылки не отправляются, пока он сам не напишет боту
+    blocked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
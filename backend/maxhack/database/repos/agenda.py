@@ -0,0 +1,154 @@
+from collections.abc import Collection
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from maxhack.core.enums.notify_mode import NotifyMode
+from maxhack.core.ids import AgendaId, UserId
+from maxhack.database.models import (
+    AgendaModel,
+    EventModel,
+    UserModel,
+    UsersToGroupsModel,
+)
+from maxhack.database.repos.base import BaseAlchemyRepo
+from maxhack.database.repos.event import event_participants
+
+
+class AgendaRepo(BaseAlchemyRepo):
+    async def get_digest_events(self) -> list[tuple[UserModel, EventModel]]:
+        """
+        Пары (получатель, событие), о которых получатель узнаёт из утренней
+        сводки: у него самого или в группе события выбран режим ``DIGEST``,
+        и нигде уведомления не отключены.
+        """
+        events = select(EventModel.id).where(
+            EventModel.is_not_deleted,
+            or_(EventModel.is_cycle, EventModel.event_happened.is_(False)),
+        )
+        participants = event_participants(events)
+        stmt = (
+            select(UserModel, EventModel)
+            .join(participants, participants.c.user_id == UserModel.id)
+            .join(EventModel, EventModel.id == participants.c.event_id)
+            .outerjoin(
+                UsersToGroupsModel,
+                (UsersToGroupsModel.user_id == UserModel.id)
+                & (UsersToGroupsModel.group_id == EventModel.group_id)
+                & UsersToGroupsModel.is_not_deleted,
+            )
+            .where(
+                UserModel.is_not_deleted,
+                UserModel.blocked_at.is_(None),
+                or_(
+                    UserModel.notify_mode == NotifyMode.DIGEST,
+                    UsersToGroupsModel.notify_mode == NotifyMode.DIGEST,
+                ),
+                UserModel.notify_mode != NotifyMode.DISABLE,
+                or_(
+                    UsersToGroupsModel.notify_mode.is_(None),
+                    UsersToGroupsModel.notify_mode != NotifyMode.DISABLE,
+                ),
+            )
+            .order_by(UserModel.id.asc())
+        )
+        return list(await self._session.execute(stmt))
+
+    async def upsert(self, agendas: list[dict[str, Any]]) -> None:
+        """
+        Записывает сводки (``user_id``, ``day``, ``send_at``, ``items``).
+        Сводку, которую уже взяли в работу, пересчёт не трогает.
+        """
+        if not agendas:
+            return
+
+        stmt = insert(AgendaModel).values(agendas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "day"],
+            set_={"send_at": stmt.excluded.send_at, "items": stmt.excluded.items},
+            where=AgendaModel.claimed_at.is_(None),
+        )
+        await self._session.execute(stmt)
+
+    async def discard(self, slots: Collection[tuple[UserId, date]]) -> None:
+        """
+        Удаляет ещё не взятые в работу сводки (``user_id``, ``day``):
+        событий на этот день у пользователя больше нет.
+        """
+        if not slots:
+            return
+
+        stmt = delete(AgendaModel).where(
+            tuple_(AgendaModel.user_id, AgendaModel.day).in_(slots),
+            AgendaModel.claimed_at.is_(None),
+        )
+        await self._session.execute(stmt)
+
+    async def claim(
+        self,
+        now: datetime,
+        lease: timedelta,
+        limit: int,
+    ) -> list[AgendaId]:
+        """Забирает в работу сводки, время которых наступило."""
+        pending = (
+            select(AgendaModel.id)
+            .where(
+                AgendaModel.send_at <= now,
+                AgendaModel.sent_at.is_(None),
+                or_(
+                    AgendaModel.claimed_at.is_(None),
+                    AgendaModel.claimed_at < now - lease,
+                ),
+                AgendaModel.is_not_deleted,
+            )
+            .order_by(AgendaModel.send_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(AgendaModel)
+            .where(AgendaModel.id.in_(pending.scalar_subquery()))
+            .values(claimed_at=now)
+            .returning(AgendaModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(await self._session.scalars(stmt))
+
+    async def get_claimed(
+        self,
+        agenda_ids: Collection[AgendaId],
+    ) -> list[tuple[AgendaModel, UserModel]]:
+        if not agenda_ids:
+            return []
+
+        stmt = (
+            select(AgendaModel, UserModel)
+            .join(UserModel, UserModel.id == AgendaModel.user_id)
+            .where(
+                AgendaModel.id.in_(agenda_ids),
+                UserModel.is_not_deleted,
+                UserModel.blocked_at.is_(None),
+            )
+            .order_by(AgendaModel.send_at.asc())
+        )
+        return list(await self._session.execute(stmt))
+
+    async def mark_sent(self, agenda_ids: Collection[AgendaId], now: datetime) -> None:
+        if not agenda_ids:
+            return
+
+        stmt = (
+            update(AgendaModel)
+            .where(AgendaModel.id.in_(agenda_ids))
+            .values(sent_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.execute(stmt)
+
+    async def purge_sent(self, before: datetime) -> int:
+        stmt = delete(AgendaModel).where(AgendaModel.sent_at < before)
+        result = await self._session.execute(stmt)
+        return result.rowcount
@@ -1,12 +1,26 @@
 import logging
+from collections.abc import Collection
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, func, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Subquery,
+    and_,
+    func,
+    select,
+    true,
+    union,
+    update,
+)
 from sqlalchemy.exc import IntegrityError, ProgrammingError
 from sqlalchemy.orm import joinedload, selectinload
 
+from maxhack.core.event.models import DueNotify
 from maxhack.core.exceptions import MaxHackError
-from maxhack.core.ids import EventId, GroupId, TagId, UserId
+from maxhack.core.ids import EventId, EventNotifyId, GroupId, TagId, UserId
+from maxhack.core.utils.shard_leases import ShardSet
 from maxhack.database.models import (
     EventModel,
     EventNotifyModel,
@@ -22,6 +36,57 @@ from maxhack.database.repos.base import BaseAlchemyRepo
 logger = logging.getLogger(__name__)
 
 
+def in_shards(
+    event_id: ColumnElement[EventId],
+    shards: ShardSet | None,
+) -> ColumnElement[bool]:
+    """Условие "событие в одном из шардов"; без шардов подходят все события."""
+    if shards is None:
+        return true()
+    return (event_id % shards.total).in_(shards.owned)
+
+
+def _due_notifies(
+    now: datetime,
+    shards: ShardSet | None,
+) -> tuple[ColumnElement[bool], ...]:
+    return (
+        EventNotifyModel.next_fire_at <= now,
+        EventModel.event_happened.is_(False),
+        EventModel.is_not_deleted,
+        EventNotifyModel.is_not_deleted,
+        in_shards(EventNotifyModel.event_id, shards),
+    )
+
+
+def event_participants(
+    event_ids: Collection[EventId] | Select[tuple[EventId]],
+) -> Subquery:
+    """(event_id, user_id) участников событий: напрямую и через теги, без дублей."""
+    direct_users = select(
+        UsersToEvents.event_id.label("event_id"),
+        UsersToEvents.user_id.label("user_id"),
+    ).where(
+        UsersToEvents.event_id.in_(event_ids),
+        UsersToEvents.is_not_deleted,
+    )
+    tag_users = (
+        select(
+            TagsToEvents.event_id.label("event_id"),
+            UsersToTagsModel.user_id.label("user_id"),
+        )
+        .join(TagModel, TagModel.id == TagsToEvents.tag_id)
+        .join(UsersToTagsModel, UsersToTagsModel.tag_id == TagModel.id)
+        .where(
+            TagsToEvents.event_id.in_(event_ids),
+            TagsToEvents.is_not_deleted,
+            TagModel.is_not_deleted,
+            UsersToTagsModel.is_not_deleted,
+        )
+    )
+    return union(direct_users, tag_users).subquery()
+
+
 class EventRepo(BaseAlchemyRepo):
     async def get_by_id(self, event_id: EventId) -> EventModel | None:
         stmt = (
@@ -399,6 +464,17 @@ class EventRepo(BaseAlchemyRepo):
 
         return result
 
+    async def mark_happened(self, event_ids: Collection[EventId]) -> None:
+        if not event_ids:
+            return
+
+        stmt = (
+            update(EventModel)
+            .where(EventModel.id.in_(event_ids))
+            .values(event_happened=True)
+        )
+        await self._session.execute(stmt)
+
     async def check_user_in_event(
         self,
         event_id: EventId,
@@ -464,13 +540,16 @@ class EventRepo(BaseAlchemyRepo):
     async def create_notify(
         self,
         event_id: EventId,
-        minutes_before: list[int],
+        next_fires: dict[int, datetime | None],
     ) -> list[EventNotifyModel]:
-        minutes_before = set(minutes_before)
-        minutes_before.add(0)
+        """Напоминания события: за сколько минут и когда первое срабатывание."""
         notifies = [
-            EventNotifyModel(event_id=event_id, minutes_before=minutes)
-            for minutes in minutes_before
+            EventNotifyModel(
+                event_id=event_id,
+                minutes_before=minutes,
+                next_fire_at=fire_at,
+            )
+            for minutes, fire_at in next_fires.items()
         ]
         try:
             self._session.add_all(notifies)
@@ -482,18 +561,135 @@ class EventRepo(BaseAlchemyRepo):
 
         return notifies
 
-    async def get_notifies(self) -> list[tuple[EventNotifyModel, EventModel]]:
+    async def get_event_notifies(self, event_id: EventId) -> list[EventNotifyModel]:
+        stmt = select(EventNotifyModel).where(
+            EventNotifyModel.event_id == event_id,
+            EventNotifyModel.is_not_deleted,
+        )
+        return list(await self._session.scalars(stmt))
+
+    async def get_notify_load(self) -> list[tuple[EventId, str, int, int]]:
+        """
+        (событие, крон, ``minutes_before``, число участников) каждого
+        действующего напоминания - для прогноза нагрузки рассылки.
+        """
+        participants = event_participants(
+            select(EventModel.id).where(EventModel.is_not_deleted),
+        )
+        counts = (
+            select(
+                participants.c.event_id,
+                func.count().label("participants"),
+            )
+            .group_by(participants.c.event_id)
+            .subquery()
+        )
         stmt = (
-            select(EventNotifyModel, EventModel)
+            select(
+                EventNotifyModel.event_id,
+                EventModel.cron,
+                EventNotifyModel.minutes_before,
+                counts.c.participants,
+            )
             .join(EventModel)
+            .join(counts, counts.c.event_id == EventNotifyModel.event_id)
             .where(
-                EventModel.event_happened == False,
+                EventNotifyModel.next_fire_at.is_not(None),
+                EventNotifyModel.is_not_deleted,
                 EventModel.is_not_deleted,
+                EventModel.event_happened.is_(False),
+            )
+        )
+        return list(await self._session.execute(stmt))  # type: ignore[arg-type]
+
+    async def get_notify_fires(
+        self,
+        event_ids: Collection[EventId] | None = None,
+    ) -> list[tuple[EventNotifyId, EventId, datetime]]:
+        """
+        (напоминание, событие, ``next_fire_at``) действующих напоминаний
+        событий ``event_ids`` (по умолчанию - всех) - без загрузки моделей.
+        """
+        stmt = (
+            select(
+                EventNotifyModel.id,
+                EventNotifyModel.event_id,
+                EventNotifyModel.next_fire_at,
+            )
+            .join(EventModel)
+            .where(
+                EventNotifyModel.next_fire_at.is_not(None),
                 EventNotifyModel.is_not_deleted,
+                EventModel.is_not_deleted,
+                EventModel.event_happened.is_(False),
+            )
+        )
+        if event_ids is not None:
+            stmt = stmt.where(EventNotifyModel.event_id.in_(event_ids))
+        return list(await self._session.execute(stmt))  # type: ignore[arg-type]
+
+    async def get_due_notifies(
+        self,
+        now: datetime,
+        shards: ShardSet | None = None,
+        notify_ids: Collection[EventNotifyId] | None = None,
+        limit: int | None = None,
+    ) -> list[DueNotify]:
+        """
+        Напоминания из шардов ``shards`` (или только ``notify_ids``),
+        время отправки которых уже наступило, - не больше ``limit``
+        самых ранних.
+        """
+        stmt = (
+            select(
+                EventNotifyModel.id.label("notify_id"),
+                EventNotifyModel.event_id,
+                EventModel.cron,
+                EventModel.is_cycle,
+                EventModel.duration,
+                EventNotifyModel.minutes_before,
+                EventNotifyModel.next_fire_at,
             )
+            .join(EventModel)
+            .where(*_due_notifies(now, shards))
             .order_by(
-                EventModel.created_at.asc(),
+                EventNotifyModel.next_fire_at.asc(),
                 EventNotifyModel.minutes_before.desc(),
             )
+            .limit(limit)
+            # параллельный тик пропустит то, что уже обрабатывается
+            .with_for_update(of=EventNotifyModel, skip_locked=True)
+        )
+        if notify_ids is not None:
+            stmt = stmt.where(EventNotifyModel.id.in_(notify_ids))
+        result = await self._session.execute(stmt)
+        return [DueNotify(**row) for row in result.mappings()]
+
+    async def count_due_notifies(
+        self,
+        now: datetime,
+        shards: ShardSet | None = None,
+    ) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(EventNotifyModel)
+            .join(EventModel)
+            .where(*_due_notifies(now, shards))
+        )
+        return await self._session.scalar(stmt) or 0
+
+    async def set_notifies_next_fire_at(
+        self,
+        next_fires: dict[EventNotifyId, datetime | None],
+    ) -> None:
+        """Пакетно обновляет время следующей отправки напоминаний."""
+        if not next_fires:
+            return
+
+        await self._session.execute(
+            update(EventNotifyModel),
+            [
+                {"id": notify_id, "next_fire_at": fire_at}
+                for notify_id, fire_at in next_fires.items()
+            ],
         )
-        return list(await self._session.execute(stmt))
@@ -0,0 +1,199 @@
+from collections.abc import Collection
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from maxhack.core.ids import EventNotifyId, NotifyDeliveryId
+from maxhack.core.utils.shard_leases import ShardSet
+from maxhack.database.models import (
+    EventModel,
+    EventNotifyModel,
+    NotifyDeliveryModel,
+    UserModel,
+    UsersToGroupsModel,
+)
+from maxhack.database.repos.base import BaseAlchemyRepo
+from maxhack.database.repos.event import event_participants, in_shards
+
+
+class NotifyDeliveryRepo(BaseAlchemyRepo):
+    async def add_pending(self, notify_ids: Collection[EventNotifyId]) -> None:
+        """
+        Заводит по строке на каждого участника текущего срабатывания напоминаний.
+        Срабатывание - это ``next_fire_at`` напоминания, поэтому вызывать
+        нужно до его сдвига. Повторный вызов ничего не дублирует.
+        """
+        if not notify_ids:
+            return
+
+        event_ids = select(EventNotifyModel.event_id).where(
+            EventNotifyModel.id.in_(notify_ids),
+        )
+        participants = event_participants(event_ids)
+        rows = (
+            select(
+                EventNotifyModel.id,
+                EventNotifyModel.next_fire_at,
+                participants.c.user_id,
+            )
+            .join(participants, participants.c.event_id == EventNotifyModel.event_id)
+            .join(UserModel, UserModel.id == participants.c.user_id)
+            .where(
+                EventNotifyModel.id.in_(notify_ids),
+                EventNotifyModel.next_fire_at.is_not(None),
+                UserModel.blocked_at.is_(None),
+            )
+        )
+        stmt = (
+            insert(NotifyDeliveryModel)
+            .from_select(["notify_id", "occurrence_at", "user_id"], rows)
+            .on_conflict_do_nothing(
+                index_elements=["notify_id", "occurrence_at", "user_id"],
+            )
+        )
+        await self._session.execute(stmt)
+
+    async def claim(
+        self,
+        now: datetime,
+        lease: timedelta,
+        limit: int,
+        shards: ShardSet | None = None,
+        notify_ids: Collection[EventNotifyId] | None = None,
+    ) -> list[NotifyDeliveryId]:
+        """
+        Забирает в работу неотправленные строки шардов ``shards`` (или только
+        напоминаний ``notify_ids``): свободные или с протухшим захватом.
+        Строки, которые прямо сейчас забирает другой тик, пропускаются.
+        """
+        pending = (
+            select(NotifyDeliveryModel.id)
+            .join(
+                EventNotifyModel,
+                EventNotifyModel.id == NotifyDeliveryModel.notify_id,
+            )
+            .where(*_claimable(now, lease, shards))
+            .order_by(NotifyDeliveryModel.occurrence_at.asc())
+            .limit(limit)
+            .with_for_update(of=NotifyDeliveryModel, skip_locked=True)
+        )
+        if notify_ids is not None:
+            pending = pending.where(NotifyDeliveryModel.notify_id.in_(notify_ids))
+        stmt = (
+            update(NotifyDeliveryModel)
+            .where(NotifyDeliveryModel.id.in_(pending.scalar_subquery()))
+            .values(claimed_at=now)
+            .returning(NotifyDeliveryModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(await self._session.scalars(stmt))
+
+    async def count_claimable(
+        self,
+        now: datetime,
+        lease: timedelta,
+        shards: ShardSet | None = None,
+    ) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(NotifyDeliveryModel)
+            .join(
+                EventNotifyModel,
+                EventNotifyModel.id == NotifyDeliveryModel.notify_id,
+            )
+            .where(*_claimable(now, lease, shards))
+        )
+        return await self._session.scalar(stmt) or 0
+
+    async def get_claimed(
+        self,
+        delivery_ids: Collection[NotifyDeliveryId],
+    ) -> list[
+        tuple[
+            NotifyDeliveryModel,
+            EventModel,
+            UserModel,
+            UsersToGroupsModel | None,
+            int,
+        ]
+    ]:
+        """
+        Строки журнала вместе с событием, получателем, его членством в группе
+        и за сколько минут до начала события срабатывает напоминание.
+        """
+        if not delivery_ids:
+            return []
+
+        stmt = (
+            select(
+                NotifyDeliveryModel,
+                EventModel,
+                UserModel,
+                UsersToGroupsModel,
+                EventNotifyModel.minutes_before,
+            )
+            .join(
+                EventNotifyModel,
+                EventNotifyModel.id == NotifyDeliveryModel.notify_id,
+            )
+            .join(EventModel, EventModel.id == EventNotifyModel.event_id)
+            .join(UserModel, UserModel.id == NotifyDeliveryModel.user_id)
+            .outerjoin(
+                UsersToGroupsModel,
+                (UsersToGroupsModel.user_id == UserModel.id)
+                & (UsersToGroupsModel.group_id == EventModel.group_id)
+                & UsersToGroupsModel.is_not_deleted,
+            )
+            .where(
+                NotifyDeliveryModel.id.in_(delivery_ids),
+                EventModel.is_not_deleted,
+                UserModel.is_not_deleted,
+                # заблокировал бота уже после того, как строка попала в журнал
+                UserModel.blocked_at.is_(None),
+            )
+            .order_by(
+                NotifyDeliveryModel.occurrence_at.asc(),
+                NotifyDeliveryModel.notify_id.asc(),
+                NotifyDeliveryModel.user_id.asc(),
+            )
+        )
+        return list(await self._session.execute(stmt))
+
+    async def mark_sent(
+        self,
+        delivery_ids: Collection[NotifyDeliveryId],
+        now: datetime,
+    ) -> None:
+        if not delivery_ids:
+            return
+
+        stmt = (
+            update(NotifyDeliveryModel)
+            .where(NotifyDeliveryModel.id.in_(delivery_ids))
+            .values(sent_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.execute(stmt)
+
+    async def purge_sent(self, before: datetime) -> int:
+        """Удаляет давно отправленные строки, чтобы журнал не рос бесконечно."""
+        stmt = delete(NotifyDeliveryModel).where(NotifyDeliveryModel.sent_at < before)
+        result = await self._session.execute(stmt)
+        return result.rowcount
+
+
+def _claimable(
+    now: datetime,
+    lease: timedelta,
+    shards: ShardSet | None,
+) -> tuple[ColumnElement[bool], ...]:
+    return (
+        in_shards(EventNotifyModel.event_id, shards),
+        NotifyDeliveryModel.sent_at.is_(None),
+        or_(
+            NotifyDeliveryModel.claimed_at.is_(None),
+            NotifyDeliveryModel.claimed_at < now - lease,
+        ),
+        NotifyDeliveryModel.is_not_deleted,
+    )
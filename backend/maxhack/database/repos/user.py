@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError, ProgrammingError
 
 from maxhack.core.exceptions import InvalidValue
@@ -58,3 +59,12 @@ class UserRepo(BaseAlchemyRepo):
         await self._session.refresh(user)
 
         return user
+
+    async def mark_blocked(self, max_chat_id: MaxChatId, now: datetime) -> None:
+        stmt = (
+            update(UserModel)
+            .where(UserModel.max_chat_id == max_chat_id)
+            .values(blocked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.execute(stmt)
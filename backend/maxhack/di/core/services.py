@@ -1,8 +1,15 @@
+from collections.abc import Iterable
+
 from dishka import Provider, Scope, provide
 
 from maxo import Bot
 
+from maxhack.config import SchedulerConfig
+from maxhack.core.agenda.service import AgendaService
+from maxhack.core.cron import CronExpander
+from maxhack.core.event.planner import NotifyPlanner
 from maxhack.core.event.service import EventService
+from maxhack.core.forecast.service import ForecastService
 from maxhack.core.group.service import GroupService
 from maxhack.core.ics.service import IcsService
 from maxhack.core.invite.service import InviteService
@@ -19,9 +26,24 @@ class ServicesProvider(Provider):
     tag_service = provide(TagService)
     group_service = provide(GroupService)
     event_service = provide(EventService)
+    notify_planner = provide(NotifyPlanner, scope=Scope.APP)
     invite_service = provide(InviteService)
     respond_service = provide(RespondService)
     ics_service = provide(IcsService)
+    agenda_service = provide(AgendaService)
+    forecast_service = provide(ForecastService)
+
+    @provide(scope=Scope.APP)
+    def cron_expander(
+        self,
+        scheduler_config: SchedulerConfig,
+    ) -> Iterable[CronExpander]:
+        expander = CronExpander(
+            workers=scheduler_config.cron_workers,
+            threshold=scheduler_config.cron_pool_threshold,
+        )
+        yield expander
+        expander.close()
 
     @provide
     async def qrcode(self, bot: Bot) -> QRCoder:
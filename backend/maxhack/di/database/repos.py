@@ -1,8 +1,10 @@
 from dishka import Provider, Scope, provide
 
+from maxhack.database.repos.agenda import AgendaRepo
 from maxhack.database.repos.event import EventRepo
 from maxhack.database.repos.group import GroupRepo
 from maxhack.database.repos.invite import InviteRepo
+from maxhack.database.repos.notify_delivery import NotifyDeliveryRepo
 from maxhack.database.repos.respond import RespondRepo
 from maxhack.database.repos.role import RoleRepo
 from maxhack.database.repos.tag import TagRepo
@@ -21,3 +23,5 @@ class ReposProvider(Provider):
     event_repo = provide(EventRepo)
     respond_repo = provide(RespondRepo)
     role_repo = provide(RoleRepo)
+    notify_delivery_repo = provide(NotifyDeliveryRepo)
+    agenda_repo = provide(AgendaRepo)
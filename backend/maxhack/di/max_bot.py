@@ -1,14 +1,17 @@
 from collections.abc import AsyncIterable
 
 from dishka import Provider, Scope, from_context, provide
-
 from maxo import Bot
 from maxo.dialogs import BgManagerFactory
 from maxo.enums.text_fromat import TextFormat
+from redis.asyncio import Redis
 
-from maxhack.config import MaxConfig
+from maxhack.config import MaxConfig, SchedulerConfig
 from maxhack.core.max import MaxMailer, MaxSender
 from maxhack.core.max.notifier import MaxNotifier
+from maxhack.core.max.outbox import MaxOutbox
+from maxhack.core.max.unreachable import UnreachableChats
+from maxhack.core.utils.shared_rate_limiter import SharedRateLimiter
 
 
 class MaxBotProvider(Provider):
@@ -22,6 +25,39 @@ class MaxBotProvider(Provider):
         async with bot:
             yield bot
 
+    @provide
+    def rate_limiter(
+        self,
+        redis: Redis,
+        max_config: MaxConfig,
+        scheduler_config: SchedulerConfig,
+    ) -> SharedRateLimiter:
+        return SharedRateLimiter(
+            redis=redis,
+            key=f"{scheduler_config.tasks_key}:max_api_rate_limit",
+            max_calls=max_config.rate_limit_calls,
+            period=max_config.rate_limit_period,
+            interactive_reserve=max_config.rate_limit_interactive_reserve,
+            starvation_timeout=max_config.rate_limit_starvation_seconds,
+        )
+
+    @provide
+    def max_outbox(
+        self,
+        redis: Redis,
+        max_config: MaxConfig,
+        scheduler_config: SchedulerConfig,
+    ) -> MaxOutbox:
+        return MaxOutbox(
+            redis=redis,
+            key=f"{scheduler_config.tasks_key}:outbox",
+            batch_size=max_config.outbox_batch_size,
+            claim_idle=max_config.outbox_claim_idle_seconds,
+            workers=max_config.mailer_workers,
+            max_deliveries=max_config.outbox_max_deliveries,
+        )
+
+    unreachable_chats = provide(UnreachableChats)
     max_sender = provide(MaxSender)
     max_mailer = provide(MaxMailer)
     max_notifier = provide(MaxNotifier)
@@ -8,33 +8,77 @@ from taskiq import (
 )
 from taskiq.abc.broker import AsyncBroker
 from taskiq.abc.schedule_source import ScheduleSource
-from taskiq.schedule_sources import LabelScheduleSource
-from taskiq_redis import ListRedisScheduleSource
+from taskiq_redis import RedisStreamBroker
 
 from maxhack.config import RedisConfig, SchedulerConfig
+from maxhack.core.event.notify_scheduler import NotifyScheduler
+from maxhack.core.utils.shard_leases import ShardLeases
+from maxhack.database.change_feed import EventChangeFeed
 from maxhack.scheduler.base_client import BaseSchedulerClient
+from maxhack.scheduler.coordinator import TickCoordinator
+from maxhack.scheduler.leader import (
+    LeaderLabelScheduleSource,
+    LeaderLease,
+    LeaderListRedisScheduleSource,
+)
 from maxhack.scheduler.log_middleware import ContextVarsMiddleware
+from maxhack.scheduler.notify_scheduler import (
+    AfterCommitNotifyScheduler,
+    TaskiqNotifyScheduler,
+)
+from maxhack.scheduler.working_set import NotifyWorkingSet
+
+# стрим задач обрезается примерно до этой длины, чтобы не расти бесконечно
+_TASKS_STREAM_MAXLEN = 10_000
 
 
 class SchedulerProvider(Provider):
     scope = Scope.APP
 
     base_client = provide(BaseSchedulerClient)
+    taskiq_notify_scheduler = provide(TaskiqNotifyScheduler)
+    notify_scheduler = provide(
+        AfterCommitNotifyScheduler,
+        scope=Scope.REQUEST,
+        provides=NotifyScheduler,
+    )
+    event_change_feed = provide(EventChangeFeed)
+    notify_working_set = provide(NotifyWorkingSet)
 
     @provide
     def schedule_source(
         self,
         scheduler_config: SchedulerConfig,
         redis_config: RedisConfig,
+        leader: LeaderLease,
     ) -> ScheduleSource:
-        return ListRedisScheduleSource(
+        return LeaderListRedisScheduleSource(
+            leader=leader,
             url=redis_config.uri,
             prefix=scheduler_config.tasks_key,
         )
 
     @provide
-    def broker(self) -> AsyncBroker:
-        return InMemoryBroker().with_middlewares(
+    def broker(
+        self,
+        scheduler_config: SchedulerConfig,
+        redis_config: RedisConfig,
+    ) -> AsyncBroker:
+        broker: AsyncBroker
+        if scheduler_config.broker == "memory":
+            broker = InMemoryBroker()
+        elif scheduler_config.broker == "redis":
+            broker = RedisStreamBroker(
+                url=redis_config.uri,
+                queue_name=f"{scheduler_config.tasks_key}:tasks",
+                consumer_group_name=f"{scheduler_config.tasks_key}:workers",
+                maxlen=_TASKS_STREAM_MAXLEN,
+            )
+        else:
+            msg = f"Unknown broker: {scheduler_config.broker!r}"
+            raise ValueError(msg)
+
+        return broker.with_middlewares(
             ContextVarsMiddleware(),
             SmartRetryMiddleware(use_delay_exponent=True),
         )
@@ -44,10 +88,56 @@ class SchedulerProvider(Provider):
         self,
         broker: AsyncBroker,
         schedule_source: ScheduleSource,
+        leader: LeaderLease,
+        shard_leases: ShardLeases,
+        scheduler_config: SchedulerConfig,
     ) -> TaskiqScheduler:
+        # с воркерами шарды раздаёт очередь, а не аренда
+        label_source = LeaderLabelScheduleSource(
+            async_shared_broker,
+            leader,
+            None if scheduler_config.distributed else shard_leases,
+        )
         return TaskiqScheduler(
             broker=broker,
-            sources=[schedule_source, LabelScheduleSource(async_shared_broker)],
+            sources=[schedule_source, label_source],
+        )
+
+    @provide
+    def leader(
+        self,
+        redis: Redis,
+        scheduler_config: SchedulerConfig,
+    ) -> LeaderLease:
+        return LeaderLease(
+            redis=redis,
+            key=f"{scheduler_config.tasks_key}:scheduler_leader",
+            lease=scheduler_config.leader_lease_seconds,
+        )
+
+    @provide
+    def tick_coordinator(
+        self,
+        redis: Redis,
+        scheduler_config: SchedulerConfig,
+    ) -> TickCoordinator:
+        return TickCoordinator(
+            redis=redis,
+            key=f"{scheduler_config.tasks_key}:ticks",
+            lock_timeout=scheduler_config.tick_lock_seconds,
+        )
+
+    @provide
+    def shard_leases(
+        self,
+        redis: Redis,
+        scheduler_config: SchedulerConfig,
+    ) -> ShardLeases:
+        return ShardLeases(
+            redis=redis,
+            key=f"{scheduler_config.tasks_key}:notify_shards",
+            shards=scheduler_config.shards,
+            lease=scheduler_config.shard_lease_seconds,
         )
 
     @provide()
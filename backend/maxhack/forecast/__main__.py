@@ -0,0 +1,36 @@
+import argparse
+
+from maxhack.core.forecast.service import ForecastService
+from maxhack.scheduler.init_scheduler import init_scheduler
+from maxhack.utils.run import run
+
+
+async def main(hours: int) -> None:
+    container = await init_scheduler()
+
+    try:
+        async with container() as request_container:
+            forecast_service = await request_container.get(ForecastService)
+            forecast = await forecast_service.forecast(hours=hours)
+    finally:
+        await container.close()
+
+    print(  # noqa: T201
+        f"Прогноз на {hours} ч с {forecast.start:%Y-%m-%d %H:%M}: "
+        f"{forecast.total} напоминаний, "
+        f"лимит {forecast.capacity_per_minute} в минуту",
+    )
+    if forecast.peak is not None:
+        print(  # noqa: T201
+            f"Пик: {forecast.peak.messages} в {forecast.peak.at:%Y-%m-%d %H:%M}",
+        )
+    for minute in forecast.overloaded:
+        print(f"{minute.at:%Y-%m-%d %H:%M}\t{minute.messages}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Прогноз числа напоминаний по минутам против лимита Max API",
+    )
+    parser.add_argument("--hours", type=int, default=24)
+    run(main(parser.parse_args().hours))
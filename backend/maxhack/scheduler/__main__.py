@@ -1,19 +1,31 @@
+import asyncio
+import gc
+import time
+
 from dishka.integrations.taskiq import setup_dishka
 from taskiq import AsyncBroker, TaskiqScheduler
 from taskiq.cli.common_args import LogLevel
 from taskiq.cli.scheduler.args import SchedulerArgs
 from taskiq.cli.scheduler.run import run_scheduler
 
-from maxhack.bot.init_bot import init_bot
+from maxhack.config import MaxConfig, SchedulerConfig
+from maxhack.core.max.notifier import MaxNotifier
+from maxhack.core.max.outbox import MaxOutbox
+from maxhack.core.utils.shard_leases import ShardLeases
+from maxhack.database.change_feed import EventChangeFeed
 from maxhack.logger import get_logger
+from maxhack.scheduler.init_scheduler import init_scheduler, peak_rss_mb
+from maxhack.scheduler.leader import LeaderLease
 from maxhack.scheduler.tasks import *  # noqa
+from maxhack.scheduler.working_set import NotifyWorkingSet
 from maxhack.utils.run import run
 
 logger = get_logger(__name__, groups=("main", "taskiq"))
 
 
 async def main() -> None:
-    dp, container = await init_bot()
+    started = time.monotonic()
+    container = await init_scheduler()
 
     broker = await container.get(AsyncBroker)
     scheduler = await container.get(TaskiqScheduler)
@@ -27,12 +39,42 @@ async def main() -> None:
 
     setup_dishka(container, broker)
 
-    logger.warning("Старт шедулера")
+    scheduler_config = await container.get(SchedulerConfig)
+    leader = await container.get(LeaderLease)
+    shard_leases = await container.get(ShardLeases)
+    heartbeats = [asyncio.create_task(leader.run())]
+    # с воркерами шарды раздаёт очередь, аренда не нужна
+    if not scheduler_config.distributed:
+        heartbeats.append(asyncio.create_task(shard_leases.run()))
+        # тики идут здесь же: набор напоминаний в памяти подписывается
+        # на ленту изменений событий при создании
+        await container.get(NotifyWorkingSet)
+        change_feed = await container.get(EventChangeFeed)
+        heartbeats.append(asyncio.create_task(change_feed.run()))
+    max_config = await container.get(MaxConfig)
+    if max_config.outbox_enabled:
+        max_outbox = await container.get(MaxOutbox)
+        max_notifier = await container.get(MaxNotifier)
+        heartbeats.append(asyncio.create_task(max_outbox.run(max_notifier.send)))
+
+    # всё созданное при запуске живёт до конца процесса: сборщик мусора
+    # не будет обходить эти объекты при каждой полной сборке во время тиков
+    gc.freeze()
+
+    logger.warning(
+        "Старт шедулера за %.2f с, пиковая память %.0f МБ",
+        time.monotonic() - started,
+        peak_rss_mb(),
+    )
     try:
         await run_scheduler(scheduler_args)
     except Exception:
         logger.exception("Ошибка при работе планировщика, конец работы")
     finally:
+        for heartbeat in heartbeats:
+            heartbeat.cancel()
+        await leader.release()
+        await shard_leases.release()
         await scheduler.shutdown()
         for source in scheduler.sources:
             await source.shutdown()
@@ -1,8 +1,8 @@
 import asyncio
 import datetime
-from typing import ParamSpec, TypeVar
+from typing import Any, ParamSpec, TypeVar
 
-from taskiq import AsyncBroker, AsyncTaskiqDecoratedTask
+from taskiq import AsyncBroker, AsyncTaskiqDecoratedTask, ScheduledTask
 from taskiq.abc.schedule_source import ScheduleSource
 
 from maxhack.core.ids import SchedulerTaskId
@@ -52,6 +52,38 @@ class BaseSchedulerClient:
 
         return SchedulerTaskId(scheduled.schedule_id)
 
+    async def schedule_by_name(
+        self,
+        task_name: str,
+        on_datetime: datetime.datetime,
+        schedule_id: SchedulerTaskId,
+        **kwargs: Any,
+    ) -> SchedulerTaskId:
+        """
+        Планирует задачу по имени и с заданным id - для кода, которому
+        нельзя импортировать сами задачи (они импортируют сервисы).
+        """
+        await self._schedule_source.add_schedule(
+            ScheduledTask(
+                task_name=task_name,
+                labels={},
+                args=[],
+                kwargs=kwargs,
+                schedule_id=schedule_id,
+                time=on_datetime,
+            ),
+        )
+
+        logger.debug(
+            'Added task "%s" (kwargs=%s) on %s with id=%s',
+            task_name,
+            kwargs,
+            on_datetime,
+            schedule_id,
+        )
+
+        return schedule_id
+
     async def unschedule(self, scheduler_task_id: SchedulerTaskId) -> None:
         await self._schedule_source.delete_schedule(scheduler_task_id)
 
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Final
+
+from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockError, RedisError
+
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("redis", "scheduler"))
+
+# Итог тика. KEYS[1] - хеш статистики, ARGV: длительность (с), время окончания.
+_RECORD_RUN_SCRIPT: Final = """
+redis.call('HINCRBY', KEYS[1], 'runs', 1)
+redis.call('HSET', KEYS[1], 'last_duration', ARGV[1], 'last_finished_at', ARGV[2])
+local max_duration = tonumber(redis.call('HGET', KEYS[1], 'max_duration') or 0)
+if tonumber(ARGV[1]) > max_duration then
+    redis.call('HSET', KEYS[1], 'max_duration', ARGV[1])
+end
+"""
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class TickStats:
+    name: str
+    # сколько тиков выполнено
+    runs: int
+    # сколько тиков пропущено, потому что предыдущий ещё шёл
+    overlaps: int
+    # длительность последнего и самого долгого тика, секунды
+    last_duration: float | None
+    max_duration: float | None
+    last_finished_at: datetime | None
+
+
+class TickCoordinator:
+    """
+    Не даёт периодической задаче начаться, пока предыдущий её запуск
+    ещё идёт - в этом процессе или, для ``exclusive``, в любой реплике.
+
+    Пропущенный запуск не теряется: следующий забирает всё накопившееся
+    с прошлого (напоминания с наступившим ``next_fire_at``
+    и неотправленные строки журнала доставки).
+
+    Число запусков, наложений и длительность запусков копятся в Redis.
+    """
+
+    def __init__(self, redis: Redis, key: str, lock_timeout: float) -> None:
+        self._redis = redis
+        self._key = key
+        self._lock_timeout = lock_timeout
+        self._record_run_script = redis.register_script(_RECORD_RUN_SCRIPT)
+        self._running: set[str] = set()
+
+    async def run[T](
+        self,
+        name: str,
+        tick: Callable[[], Awaitable[T]],
+        *,
+        exclusive: bool = True,
+    ) -> T | None:
+        """Выполняет ``tick``, если ``name`` сейчас не выполняется, иначе ``None``."""
+        if name in self._running:
+            await self._record_overlap(name)
+            return None
+
+        lock = None
+        if exclusive:
+            lock = self._redis.lock(
+                f"{self._key}:{name}:lock",
+                timeout=self._lock_timeout,
+            )
+            try:
+                acquired = await lock.acquire(blocking=False)
+            except (RedisError, OSError) as e:
+                # от двойной отправки всё равно защищает журнал доставки
+                logger.warning(
+                    "Redis недоступен, тик '%s' без блокировки",
+                    name,
+                    exc_info=e,
+                )
+                lock = None
+            else:
+                if not acquired:
+                    await self._record_overlap(name)
+                    return None
+
+        self._running.add(name)
+        keepalive = asyncio.create_task(self._keep_lock(name, lock)) if lock else None
+        started = time.monotonic()
+        try:
+            return await tick()
+        finally:
+            duration = time.monotonic() - started
+            self._running.discard(name)
+            if keepalive is not None:
+                keepalive.cancel()
+            if lock is not None:
+                await self._release(name, lock)
+            await self._record_run(name, duration)
+
+    async def stats(self) -> list[TickStats]:
+        result = []
+        prefix, suffix = f"{self._key}:", ":stats"
+        async for key in self._redis.scan_iter(match=f"{prefix}*{suffix}"):
+            raw = {
+                k.decode(): v.decode()
+                for k, v in (await self._redis.hgetall(key)).items()
+            }
+            last_finished_at = raw.get("last_finished_at")
+            result.append(
+                TickStats(
+                    name=key.decode().removeprefix(prefix).removesuffix(suffix),
+                    runs=int(raw.get("runs", 0)),
+                    overlaps=int(raw.get("overlaps", 0)),
+                    last_duration=_float_or_none(raw.get("last_duration")),
+                    max_duration=_float_or_none(raw.get("max_duration")),
+                    last_finished_at=(
+                        datetime.fromtimestamp(float(last_finished_at), UTC)
+                        if last_finished_at
+                        else None
+                    ),
+                ),
+            )
+        return sorted(result, key=lambda stats: stats.name)
+
+    async def _keep_lock(self, name: str, lock: Lock) -> None:
+        while True:
+            await asyncio.sleep(self._lock_timeout / 3)
+            try:
+                await lock.reacquire()
+            except (LockError, RedisError, OSError) as e:
+                logger.warning(
+                    "Не удалось продлить блокировку тика '%s'",
+                    name,
+                    exc_info=e,
+                )
+                return
+
+    async def _release(self, name: str, lock: Lock) -> None:
+        try:
+            await lock.release()
+        except (LockError, RedisError, OSError) as e:
+            logger.warning("Не удалось снять блокировку тика '%s'", name, exc_info=e)
+
+    async def _record_overlap(self, name: str) -> None:
+        logger.warning("Тик '%s' пропущен: предыдущий ещё выполняется", name)
+        try:
+            await self._redis.hincrby(self._stats_key(name), "overlaps", 1)
+        except (RedisError, OSError) as e:
+            logger.warning("Не удалось записать статистику тика '%s'", name, exc_info=e)
+
+    async def _record_run(self, name: str, duration: float) -> None:
+        logger.info("Тик '%s' занял %.3f с", name, duration)
+        try:
+            await self._record_run_script(
+                keys=[self._stats_key(name)],
+                args=[repr(duration), repr(time.time())],
+            )
+        except (RedisError, OSError) as e:
+            logger.warning("Не удалось записать статистику тика '%s'", name, exc_info=e)
+
+    def _stats_key(self, name: str) -> str:
+        return f"{self._key}:{name}:stats"
+
+
+def _float_or_none(value: str | None) -> float | None:
+    return float(value) if value is not None else None
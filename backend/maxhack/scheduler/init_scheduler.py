@@ -0,0 +1,72 @@
+import math
+import sys
+from typing import Any
+
+from dishka import AsyncContainer, Provider
+from maxo import Bot
+from maxo.dialogs import BaseDialogManager, BgManagerFactory
+
+from maxhack.config import RedisConfig, load_config
+from maxhack.di import make_container
+from maxhack.logger import get_logger, setup_logger
+
+logger = get_logger(__name__, groups=("main", "taskiq"))
+
+
+class LazyBgManagerFactory(BgManagerFactory):
+    """
+    Фабрика фоновых менеджеров диалогов, которая собирает диспетчер бота
+    со всеми диалогами, хранилищем FSM и мидлварями только при первом
+    запуске диалога. Планировщику и воркерам диалоги почти не нужны,
+    а вместе с диспетчером импортируются все хендлеры бота.
+    """
+
+    def __init__(self, redis_config: RedisConfig) -> None:
+        self._redis_config = redis_config
+        self._factory: BgManagerFactory | None = None
+
+    def bg(
+        self,
+        bot: Bot,
+        user_id: int,
+        chat_id: int,
+        **kwargs: Any,
+    ) -> BaseDialogManager:
+        if self._factory is None:
+            # диалоги тянут за собой все хендлеры бота
+            from maxhack.bot.dp import build_dispatcher  # noqa: PLC0415
+
+            logger.info("Собираем диалоги бота для запуска диалога из фона")
+            _, self._factory = build_dispatcher(self._redis_config)
+        return self._factory.bg(bot, user_id, chat_id, **kwargs)
+
+
+async def init_scheduler(
+    env_path: str | None = None,
+    *extra_providers: Provider,
+) -> AsyncContainer:
+    """
+    Контейнер для планировщика и воркеров: бот, отправка сообщений,
+    база и Redis - без диспетчера бота, он собирается только по требованию.
+    """
+    config = load_config(env_path)
+
+    setup_logger(config.log_level)
+
+    return make_container(
+        *extra_providers,
+        config=config,
+        context={BgManagerFactory: LazyBgManagerFactory(config.redis)},
+    )
+
+
+def peak_rss_mb() -> float:
+    """Пиковая память процесса в МБ; ``nan``, где её не узнать."""
+    if sys.platform == "win32":
+        return math.nan
+
+    import resource  # noqa: PLC0415
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux отдаёт килобайты, macos - байты
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
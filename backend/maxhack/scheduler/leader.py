@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import LockError, RedisError
+from taskiq import AsyncBroker, ScheduledTask
+from taskiq.exceptions import ScheduledTaskCancelledError
+from taskiq.schedule_sources import LabelScheduleSource
+from taskiq_redis import ListRedisScheduleSource
+
+from maxhack.core.utils.shard_leases import ShardLeases
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("redis", "scheduler"))
+
+
+class LeaderLease:
+    """
+    Выбор лидера среди реплик планировщика: лидер тот, кто держит
+    блокировку в Redis. Блокировка продлевается раз в треть аренды;
+    если продлить не удалось, по истечении аренды реплика перестаёт
+    считать себя лидером, а блокировку забирает другая.
+    """
+
+    def __init__(self, redis: Redis, key: str, lease: float) -> None:
+        self._lock = redis.lock(key, timeout=lease)
+        self._lease = lease
+        self._held = False
+        self._valid_until = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    async def heartbeat(self) -> bool:
+        # аренда отсчитывается с момента запроса, а не ответа
+        started = time.monotonic()
+        was_leader = self.is_leader
+
+        held = False
+        if self._held:
+            try:
+                held = await self._lock.reacquire()
+            except LockError:
+                logger.warning("Блокировка лидера перехвачена другой репликой")
+        if not held:
+            held = await self._lock.acquire(blocking=False)
+
+        self._held = held
+        self._valid_until = started + self._lease if held else 0.0
+        if held != was_leader:
+            logger.info("Реплика %s лидером", "стала" if held else "больше не")
+        return held
+
+    async def run(self) -> None:
+        """Продлевает или пытается захватить лидерство, пока задачу не отменят."""
+        while True:
+            try:
+                await self.heartbeat()
+            except (RedisError, OSError) as e:
+                logger.warning("Не удалось продлить лидерство", exc_info=e)
+            await asyncio.sleep(self._lease / 3)
+
+    async def release(self) -> None:
+        """Сразу отдаёт лидерство другой реплике, не дожидаясь конца аренды."""
+        if not self._held:
+            return
+
+        self._held = False
+        self._valid_until = 0.0
+        try:
+            await self._lock.release()
+        except (LockError, RedisError, OSError) as e:
+            logger.warning("Не удалось освободить блокировку лидера", exc_info=e)
+
+
+class LeaderLabelScheduleSource(LabelScheduleSource):
+    """
+    Расписание из меток задач, которое запускает только лидер.
+
+    Задачи с меткой ``sharded=True`` при делении событий на шарды
+    арендой (``shard_leases``) запускаются на каждой реплике: каждая
+    обрабатывает только свои шарды.
+    """
+
+    def __init__(
+        self,
+        broker: AsyncBroker,
+        leader: LeaderLease,
+        shard_leases: ShardLeases | None = None,
+    ) -> None:
+        super().__init__(broker)
+        self._leader = leader
+        self._shard_leases = shard_leases
+
+    def pre_send(self, task: ScheduledTask) -> None:
+        if self._leader.is_leader:
+            return
+        if (
+            task.labels.get("sharded")
+            and self._shard_leases is not None
+            and self._shard_leases.current() is not None
+        ):
+            return
+        raise ScheduledTaskCancelledError
+
+
+class LeaderListRedisScheduleSource(ListRedisScheduleSource):
+    """
+    Разовые и динамические задачи из Redis, которые запускает только лидер:
+    иначе каждая реплика планировщика отправила бы их по разу.
+    """
+
+    def __init__(self, leader: LeaderLease, url: str, prefix: str) -> None:
+        super().__init__(url=url, prefix=prefix)
+        self._leader = leader
+
+    def pre_send(self, _task: ScheduledTask) -> None:
+        if not self._leader.is_leader:
+            raise ScheduledTaskCancelledError
@@ -0,0 +1,123 @@
+import asyncio
+from collections.abc import Coroutine, Iterable, Mapping
+from datetime import datetime
+from typing import Any, Final
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from maxhack.core.ids import EventNotifyId, SchedulerTaskId
+from maxhack.logger import get_logger
+from maxhack.scheduler.base_client import BaseSchedulerClient
+
+logger = get_logger(__name__, groups="scheduler")
+
+FIRE_NOTIFY_TASK: Final = "fire_notify"
+
+_NextFires = Mapping[EventNotifyId, datetime | None]
+
+# задачи, запущенные после фиксации транзакций, - чтобы их не собрал GC
+_background: set[asyncio.Task[None]] = set()
+
+
+class TaskiqNotifyScheduler:
+    """
+    Ставит на каждое следующее срабатывание напоминания разовую задачу,
+    чтобы оно ушло в свою секунду, а не на ближайшем минутном тике.
+
+    Id задачи зависит от напоминания и времени срабатывания: повторная
+    постановка ничего не дублирует, а снять задачу можно, зная только
+    прежний ``next_fire_at``. Если Redis недоступен, напоминание дошлёт
+    минутный тик.
+    """
+
+    def __init__(self, scheduler_client: BaseSchedulerClient) -> None:
+        self._scheduler_client = scheduler_client
+
+    async def schedule(self, next_fires: _NextFires) -> None:
+        await self._gather(
+            self._schedule(notify_id, fire_at)
+            for notify_id, fire_at in next_fires.items()
+            if fire_at is not None
+        )
+
+    async def unschedule(self, next_fires: _NextFires) -> None:
+        await self._gather(
+            self._scheduler_client.unschedule(_schedule_id(notify_id, fire_at))
+            for notify_id, fire_at in next_fires.items()
+            if fire_at is not None
+        )
+
+    async def _schedule(self, notify_id: EventNotifyId, fire_at: datetime) -> None:
+        schedule_id = _schedule_id(notify_id, fire_at)
+        # снимаем такую же задачу, если её уже ставил другой тик
+        await self._scheduler_client.unschedule(schedule_id)
+        await self._scheduler_client.schedule_by_name(
+            FIRE_NOTIFY_TASK,
+            fire_at,
+            schedule_id,
+            notify_id=notify_id,
+        )
+
+    async def _gather(self, coros: Iterable[Coroutine[Any, Any, None]]) -> None:
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, RedisError | OSError):
+                logger.warning(
+                    "Не удалось обновить задачи напоминаний",
+                    exc_info=result,
+                )
+            elif isinstance(result, BaseException):
+                raise result
+
+
+class AfterCommitNotifyScheduler:
+    """
+    Откладывает постановку и снятие задач до фиксации транзакции ``session``:
+    иначе задача могла сработать раньше, чем изменения увидят другие
+    соединения, или остаться после отката. При откате отложенное
+    отбрасывается, а после фиксации выполняется по порядку в фоне.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        scheduler: TaskiqNotifyScheduler,
+    ) -> None:
+        self._scheduler = scheduler
+        self._pending: list[tuple[bool, _NextFires]] = []
+        event.listen(session.sync_session, "after_commit", self._after_commit)
+        event.listen(session.sync_session, "after_rollback", self._after_rollback)
+
+    async def schedule(self, next_fires: _NextFires) -> None:
+        self._pending.append((True, next_fires))
+
+    async def unschedule(self, next_fires: _NextFires) -> None:
+        self._pending.append((False, next_fires))
+
+    def _after_commit(self, _session: Session) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._flush(pending))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+    def _after_rollback(self, _session: Session) -> None:
+        self._pending.clear()
+
+    async def _flush(self, pending: list[tuple[bool, _NextFires]]) -> None:
+        try:
+            for schedule, next_fires in pending:
+                if schedule:
+                    await self._scheduler.schedule(next_fires)
+                else:
+                    await self._scheduler.unschedule(next_fires)
+        except Exception:
+            logger.exception("Не удалось обновить задачи напоминаний")
+
+
+def _schedule_id(notify_id: EventNotifyId, fire_at: datetime) -> SchedulerTaskId:
+    return SchedulerTaskId(f"notify:{notify_id}:{int(fire_at.timestamp())}")
@@ -1,3 +1,17 @@
-from .notifies import send_notifies
+from .agendas import plan_agendas, purge_agendas, send_agendas
+from .notifies import (
+    fire_notify,
+    purge_notify_deliveries,
+    send_notifies,
+    send_notifies_shard,
+)
 
-__all__ = ("send_notifies",)
+__all__ = (
+    "fire_notify",
+    "plan_agendas",
+    "purge_agendas",
+    "purge_notify_deliveries",
+    "send_agendas",
+    "send_notifies",
+    "send_notifies_shard",
+)
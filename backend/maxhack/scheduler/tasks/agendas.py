@@ -0,0 +1,67 @@
+from dishka import FromDishka
+from dishka.integrations.taskiq import inject
+from sqlalchemy.ext.asyncio import AsyncSession
+from taskiq import async_shared_broker
+
+from maxhack.core.agenda.models import Agenda
+from maxhack.core.agenda.service import AgendaService
+from maxhack.core.max import MaxMailer
+from maxhack.core.utils.fan_out import FanOutChunk
+from maxhack.scheduler.coordinator import TickCoordinator
+
+
+@async_shared_broker.task(
+    task_name="plan_agendas",
+    # в стороне от круглых минут, на которые приходится большинство напоминаний
+    schedule=[{"cron": "40 * * * *"}],
+)
+@inject(patch_module=True)
+async def plan_agendas(
+    *,
+    agenda_service: FromDishka[AgendaService],
+    session: FromDishka[AsyncSession],
+    tick_coordinator: FromDishka[TickCoordinator],
+) -> None:
+    async def plan() -> None:
+        await agenda_service.plan_agendas()
+        await session.commit()
+
+    await tick_coordinator.run("plan_agendas", plan)
+
+
+@async_shared_broker.task(
+    task_name="send_agendas",
+    schedule=[{"cron": "* * * * *"}],
+)
+@inject(patch_module=True)
+async def send_agendas(
+    *,
+    max_mailer: FromDishka[MaxMailer],
+    agenda_service: FromDishka[AgendaService],
+    session: FromDishka[AsyncSession],
+    tick_coordinator: FromDishka[TickCoordinator],
+) -> None:
+    async def send() -> None:
+        agendas = await agenda_service.claim_agendas()
+        await session.commit()
+
+        async def mark_sent(chunk: FanOutChunk[Agenda]) -> None:
+            # упавшие отправки повторятся после аренды
+            await agenda_service.mark_agendas_sent([agenda.id for agenda in chunk.done])
+            await session.commit()
+
+        await max_mailer.agenda(agendas, on_chunk=mark_sent)
+
+    await tick_coordinator.run("send_agendas", send)
+
+
+@async_shared_broker.task(
+    task_name="purge_agendas",
+    schedule=[{"cron": "35 3 * * *"}],
+)
+@inject(patch_module=True)
+async def purge_agendas(
+    *,
+    agenda_service: FromDishka[AgendaService],
+) -> None:
+    await agenda_service.purge_agendas()
@@ -1,10 +1,20 @@
 from dishka import FromDishka
 from dishka.integrations.taskiq import inject
-from taskiq import async_shared_broker
+from sqlalchemy.ext.asyncio import AsyncSession
+from taskiq import AsyncBroker, async_shared_broker
 
+from maxhack.config import SchedulerConfig
+from maxhack.core.event.models import NotifyDigest
 from maxhack.core.event.service import EventService
+from maxhack.core.ids import EventNotifyId
 from maxhack.core.max import MaxMailer
+from maxhack.core.utils.datehelp import datetime_now
+from maxhack.core.utils.fan_out import FanOutChunk
+from maxhack.core.utils.shard_leases import ShardLeases, ShardSet
 from maxhack.logger import get_logger
+from maxhack.scheduler.coordinator import TickCoordinator
+from maxhack.scheduler.notify_scheduler import FIRE_NOTIFY_TASK
+from maxhack.scheduler.working_set import NotifyWorkingSet
 
 logger = get_logger(__name__, groups="tasks")
 
@@ -12,13 +22,177 @@ logger = get_logger(__name__, groups="tasks")
 @async_shared_broker.task(
     task_name="send_notifies",
     schedule=[{"cron": "* * * * *"}],
+    retry_on_error=True,
+    max_retries=3,
+    sharded=True,
 )
 @inject(patch_module=True)
 async def send_notifies(
     *,
     max_mailer: FromDishka[MaxMailer],
     events_service: FromDishka[EventService],
+    session: FromDishka[AsyncSession],
+    shard_leases: FromDishka[ShardLeases],
+    tick_coordinator: FromDishka[TickCoordinator],
+    scheduler_config: FromDishka[SchedulerConfig],
+    broker: FromDishka[AsyncBroker],
+    working_set: FromDishka[NotifyWorkingSet],
 ) -> None:
-    notifies = await events_service.get_notify_by_date_interval()
-    for users, event in notifies:
-        await max_mailer.event_notify(event, users)
+    if scheduler_config.distributed:
+        # каждый шард - отдельная задача, их параллельно разбирают воркеры
+        for shard in range(scheduler_config.shards):
+            await send_notifies_shard.kicker().with_broker(broker).kiq(shard)
+        return
+
+    shards = shard_leases.current()
+    if shards is not None and not shards.owned:
+        logger.info("Нет своих шардов, рассылку ведут другие реплики")
+        return
+
+    # с шардами реплики ведут свои тики независимо друг от друга
+    await tick_coordinator.run(
+        "send_notifies",
+        lambda: _send_notifies(
+            max_mailer,
+            events_service,
+            session,
+            shards,
+            working_set=working_set,
+        ),
+        exclusive=shards is None,
+    )
+
+
+@async_shared_broker.task(
+    task_name="send_notifies_shard",
+    retry_on_error=True,
+    max_retries=3,
+)
+@inject(patch_module=True)
+async def send_notifies_shard(
+    shard: int,
+    *,
+    max_mailer: FromDishka[MaxMailer],
+    events_service: FromDishka[EventService],
+    session: FromDishka[AsyncSession],
+    tick_coordinator: FromDishka[TickCoordinator],
+    scheduler_config: FromDishka[SchedulerConfig],
+) -> None:
+    shards = None
+    if scheduler_config.shards > 1:
+        shards = ShardSet(total=scheduler_config.shards, owned=frozenset({shard}))
+
+    await tick_coordinator.run(
+        f"send_notifies:{shard}",
+        lambda: _send_notifies(max_mailer, events_service, session, shards),
+    )
+
+
+@async_shared_broker.task(task_name=FIRE_NOTIFY_TASK)
+@inject(patch_module=True)
+async def fire_notify(
+    notify_id: int,
+    *,
+    max_mailer: FromDishka[MaxMailer],
+    events_service: FromDishka[EventService],
+    session: FromDishka[AsyncSession],
+) -> None:
+    """
+    Разовая задача на срабатывание одного напоминания: отправляет его
+    в срок и ставит задачу на следующее срабатывание. Если напоминание
+    уже отправил тик, изменили или удалили, задача ничего не делает.
+    """
+    await _send_notifies(
+        max_mailer,
+        events_service,
+        session,
+        notify_ids=[EventNotifyId(notify_id)],
+    )
+
+
+async def _send_notifies(
+    max_mailer: MaxMailer,
+    events_service: EventService,
+    session: AsyncSession,
+    shards: ShardSet | None = None,
+    notify_ids: list[EventNotifyId] | None = None,
+    working_set: NotifyWorkingSet | None = None,
+) -> None:
+    """
+    Тик рассылки. После простоя планировщика пропущенного может быть много:
+    тогда тик разбирает его пачками, пока не догонит, - пачка ограничена
+    ``due_batch_size`` и ``delivery_batch_size``, а скорость отправки -
+    ограничителем запросов к Max.
+
+    Если в памяти планировщика есть свежий ``working_set`` и по нему ничего
+    не наступило, поиск наступивших напоминаний в базе пропускается.
+    """
+    left: int | None = None
+    while True:
+        await _send_notifies_batch(
+            max_mailer,
+            events_service,
+            session,
+            shards,
+            notify_ids,
+            working_set,
+        )
+        if notify_ids is not None:
+            return
+
+        backlog = await events_service.notify_backlog(shards)
+        if not backlog:
+            return
+        # пачка ничего не разобрала (напоминание с битым cron, строки взяты
+        # другой репликой) - остальное дождётся следующего тика
+        if left is not None and backlog.due + backlog.pending >= left:
+            logger.warning(
+                "Пропущенное не убывает, догонять продолжим в следующем тике",
+            )
+            return
+        left = backlog.due + backlog.pending
+        logger.info(
+            "Догоняем пропущенное: осталось %d напоминаний и %d отправок",
+            backlog.due,
+            backlog.pending,
+        )
+
+
+async def _send_notifies_batch(
+    max_mailer: MaxMailer,
+    events_service: EventService,
+    session: AsyncSession,
+    shards: ShardSet | None,
+    notify_ids: list[EventNotifyId] | None,
+    working_set: NotifyWorkingSet | None,
+) -> None:
+    notifications = await events_service.get_notify_by_date_interval(
+        shards,
+        notify_ids,
+        due=working_set is None or working_set.has_due(datetime_now(), shards),
+    )
+    # журнал и сдвиг next_fire_at фиксируются до рассылки: упавший тик
+    # не потеряет напоминания, а следующий дошлёт только недошедшее
+    await session.commit()
+
+    async def mark_sent(chunk: FanOutChunk[NotifyDigest]) -> None:
+        # упавшие отправки остаются захваченными и повторятся после аренды;
+        # с очередью исходящих сообщений отправленным считается переданное ей
+        await events_service.mark_deliveries_sent(
+            [delivery for digest in chunk.done for delivery in digest.deliveries],
+        )
+        await session.commit()
+
+    await max_mailer.event_notify(notifications, on_chunk=mark_sent)
+
+
+@async_shared_broker.task(
+    task_name="purge_notify_deliveries",
+    schedule=[{"cron": "30 3 * * *"}],
+)
+@inject(patch_module=True)
+async def purge_notify_deliveries(
+    *,
+    events_service: FromDishka[EventService],
+) -> None:
+    await events_service.purge_notify_deliveries()
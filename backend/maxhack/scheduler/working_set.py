@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from maxhack.core.event.fire_table import NotifyFireTable
+from maxhack.core.ids import EventId
+from maxhack.core.utils.shard_leases import ShardSet
+from maxhack.database.change_feed import EventChangeFeed
+from maxhack.database.repos.event import EventRepo
+from maxhack.logger import get_logger
+
+logger = get_logger(__name__, groups=("database", "scheduler"))
+
+
+class NotifyWorkingSet:
+    """
+    Ближайшие срабатывания действующих напоминаний в памяти планировщика.
+
+    Загружается целиком при подключении ленты изменений событий,
+    а дальше перечитывает только события, о которых сообщила лента:
+    правки из API и бота видны через доли секунды без полного перечитывания.
+    Пока лента не подключена, набор считается устаревшим и ничего не решает.
+
+    Хранится в ``NotifyFireTable``: столбцы вместо объектов на каждое
+    напоминание, чтобы миллионы напоминаний не нагружали сборщик мусора.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        change_feed: EventChangeFeed,
+    ) -> None:
+        self._sessionmaker = sessionmaker
+        self._change_feed = change_feed
+        self._fires = NotifyFireTable()
+        self._loaded = False
+        change_feed.subscribe(self.apply)
+
+    @property
+    def live(self) -> bool:
+        """Набор загружен и получает изменения."""
+        return self._loaded and self._change_feed.connected
+
+    def __len__(self) -> int:
+        return len(self._fires)
+
+    def has_due(self, now: datetime, shards: ShardSet | None = None) -> bool:
+        """
+        Есть ли в шардах ``shards`` наступившие напоминания.
+        Устаревший набор отвечает ``True``: пусть проверит база.
+        """
+        if not self.live:
+            return True
+        return self._fires.has_due(now, shards)
+
+    async def apply(self, event_ids: set[EventId] | None) -> None:
+        """Перечитывает напоминания событий ``event_ids``, ``None`` - всех."""
+        if not self._loaded:
+            event_ids = None
+        try:
+            async with self._sessionmaker() as session:
+                rows = await EventRepo(session).get_notify_fires(event_ids)
+        except SQLAlchemyError:
+            logger.exception("Не удалось обновить напоминания планировщика")
+            self._loaded = False
+            return
+
+        self._fires.replace(rows, event_ids)
+
+        if event_ids is None:
+            self._loaded = True
+            logger.info(
+                "Загружено %d напоминаний планировщика, %.1f МБ",
+                len(self._fires),
+                self._fires.nbytes / (1024 * 1024),
+            )
+        else:
+            logger.debug(
+                "Обновлены напоминания %d событий планировщика",
+                len(event_ids),
+            )
@@ -1,5 +1,15 @@
+from dishka import FromDishka
 from dishka.integrations.fastapi import DishkaRoute
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+
+from maxhack.core.forecast.service import ForecastService
+from maxhack.core.utils.shared_rate_limiter import SharedRateLimiter
+from maxhack.scheduler.coordinator import TickCoordinator
+from maxhack.web.schemas.health import (
+    LoadForecastResponse,
+    ThrottleStateResponse,
+    TickStatsResponse,
+)
 
 healthcheck_router = APIRouter(
     prefix="/health",
@@ -14,3 +24,37 @@ healthcheck_router = APIRouter(
 )
 async def check_connection() -> None:
     return
+
+
+@healthcheck_router.get(
+    "/throttle",
+    description="Текущий лимит запросов к Max API и состояние торможения",
+)
+async def throttle_state(
+    rate_limiter: FromDishka[SharedRateLimiter],
+) -> ThrottleStateResponse:
+    state = await rate_limiter.state()
+    return ThrottleStateResponse.model_validate(state)
+
+
+@healthcheck_router.get(
+    "/ticks",
+    description="Длительность и наложения периодических задач планировщика",
+)
+async def ticks_stats(
+    tick_coordinator: FromDishka[TickCoordinator],
+) -> list[TickStatsResponse]:
+    stats = await tick_coordinator.stats()
+    return [TickStatsResponse.model_validate(tick) for tick in stats]
+
+
+@healthcheck_router.get(
+    "/forecast",
+    description="Прогноз числа напоминаний по минутам против лимита Max API",
+)
+async def notify_forecast(
+    forecast_service: FromDishka[ForecastService],
+    hours: int = Query(24, ge=1, le=24 * 7, description="На сколько часов вперёд"),
+) -> LoadForecastResponse:
+    forecast = await forecast_service.forecast(hours=hours)
+    return LoadForecastResponse.model_validate(forecast)
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from pydantic import Field
+
+from maxhack.web.schemas.core import Model
+
+
+class ThrottleStateResponse(Model):
+    rate: float = Field(..., description="Текущий лимит запросов к Max API в секунду")
+    factor: float = Field(..., description="Доля от полного лимита, 1 - без торможения")
+    paused_for: float = Field(..., description="Сколько ещё секунд запросы на паузе")
+    throttled: int = Field(..., description="Сколько раз процесс получал ответ 429")
+    local_fallback: bool = Field(
+        ...,
+        description="Лимит только локальный, Redis недоступен",
+    )
+
+
+class TickStatsResponse(Model):
+    name: str = Field(..., description="Периодическая задача планировщика")
+    runs: int = Field(..., description="Сколько раз задача выполнилась")
+    overlaps: int = Field(
+        ...,
+        description="Сколько запусков пропущено, потому что предыдущий ещё шёл",
+    )
+    last_duration: float | None = Field(
+        ...,
+        description="Длительность последнего запуска, секунды",
+    )
+    max_duration: float | None = Field(
+        ...,
+        description="Длительность самого долгого запуска, секунды",
+    )
+    last_finished_at: datetime | None = Field(
+        ...,
+        description="Когда закончился последний запуск",
+    )
+
+
+class ForecastMinuteResponse(Model):
+    at: datetime = Field(..., description="Минута рассылки")
+    messages: int = Field(..., description="Сколько напоминаний уйдёт в эту минуту")
+    over_capacity: bool = Field(
+        ...,
+        description="Напоминаний больше, чем пропускает лимит Max API",
+    )
+
+
+class LoadForecastResponse(Model):
+    start: datetime = Field(..., description="Начало прогноза")
+    capacity_per_minute: int = Field(
+        ...,
+        description="Сколько сообщений в минуту пропускает лимит Max API",
+    )
+    total: int = Field(..., description="Сколько напоминаний уйдёт за весь прогноз")
+    peak: ForecastMinuteResponse | None = Field(
+        ...,
+        description="Самая нагруженная минута",
+    )
+    overloaded: list[ForecastMinuteResponse] = Field(
+        ...,
+        description="Минуты, в которые лимит Max API будет превышен",
+    )
+    minutes: list[ForecastMinuteResponse] = Field(
+        ...,
+        description="Прогноз по минутам",
+    )
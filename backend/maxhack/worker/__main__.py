@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from dishka.integrations.taskiq import setup_dishka
+from taskiq import AsyncBroker
+from taskiq.api import run_receiver_task
+
+from maxhack.config import MaxConfig, SchedulerConfig
+from maxhack.core.max.notifier import MaxNotifier
+from maxhack.core.max.outbox import MaxOutbox
+from maxhack.logger import get_logger
+from maxhack.scheduler.init_scheduler import init_scheduler, peak_rss_mb
+from maxhack.scheduler.tasks import *  # noqa: F403
+from maxhack.utils.run import run
+
+logger = get_logger(__name__, groups=("main", "taskiq"))
+
+
+async def main() -> None:
+    started = time.monotonic()
+    container = await init_scheduler()
+
+    scheduler_config = await container.get(SchedulerConfig)
+    if not scheduler_config.distributed:
+        logger.error(
+            "Задачи выполняет сам планировщик, "
+            "для воркеров нужен SCHEDULER_BROKER=redis",
+        )
+        await container.close()
+        return
+
+    broker = await container.get(AsyncBroker)
+    setup_dishka(container, broker)
+    broker.is_worker_process = True
+
+    sender = None
+    max_config = await container.get(MaxConfig)
+    if max_config.outbox_enabled:
+        max_outbox = await container.get(MaxOutbox)
+        max_notifier = await container.get(MaxNotifier)
+        sender = asyncio.create_task(max_outbox.run(max_notifier.send))
+
+    logger.warning(
+        "Старт воркера за %.2f с, пиковая память %.0f МБ",
+        time.monotonic() - started,
+        peak_rss_mb(),
+    )
+    try:
+        await broker.startup()
+        await run_receiver_task(
+            broker,
+            max_async_tasks=scheduler_config.worker_max_tasks,
+        )
+    except Exception:
+        logger.exception("Ошибка при работе воркера, конец работы")
+    finally:
+        if sender is not None:
+            sender.cancel()
+        await broker.shutdown()
+        await container.close()
+
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,53 @@
+from typing import Final
+
+from maxhack.database.change_feed import EVENT_CHANGES_CHANNEL
+
+# таблица -> колонка с id события, изменения которого она описывает
+EVENT_CHANGES_TABLES: Final = {
+    "events": "id",
+    "events_notifies": "event_id",
+    "users_to_events": "event_id",
+    "tags_to_events": "event_id",
+}
+
+# Сообщает в канал id события изменённой строки. Одинаковые сообщения
+# одной транзакции Postgres схлопывает, так что пакетная правка напоминаний
+# события даёт одно сообщение. Имя колонки с id события - аргумент триггера.
+CREATE_FUNCTION: Final = f"""
+CREATE OR REPLACE FUNCTION notify_event_change() RETURNS trigger AS $$
+DECLARE
+    new_id text;
+    old_id text;
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        new_id := to_jsonb(NEW) ->> TG_ARGV[0];
+        PERFORM pg_notify('{EVENT_CHANGES_CHANNEL}', new_id);
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        old_id := to_jsonb(OLD) ->> TG_ARGV[0];
+        IF old_id IS DISTINCT FROM new_id THEN
+            PERFORM pg_notify('{EVENT_CHANGES_CHANNEL}', old_id);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTION: Final = "DROP FUNCTION IF EXISTS notify_event_change();"
+
+
+def create_triggers() -> list[str]:
+    return [
+        f"CREATE TRIGGER {table}_event_changes "
+        f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION notify_event_change('{column}');"
+        for table, column in EVENT_CHANGES_TABLES.items()
+    ]
+
+
+def drop_triggers() -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS {table}_event_changes ON {table};"
+        for table in EVENT_CHANGES_TABLES
+    ]
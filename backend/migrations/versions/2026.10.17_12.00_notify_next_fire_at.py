@@ -0,0 +1,152 @@
+"""notify next_fire_at
+
+Revision ID: 2026.10.17_12.00
+Revises: 2025.11.15_05.10
+Create Date: 2026-10-17 12:00:21.204118
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, time, timedelta
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026.10.17_12.00"
+down_revision: str | None = "2025.11.15_05.10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# замороженная копия расчёта на момент миграции: код приложения
+# может меняться, а уже написанная миграция - нет. Поэтому здесь свой
+# простой разбор крона без зависимостей, а не maxhack.core.cron
+
+# (минимум, максимум) для минут, часов, дня месяца, месяца и дня недели
+_FIELD_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun")
+_MONTHS += ("jul", "aug", "sep", "oct", "nov", "dec")
+_WEEKDAYS = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+_NAMES = {name: number for number, name in enumerate(_MONTHS, start=1)} | {
+    name: number for number, name in enumerate(_WEEKDAYS)
+}
+# самый редкий валидный крон ("0 0 29 2 *") срабатывает раз в 8 лет
+_HORIZON = timedelta(days=366 * 8 + 1)
+
+
+def _value(token: str) -> int:
+    return _NAMES[token] if token in _NAMES else int(token)
+
+
+def _parse_field(field: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for part in field.lower().split(","):
+        bounds, _, step = part.partition("/")
+        if bounds in {"*", "?"}:
+            start, stop = low, high
+        elif "-" in bounds:
+            first, last = bounds.split("-")
+            start, stop = _value(first), _value(last)
+        else:
+            start = _value(bounds)
+            stop = high if step else start
+        every = int(step) if step else 1
+        if every <= 0 or not low <= start <= stop <= high:
+            raise ValueError(field)
+        values.update(range(start, stop + 1, every))
+    return values
+
+
+def _next_occurrence(cron: str, after: datetime) -> datetime | None:
+    """Ближайшее срабатывание крона (в UTC) строго позже ``after``."""
+    fields = cron.split()
+    if len(fields) != len(_FIELD_BOUNDS):
+        raise ValueError(cron)
+    minutes, hours, days, months, weekdays = (
+        sorted(_parse_field(field, low, high))
+        for field, (low, high) in zip(fields, _FIELD_BOUNDS, strict=True)
+    )
+    weekdays = [weekday % 7 for weekday in weekdays]
+    # если ограничены и день месяца, и день недели - достаточно любого из них
+    day_or = not fields[2].startswith("*") and not fields[4].startswith("*")
+
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    day = start.date()
+    while day <= start.date() + _HORIZON:
+        dom = day.day in days
+        dow = day.isoweekday() % 7 in weekdays
+        if day.month in months and ((dom or dow) if day_or else (dom and dow)):
+            for hour in hours:
+                for minute in minutes:
+                    moment = datetime.combine(day, time(hour, minute), tzinfo=UTC)
+                    if moment >= start:
+                        return moment
+        day += timedelta(days=1)
+    return None
+
+
+def _next_fire_at(cron: str, minutes_before: int, after: datetime) -> datetime | None:
+    shift = timedelta(minutes=minutes_before)
+    try:
+        occurrence = _next_occurrence(cron, after + shift)
+    except ValueError:
+        return None
+    if occurrence is None:
+        return None
+    return occurrence - shift
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column(
+        "events_notifies",
+        sa.Column("next_fire_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_events_notifies_next_fire_at"),
+        "events_notifies",
+        ["next_fire_at"],
+        unique=False,
+        postgresql_where="events_notifies.deleted_at IS NULL",
+    )
+    # ### end Alembic commands ###
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            """
+            SELECT events_notifies.id, events_notifies.minutes_before, events.cron
+            FROM events_notifies
+            JOIN events ON events.id = events_notifies.event_id
+            WHERE events_notifies.deleted_at IS NULL
+              AND events.deleted_at IS NULL
+              AND events.event_happened IS FALSE
+            """,
+        ),
+    ).all()
+
+    now = datetime.now(UTC)
+    values = [
+        {"id": notify_id, "next_fire_at": _next_fire_at(cron, minutes_before, now)}
+        for notify_id, minutes_before, cron in rows
+    ]
+    if values:
+        connection.execute(
+            sa.text(
+                "UPDATE events_notifies SET next_fire_at = :next_fire_at "
+                "WHERE id = :id",
+            ),
+            values,
+        )
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(
+        op.f("ix_events_notifies_next_fire_at"),
+        table_name="events_notifies",
+        postgresql_where="events_notifies.deleted_at IS NULL",
+    )
+    op.drop_column("events_notifies", "next_fire_at")
+    # ### end Alembic commands ###
@@ -0,0 +1,36 @@
+"""event changes feed
+
+Revision ID: 2026.10.17_12.40
+Revises: 2026.10.17_12.30
+Create Date: 2026-10-17 12:40:07.518342
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+from migrations.triggers.event_changes import (
+    CREATE_FUNCTION,
+    DROP_FUNCTION,
+    create_triggers,
+    drop_triggers,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "2026.10.17_12.40"
+down_revision: str | None = "2026.10.17_12.30"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(CREATE_FUNCTION)
+    for statement in create_triggers():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in drop_triggers():
+        op.execute(statement)
+    op.execute(DROP_FUNCTION)
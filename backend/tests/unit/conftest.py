@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reinit_database() -> None:
+    """Юнит-тестам база не нужна, перекрываем фикстуру из корневого conftest."""
@@ -0,0 +1,61 @@
+from datetime import UTC, datetime
+
+from maxhack.config import SchedulerConfig
+from maxhack.core.agenda.service import AgendaService
+from maxhack.core.cron import CronExpander, CronTable
+from maxhack.core.cron.table import to_minutes
+from maxhack.core.ids import UserId
+from maxhack.database.models import UserModel
+
+
+def _service(spread: int = 0) -> AgendaService:
+    config = SchedulerConfig(agenda_hour=8, agenda_spread_minutes=spread)
+    return AgendaService(
+        agenda_repo=None,  # type: ignore[arg-type]
+        cron_expander=CronExpander(workers=1),
+        scheduler_config=config,
+    )
+
+
+class TestAgenda:
+    def test_slot_follows_user_timezone(self) -> None:
+        """Сводка уходит в 8 утра по времени пользователя"""
+        now = datetime(2026, 10, 17, 4, 0, tzinfo=UTC)
+        service = _service()
+
+        moscow = UserModel(id=UserId(1), timezone=180)
+        new_york = UserModel(id=UserId(2), timezone=-300)
+
+        # в Москве уже 7:00 - сводка сегодня в 5:00 UTC
+        assert service.agenda_slot(moscow, now) == (
+            datetime(2026, 10, 17, tzinfo=UTC).date(),
+            datetime(2026, 10, 17, 5, 0, tzinfo=UTC),
+        )
+        # в Нью-Йорке ещё 16 октября, 23:00
+        assert service.agenda_slot(new_york, now) == (
+            datetime(2026, 10, 17, tzinfo=UTC).date(),
+            datetime(2026, 10, 17, 13, 0, tzinfo=UTC),
+        )
+
+    def test_slot_moves_to_next_day_after_morning(self) -> None:
+        now = datetime(2026, 10, 17, 6, 0, tzinfo=UTC)
+        day, send_at = _service(spread=30).agenda_slot(
+            UserModel(id=UserId(1), timezone=180),
+            now,
+        )
+
+        assert day == datetime(2026, 10, 18, tzinfo=UTC).date()
+        assert (
+            datetime(2026, 10, 18, 5, 0, tzinfo=UTC)
+            <= send_at
+            <= datetime(2026, 10, 18, 5, 30, tzinfo=UTC)
+        )
+
+    async def test_day_occurrences(self) -> None:
+        left = datetime(2026, 10, 17, 0, 0, tzinfo=UTC)
+        table = CronTable.from_expressions(["0 */6 * * *"])
+
+        _, moments = await CronExpander(workers=1).fire_times(table, left, 24 * 60)
+
+        hours = [(moment - to_minutes(left)) // 60 for moment in moments]
+        assert hours == [0, 6, 12, 18]
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime, timedelta
+
+from maxhack.core.event.coalesce import coalesce_notifications
+from maxhack.core.event.models import EventNotification
+from maxhack.core.ids import EventId, EventNotifyId, NotifyDeliveryId, UserId
+from maxhack.database.models import EventModel, UserModel
+
+_NOW = datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+
+
+def _notification(
+    notify_id: int,
+    event_id: int,
+    users: list[UserModel],
+    starts_in: int = 60,
+) -> EventNotification:
+    notification = EventNotification(
+        notify_id=EventNotifyId(notify_id),
+        occurrence_at=_NOW,
+        starts_at=_NOW + timedelta(minutes=starts_in),
+        event=EventModel(id=EventId(event_id), title=f"Событие {event_id}"),
+    )
+    for user in users:
+        notification.recipients.append((user, None))
+        notification.deliveries[user.id] = NotifyDeliveryId(notify_id * 100 + user.id)
+    return notification
+
+
+class TestCoalesceNotifications:
+    def test_one_message_per_user(self) -> None:
+        """Получатель нескольких напоминаний тика получает одно сообщение"""
+        alice, bob = UserModel(id=UserId(1)), UserModel(id=UserId(2))
+        notifications = [
+            _notification(1, 10, [alice, bob]),
+            _notification(2, 20, [alice], starts_in=5),
+            # второе напоминание о том же событии не повторяет его в сообщении
+            _notification(3, 10, [alice], starts_in=0),
+        ]
+
+        digests = coalesce_notifications(notifications, max_events=5)
+
+        by_user = {digest.user.id: digest for digest in digests}
+        assert len(digests) == 2
+        assert [event.id for event, _ in by_user[1].events] == [10, 20]
+        assert by_user[1].deliveries == [101, 201, 301]
+        assert by_user[1].starts_at == _NOW
+        assert [event.id for event, _ in by_user[2].events] == [10]
+
+    def test_events_per_message_are_capped(self) -> None:
+        alice = UserModel(id=UserId(1))
+        notifications = [_notification(i, i, [alice]) for i in range(1, 6)]
+
+        digests = coalesce_notifications(notifications, max_events=2)
+
+        assert [len(digest.events) for digest in digests] == [2, 2, 1]
@@ -0,0 +1,175 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from croniter import croniter
+
+from maxhack.core.cron import CronExpander, CronTable, InvalidCron, compile_cron
+from maxhack.core.utils.cron import next_fire_at
+
+
+def _random_expression(rnd: random.Random) -> str:
+    minute, hour = rnd.randint(0, 59), rnd.randint(0, 23)
+    day, month, weekday = rnd.randint(1, 28), rnd.randint(1, 12), rnd.randint(0, 6)
+    return rnd.choice(
+        [
+            f"{minute} {hour} * * *",
+            f"{minute} {hour} * * {weekday}",
+            f"{minute} {hour} {day} * *",
+            f"{minute} {hour} {day} {month} *",
+            f"*/7 {hour}-{min(hour + 2, 23)} * * 1-5",
+        ],
+    )
+
+
+class TestCompiledCron:
+    """Тесты для скомпилированного крона."""
+
+    def test_next_after_same_as_croniter(self) -> None:
+        """Следующее срабатывание совпадает с croniter."""
+        rnd = random.Random(42)
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        for _ in range(2000):
+            expression = _random_expression(rnd)
+            moment = start + timedelta(
+                minutes=rnd.randint(0, 10**6),
+                seconds=rnd.randint(0, 59),
+            )
+            expected = croniter(expression, moment).get_next(datetime)
+            assert compile_cron(expression).next_after(moment) == expected
+
+    def test_next_after_is_strict(self) -> None:
+        """Срабатывание ровно в переданный момент не учитывается."""
+        cron = compile_cron("0 9 * * *")
+        moment = datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+        assert cron.next_after(moment) == moment + timedelta(days=1)
+
+    def test_next_after_leap_day(self) -> None:
+        """29 февраля находится даже через несколько лет."""
+        cron = compile_cron("30 12 29 2 *")
+        moment = datetime(2026, 10, 17, tzinfo=UTC)
+        assert cron.next_after(moment) == datetime(2028, 2, 29, 12, 30, tzinfo=UTC)
+
+    def test_never_fires(self) -> None:
+        """Для несуществующей даты срабатываний нет."""
+        assert compile_cron("0 0 31 2 *").next_after(datetime.now(UTC)) is None
+
+    def test_occurrences(self) -> None:
+        """Срабатывания перечисляются в полуинтервале (after, until]."""
+        cron = compile_cron("15 10 * * *")
+        after = datetime(2026, 10, 17, 10, 15, tzinfo=UTC)
+        until = after + timedelta(days=3)
+        assert list(cron.occurrences(after, until)) == [
+            after + timedelta(days=1),
+            after + timedelta(days=2),
+            after + timedelta(days=3),
+        ]
+
+    @pytest.mark.parametrize(
+        "expression",
+        ["", "* * * *", "60 * * * *", "0 24 * * *", "0 0 0 * *", "*/0 * * * *"],
+    )
+    def test_invalid(self, expression: str) -> None:
+        """Некорректные выражения отклоняются."""
+        with pytest.raises(InvalidCron):
+            compile_cron(expression)
+
+    def test_next_fire_at_shifts_by_minutes_before(self) -> None:
+        """Напоминание приходит за minutes_before до события."""
+        after = datetime(2026, 10, 17, 8, 30, tzinfo=UTC)
+        assert next_fire_at("0 9 * * *", 60, after) == datetime(
+            2026,
+            10,
+            18,
+            8,
+            0,
+            tzinfo=UTC,
+        )
+        assert next_fire_at("0 9 * * *", 15, after) == datetime(
+            2026,
+            10,
+            17,
+            8,
+            45,
+            tzinfo=UTC,
+        )
+
+
+class TestCronTable:
+    """Тесты для векторизованной проверки кронов."""
+
+    def test_matches_same_as_compiled(self) -> None:
+        """Векторная проверка совпадает с поштучной."""
+        rnd = random.Random(7)
+        expressions = [_random_expression(rnd) for _ in range(500)]
+        expressions += ["0 12 13 * 5", "*/15 * * * *"]
+        table = CronTable.from_expressions(expressions)
+        start = datetime(2026, 10, 17, 6, 0, tzinfo=UTC)
+
+        for offset in range(0, 3 * 24 * 60, 37):
+            moment = start + timedelta(minutes=offset)
+            minutes = int(moment.timestamp()) // 60
+            expected = [compile_cron(e).matches(moment) for e in expressions]
+            assert table.matches(minutes).tolist() == expected
+
+    def test_fired_between_with_shift(self) -> None:
+        """Окно [left, right) сдвигается на minutes_before каждого крона."""
+        table = CronTable.from_expressions(
+            ["0 9 * * *", "0 9 * * *", "0 10 * * *", "5 8 * * *"],
+        )
+        left = datetime(2026, 10, 17, 8, 0, tzinfo=UTC)
+        right = left + timedelta(minutes=5)
+        fired = table.fired_between(left, right, np.array([60, 0, 120, 0]))
+        assert fired.tolist() == [True, False, True, False]
+
+    def test_fire_counts(self) -> None:
+        """Гистограмма по минутам суммирует веса сработавших кронов."""
+        table = CronTable.from_expressions(["0 9 * * *", "0 9 * * *", "2 8 * * *"])
+        left = datetime(2026, 10, 17, 8, 0, tzinfo=UTC)
+        counts = table.fire_counts(
+            left,
+            4,
+            shift_minutes=np.array([60, 61, 0]),
+            weights=np.array([3, 5, 7]),
+        )
+        assert counts.tolist() == [3, 0, 7, 0]
+
+    def test_fire_times_with_own_left(self) -> None:
+        """У каждого крона своё окно: сутки в поясе своего получателя."""
+        table = CronTable.from_expressions(["0 9 * * *", "0 9 * * *", "0 */12 * * *"])
+        left = datetime(2026, 10, 17, 0, 0, tzinfo=UTC)
+        own_left = np.array([0, -180, 0]) + int(left.timestamp()) // 60
+        rows, moments = table.fire_times(own_left, 24 * 60)
+        fired = sorted(
+            (int(row), datetime.fromtimestamp(int(moment) * 60, UTC).hour)
+            for row, moment in zip(rows, moments, strict=True)
+        )
+        assert fired == [(0, 9), (1, 9), (2, 0), (2, 12)]
+
+
+class TestCronExpander:
+    """Тесты раскрытия кронов в пуле процессов."""
+
+    async def test_pool_matches_in_process(self) -> None:
+        """Результат по частям в процессах совпадает с подсчётом на месте."""
+        rnd = random.Random(11)
+        table = CronTable.from_expressions(_random_expression(rnd) for _ in range(300))
+        shift = np.array([rnd.randrange(120) for _ in range(300)])
+        left = datetime(2026, 10, 17, 6, 0, tzinfo=UTC)
+
+        expander = CronExpander(workers=2, threshold=0)
+        try:
+            counts = await expander.fire_counts(table, left, 180, shift)
+            rows, moments = await expander.fire_times(table, left, 180)
+        finally:
+            expander.close()
+
+        assert counts.tolist() == table.fire_counts(left, 180, shift).tolist()
+        expected_rows, expected_moments = table.fire_times(
+            int(left.timestamp()) // 60,
+            180,
+        )
+        assert sorted(zip(rows.tolist(), moments.tolist(), strict=True)) == sorted(
+            zip(expected_rows.tolist(), expected_moments.tolist(), strict=True),
+        )
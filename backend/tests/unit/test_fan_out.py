@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from maxhack.core.utils.fan_out import FanOutChunk, fan_out
+
+
+class TestFanOut:
+    async def test_concurrency_is_bounded(self) -> None:
+        """Одновременно работает не больше ``workers`` обработчиков"""
+        running = peak = 0
+
+        async def handler(_: int) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+        stats = await fan_out(range(1000), handler, workers=8, chunk_size=100)
+
+        assert stats.done == 1000
+        assert peak == 8
+
+    async def test_items_are_consumed_lazily(self) -> None:
+        """Итератор не вычитывается сильно раньше обработки"""
+        taken = handled = 0
+        lead = 0
+
+        def items() -> Iterator[int]:
+            nonlocal taken
+            for i in range(1000):
+                taken += 1
+                yield i
+
+        async def handler(_: int) -> None:
+            nonlocal handled, lead
+            lead = max(lead, taken - handled)
+            await asyncio.sleep(0)
+            handled += 1
+
+        await fan_out(items(), handler, workers=4, chunk_size=50)
+
+        # очередь на workers * 2 плюс по элементу в каждом воркере и у продюсера
+        assert lead <= 4 * 3 + 1
+
+    async def test_failures_are_accounted_per_chunk(self) -> None:
+        """Ошибки не останавливают рассылку и попадают в свой чанк"""
+        chunks: list[FanOutChunk[int]] = []
+
+        async def handler(item: int) -> None:
+            if item % 10 == 0:
+                raise RuntimeError(item)
+
+        async def on_chunk(chunk: FanOutChunk[int]) -> None:
+            chunks.append(chunk)
+
+        stats = await fan_out(
+            range(95),
+            handler,
+            workers=3,
+            chunk_size=20,
+            on_chunk=on_chunk,
+        )
+
+        assert (stats.done, stats.failed, stats.chunks) == (85, 10, 5)
+        assert [len(chunk) for chunk in chunks] == [20, 20, 20, 20, 15]
+        assert sorted(i for chunk in chunks for i in chunk.failed) == list(
+            range(0, 95, 10),
+        )
+
+    async def test_on_chunk_error_stops_fan_out(self) -> None:
+        """Если прогресс не сохранить, рассылка останавливается"""
+        handled = 0
+
+        async def handler(_: int) -> None:
+            nonlocal handled
+            handled += 1
+
+        async def on_chunk(_: FanOutChunk[int]) -> None:
+            msg = "db is down"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError, match="db is down"):
+            await fan_out(
+                range(10_000),
+                handler,
+                workers=2,
+                chunk_size=10,
+                on_chunk=on_chunk,
+            )
+
+        assert handled < 100
@@ -0,0 +1,44 @@
+from datetime import UTC, datetime, timedelta
+
+from maxhack.core.event.fire_table import NotifyFireTable
+from maxhack.core.ids import EventId, EventNotifyId
+from maxhack.core.utils.shard_leases import ShardSet
+
+NOW = datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+
+
+def _row(
+    notify_id: int,
+    event_id: int,
+    minutes: int,
+) -> tuple[EventNotifyId, EventId, datetime]:
+    return EventNotifyId(notify_id), EventId(event_id), NOW + timedelta(minutes=minutes)
+
+
+class TestNotifyFireTable:
+    def test_has_due(self) -> None:
+        """Наступившее напоминание находится с учётом шардов"""
+        table = NotifyFireTable()
+        table.replace([_row(1, 10, 5), _row(2, 11, -1)])
+
+        assert len(table) == 2
+        assert table.has_due(NOW)
+        assert not table.has_due(NOW - timedelta(minutes=2))
+        assert table.has_due(NOW, ShardSet(total=2, owned=frozenset({1})))
+        assert not table.has_due(NOW, ShardSet(total=2, owned=frozenset({0})))
+
+    def test_replace_only_changed_events(self) -> None:
+        """Перечитанные события заменяют только свои напоминания"""
+        table = NotifyFireTable()
+        table.replace([_row(1, 10, 5), _row(2, 11, -1), _row(3, 11, 30)])
+
+        # у события 11 удалили наступившее напоминание
+        table.replace([_row(3, 11, 30)], {EventId(11)})
+        assert len(table) == 2
+        assert not table.has_due(NOW)
+
+        # событие 12 появилось, событие 10 удалили
+        table.replace([_row(4, 12, 0)], {EventId(10), EventId(12)})
+        assert len(table) == 2
+        assert table.has_due(NOW)
+        assert table.nbytes == 2 * 3 * 8
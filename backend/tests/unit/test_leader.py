@@ -0,0 +1,35 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from maxhack.scheduler.leader import LeaderLease
+
+
+def _leader(redis: FakeAsyncRedis) -> LeaderLease:
+    return LeaderLease(redis=redis, key="test:leader", lease=0.2)  # type: ignore[arg-type]
+
+
+class TestLeaderLease:
+    async def test_single_leader_and_failover(self) -> None:
+        """Лидер один; если он перестал продлевать аренду, лидером становится другой"""
+        redis = FakeAsyncRedis()
+        first, second = _leader(redis), _leader(redis)
+
+        assert await first.heartbeat()
+        assert not await second.heartbeat()
+        assert await first.heartbeat()
+
+        await asyncio.sleep(0.25)
+        assert not first.is_leader
+        assert await second.heartbeat()
+        assert not await first.heartbeat()
+
+    async def test_release_hands_leadership_over(self) -> None:
+        redis = FakeAsyncRedis()
+        first, second = _leader(redis), _leader(redis)
+        await first.heartbeat()
+
+        await first.release()
+
+        assert not first.is_leader
+        assert await second.heartbeat()
@@ -0,0 +1,58 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from maxhack.core.enums.notify_mode import NotifyMode
+from maxhack.core.ids import EventId, MaxChatId, UserId
+from maxhack.core.max.notifier import MaxNotifier, NotifyRenders
+from maxhack.database.models import EventModel, UserModel
+
+_NOW = datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+
+
+class _Sender:
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+
+    async def send_message(self, **kwargs: Any) -> None:
+        self.sent.append(kwargs)
+
+
+def _user(user_id: int) -> UserModel:
+    return UserModel(
+        id=UserId(user_id),
+        max_chat_id=MaxChatId(user_id),
+        notify_mode=NotifyMode.DEFAULT,
+    )
+
+
+class TestMaxNotifier:
+    async def test_render_once_per_mailing(self) -> None:
+        """Получатели одних событий делят одно сообщение и одну клавиатуру"""
+        sender = _Sender()
+        notifier = MaxNotifier(sender)  # type: ignore[arg-type]
+        planning = EventModel(id=EventId(1), title="Планёрка")
+        review = EventModel(id=EventId(2), title="Ревью")
+        renders: NotifyRenders = {}
+
+        messages = [
+            notifier.event_notify_message(user, events, _NOW, renders)
+            for user, events in [
+                (_user(1), [(planning, None)]),
+                (_user(2), [(planning, None)]),
+                (_user(3), [(planning, None), (review, None)]),
+            ]
+        ]
+        assert len(renders) == 2
+        first, second, third = messages
+        assert first is not None
+        assert second is not None
+        assert third is not None
+        assert first.keyboard is second.keyboard
+        assert first.keyboard is not third.keyboard
+        assert [first.chat_id, second.chat_id] == [1, 2]
+
+        for message in messages:
+            await notifier.send(message)  # type: ignore[arg-type]
+        attachments = [kwargs["attachments"][0] for kwargs in sender.sent]
+        assert attachments[0] is attachments[1]
+        assert attachments[0] is not attachments[2]
@@ -0,0 +1,59 @@
+from datetime import UTC, datetime, timedelta
+
+from maxhack.config import SchedulerConfig
+from maxhack.core.event.planner import NotifyPlanner
+from maxhack.core.ids import EventId
+
+_NOW = datetime(2026, 10, 17, 6, 30, tzinfo=UTC)
+_DAILY = "0 9 * * *"
+
+
+def _planner() -> NotifyPlanner:
+    return NotifyPlanner(SchedulerConfig(spread_ratio=0.1, spread_max_minutes=15))
+
+
+class TestNotifyPlanner:
+    def test_start_notify_is_exact(self) -> None:
+        """Напоминание о начале события не сдвигается"""
+        fire_at = _planner().fire_at(_DAILY, EventId(1), 0, _NOW)
+        assert fire_at == datetime(2026, 10, 17, 9, 0, tzinfo=UTC)
+
+    def test_early_notifies_are_spread(self) -> None:
+        """Напоминания за час о событиях в 9:00 расходятся по окну в 6 минут"""
+        planner = _planner()
+        nominal = datetime(2026, 10, 17, 8, 0, tzinfo=UTC)
+        fires = {
+            planner.fire_at(_DAILY, EventId(event_id), 60, _NOW)
+            for event_id in range(1, 200)
+        }
+
+        assert all(
+            nominal - timedelta(minutes=6) <= fire_at <= nominal  # type: ignore[operator]
+            for fire_at in fires
+        )
+        assert len(fires) == 7
+
+    def test_next_after_early_fire(self) -> None:
+        """Рано сработавшее напоминание в следующий раз сработает завтра"""
+        planner = _planner()
+        event_id = next(i for i in range(1, 100) if planner.offset(EventId(i), 60))
+        fired_at = planner.fire_at(_DAILY, EventId(event_id), 60, _NOW)
+        assert fired_at is not None
+
+        next_fire = planner.next_fire_at(
+            _DAILY,
+            EventId(event_id),
+            60,
+            fired_at,
+            now=fired_at,
+        )
+
+        assert next_fire == fired_at + timedelta(days=1)
+        assert planner.starts_at(_DAILY, 60, fired_at) == datetime(
+            2026,
+            10,
+            17,
+            9,
+            0,
+            tzinfo=UTC,
+        )
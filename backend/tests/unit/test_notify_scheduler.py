@@ -0,0 +1,87 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from taskiq import InMemoryBroker, ScheduledTask
+from taskiq.abc.schedule_source import ScheduleSource
+
+from maxhack.core.ids import EventNotifyId
+from maxhack.scheduler.base_client import BaseSchedulerClient
+from maxhack.scheduler.notify_scheduler import (
+    FIRE_NOTIFY_TASK,
+    AfterCommitNotifyScheduler,
+    TaskiqNotifyScheduler,
+)
+
+
+class _MemorySource(ScheduleSource):
+    def __init__(self) -> None:
+        self.schedules: dict[str, ScheduledTask] = {}
+
+    async def get_schedules(self) -> list[ScheduledTask]:
+        return list(self.schedules.values())
+
+    async def add_schedule(self, schedule: ScheduledTask) -> None:
+        self.schedules[schedule.schedule_id] = schedule
+
+    async def delete_schedule(self, schedule_id: str) -> None:
+        self.schedules.pop(schedule_id, None)
+
+
+def _scheduler() -> tuple[TaskiqNotifyScheduler, _MemorySource]:
+    source = _MemorySource()
+    client = BaseSchedulerClient(InMemoryBroker(), source)
+    return TaskiqNotifyScheduler(client), source
+
+
+class TestTaskiqNotifyScheduler:
+    async def test_one_task_per_occurrence(self) -> None:
+        """Повторная постановка того же срабатывания не дублирует задачу"""
+        scheduler, source = _scheduler()
+        fire_at = datetime(2026, 10, 17, 12, 0, 30, tzinfo=UTC)
+
+        await scheduler.schedule({EventNotifyId(1): fire_at, EventNotifyId(2): None})
+        await scheduler.schedule({EventNotifyId(1): fire_at})
+
+        [task] = source.schedules.values()
+        assert task.task_name == FIRE_NOTIFY_TASK
+        assert task.kwargs == {"notify_id": 1}
+        assert task.time == fire_at
+
+    async def test_reschedule_replaces_old_occurrence(self) -> None:
+        """Изменение времени снимает задачу на старое срабатывание"""
+        scheduler, source = _scheduler()
+        old = datetime(2026, 10, 17, 12, 0, tzinfo=UTC)
+        new = old + timedelta(hours=1)
+
+        await scheduler.schedule({EventNotifyId(1): old})
+        await scheduler.unschedule({EventNotifyId(1): old})
+        await scheduler.schedule({EventNotifyId(1): new})
+
+        assert [task.time for task in source.schedules.values()] == [new]
+
+
+class TestAfterCommitNotifyScheduler:
+    async def test_waits_for_commit(self) -> None:
+        """Задачи ставятся только после фиксации, откат их отбрасывает"""
+        scheduler, source = _scheduler()
+        session = AsyncSession()
+        deferred = AfterCommitNotifyScheduler(session, scheduler)
+        dispatch = session.sync_session.dispatch
+        old = datetime(2026, 10, 17, 12, 0, tzinfo=UTC)
+        new = old + timedelta(hours=1)
+        await scheduler.schedule({EventNotifyId(1): old})
+
+        await deferred.unschedule({EventNotifyId(1): old})
+        await deferred.schedule({EventNotifyId(1): new})
+        dispatch.after_rollback(session.sync_session)
+        dispatch.after_commit(session.sync_session)
+        await asyncio.sleep(0.01)
+        assert [task.time for task in source.schedules.values()] == [old]
+
+        await deferred.unschedule({EventNotifyId(1): old})
+        await deferred.schedule({EventNotifyId(1): new})
+        assert [task.time for task in source.schedules.values()] == [old]
+        dispatch.after_commit(session.sync_session)
+        await asyncio.sleep(0.01)
+        assert [task.time for task in source.schedules.values()] == [new]
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import UTC, datetime
+
+import orjson
+from fakeredis import FakeAsyncRedis
+
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.ids import MaxChatId
+from maxhack.core.max.outbox import MaxOutbox, OutboundMessage
+from maxhack.core.max.sender import MaxSendError
+
+
+def _outbox(
+    redis: FakeAsyncRedis,
+    claim_idle: float = 60,
+    max_deliveries: int = 5,
+) -> MaxOutbox:
+    return MaxOutbox(
+        redis=redis,  # type: ignore[arg-type]
+        key="test:outbox",
+        batch_size=10,
+        claim_idle=claim_idle,
+        workers=2,
+        max_deliveries=max_deliveries,
+    )
+
+
+def _message(chat_id: int) -> OutboundMessage:
+    return OutboundMessage(
+        chat_id=MaxChatId(chat_id),
+        text=f"Напоминание {chat_id}",
+        keyboard=[[("✅ Буду", "respond:1:ok")]],
+        starts_at=datetime(2026, 10, 17, 9, 0, tzinfo=UTC),
+    )
+
+
+class TestMaxOutbox:
+    async def test_enqueued_messages_are_sent_once(self) -> None:
+        """Отправленные сообщения подтверждаются и удаляются из стрима"""
+        redis = FakeAsyncRedis()
+        outbox = _outbox(redis)
+        sent: list[OutboundMessage] = []
+
+        async def send(message: OutboundMessage) -> None:
+            sent.append(message)
+
+        assert await outbox.enqueue(_message(i) for i in range(3)) == 3
+        assert await outbox.drain(send) == 3
+        assert await outbox.drain(send) == 0
+
+        assert sorted(sent, key=lambda m: m.chat_id) == [_message(i) for i in range(3)]
+        assert sent[0].priority == SendPriority.REMINDER
+        assert await redis.xlen("test:outbox") == 0
+
+    async def test_crashed_sender_messages_are_reclaimed(self) -> None:
+        """Неподтверждённые сообщения упавшего отправителя достаются другому"""
+        redis = FakeAsyncRedis()
+        outbox = _outbox(redis, claim_idle=0.01)
+        sent: list[OutboundMessage] = []
+
+        async def send(message: OutboundMessage) -> None:
+            sent.append(message)
+
+        assert await outbox.drain(send) == 0
+        await outbox.enqueue([_message(1), _message(2)])
+        # другой отправитель забрал пачку и упал, не подтвердив её
+        await redis.xreadgroup("test:outbox:senders", "crashed", {"test:outbox": ">"})
+        assert await outbox.drain(send) == 0
+
+        await asyncio.sleep(0.02)
+        assert await outbox.drain(send) == 2
+        assert {m.chat_id for m in sent} == {1, 2}
+        assert await redis.xlen("test:outbox") == 0
+
+    async def test_failed_send_is_retried(self) -> None:
+        """Сообщение, не отправленное из-за временной ошибки, остаётся в очереди"""
+        redis = FakeAsyncRedis()
+        outbox = _outbox(redis, claim_idle=0.01)
+        sent: list[OutboundMessage] = []
+        failures = 1
+
+        async def send(message: OutboundMessage) -> None:
+            nonlocal failures
+            if message.chat_id == 2 and failures:
+                failures -= 1
+                raise MaxSendError
+            sent.append(message)
+
+        await outbox.enqueue([_message(1), _message(2)])
+        assert await outbox.drain(send) == 2
+        assert [m.chat_id for m in sent] == [1]
+        assert await redis.xlen("test:outbox") == 1
+
+        await asyncio.sleep(0.02)
+        assert await outbox.drain(send) == 1
+        assert [m.chat_id for m in sent] == [1, 2]
+        assert await redis.xlen("test:outbox") == 0
+
+    async def test_undeliverable_message_is_dead_lettered(self) -> None:
+        """После ``max_deliveries`` попыток сообщение уходит в стрим недоставленных"""
+        redis = FakeAsyncRedis()
+        outbox = _outbox(redis, claim_idle=0.01, max_deliveries=3)
+        attempts = 0
+
+        async def send(_message: OutboundMessage) -> None:
+            nonlocal attempts
+            attempts += 1
+            raise MaxSendError
+
+        await outbox.enqueue([_message(1)])
+        for _ in range(3):
+            assert await outbox.drain(send) == 1
+            await asyncio.sleep(0.02)
+        assert await outbox.drain(send) == 0
+
+        assert attempts == 3
+        assert await redis.xlen("test:outbox") == 0
+        assert await redis.xpending("test:outbox", "test:outbox:senders") == {
+            "pending": 0,
+            "min": None,
+            "max": None,
+            "consumers": [],
+        }
+        [(_, fields)] = await redis.xrange("test:outbox:dead")
+        assert orjson.loads(fields[b"message"])["chat_id"] == 1
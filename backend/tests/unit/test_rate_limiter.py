@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from maxhack.core.utils.rate_limiter import RateLimitError, RateLimiter
+
+
+class TestRateLimiter:
+    async def test_burst_passes_without_waiting(self) -> None:
+        """Первые ``burst`` вызовов проходят сразу"""
+        limiter = RateLimiter(max_calls=5, period=10, burst=5)
+
+        started = time.monotonic()
+        for _ in range(5):
+            async with limiter:
+                pass
+
+        assert time.monotonic() - started < 0.05
+        assert limiter.stats.max_wait == 0
+
+    async def test_rate_is_respected(self) -> None:
+        """После бёрста вызовы идут не чаще ``max_calls`` за ``period``"""
+        limiter = RateLimiter(max_calls=100, period=0.5, burst=1)
+        moments: list[float] = []
+
+        async def call() -> None:
+            async with limiter:
+                moments.append(time.monotonic())
+
+        await asyncio.gather(*(call() for _ in range(50)))
+
+        assert moments[-1] - moments[0] >= 49 * 0.005 * 0.95
+
+    @pytest.mark.parametrize("burst", [1, 4, 10])
+    def test_at_most_max_calls_per_period(
+        self,
+        burst: int,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """В любое окно ``period`` попадает не больше ``max_calls`` вызовов"""
+        monkeypatch.setattr(time, "monotonic", lambda: 100.0)
+        limiter = RateLimiter(max_calls=10, period=1.0, burst=burst)
+
+        moments = [100.0 + limiter.reserve() for _ in range(30)]
+
+        busiest = max(
+            sum(start <= moment < start + 1.0 - 1e-9 for moment in moments)
+            for start in moments
+        )
+        assert busiest <= 10
+        assert moments[:burst] == [100.0] * burst
+
+    async def test_fifo_order(self) -> None:
+        """Вызовы получают слоты в порядке прихода"""
+        limiter = RateLimiter(max_calls=1000, period=1, burst=1)
+        order: list[int] = []
+
+        async def call(i: int) -> None:
+            async with limiter:
+                order.append(i)
+
+        await asyncio.gather(*(call(i) for i in range(200)))
+
+        assert order == list(range(200))
+        assert limiter.stats.acquired == 200
+        assert limiter.stats.waiting == 0
+
+    async def test_cancelled_waiter_returns_slot(self) -> None:
+        """Отменённый вызов не съедает слот следующего"""
+        limiter = RateLimiter(max_calls=1, period=0.2)
+        async with limiter:
+            pass
+
+        async def call() -> None:
+            async with limiter:
+                pass
+
+        task = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        assert limiter.stats.waiting == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert limiter.reserve() == pytest.approx(0.2, abs=0.05)
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(RateLimitError):
+            RateLimiter(max_calls=0)
+        with pytest.raises(RateLimitError):
+            RateLimiter(max_calls=1, period=0)
+        with pytest.raises(RateLimitError):
+            RateLimiter(max_calls=1, burst=0)
+        with pytest.raises(RateLimitError):
+            RateLimiter(max_calls=1, burst=2)
@@ -0,0 +1,58 @@
+from typing import Any
+
+import pytest
+
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.max.sender import MaxSendError, MaxSender
+
+
+class _Throttled(Exception):
+    status_code = 429
+    retry_after = 0
+
+
+class _Bot:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def send_message(self, **_: Any) -> None:
+        self.calls += 1
+        raise self.error
+
+
+class _RateLimiter:
+    async def acquire(self, priority: SendPriority) -> None:
+        pass
+
+    async def throttled(self, retry_after: float) -> None:
+        pass
+
+
+def _sender(bot: _Bot) -> MaxSender:
+    return MaxSender(
+        bot=bot,  # type: ignore[arg-type]
+        bg_factory=None,  # type: ignore[arg-type]
+        rate_limiter=_RateLimiter(),  # type: ignore[arg-type]
+        unreachable=None,  # type: ignore[arg-type]
+    )
+
+
+class TestMaxSender:
+    async def test_transient_error(self) -> None:
+        """Временная ошибка пробрасывается рассылке и только логируется в ответах"""
+        bot = _Bot(ConnectionError("сеть"))
+        sender = _sender(bot)
+
+        assert await sender.send_message("текст", 1) is None
+        with pytest.raises(MaxSendError):
+            await sender.send_message("текст", 1, raise_on_failure=True)
+
+    async def test_throttled_too_long(self) -> None:
+        """После всех попыток торможения отправка не считается выполненной"""
+        bot = _Bot(_Throttled())
+        sender = _sender(bot)
+
+        with pytest.raises(MaxSendError):
+            await sender.send_message("текст", 1, raise_on_failure=True)
+        assert bot.calls == 5
@@ -0,0 +1,56 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from maxhack.core.utils.shard_leases import ShardLeases, ShardSet
+
+
+def _leases(redis: FakeAsyncRedis, shards: int = 4, lease: float = 0.2) -> ShardLeases:
+    return ShardLeases(redis=redis, key="test:shards", shards=shards, lease=lease)  # type: ignore[arg-type]
+
+
+class TestShardLeases:
+    async def test_workers_split_shards(self) -> None:
+        """Живые воркеры делят шарды поровну и не пересекаются"""
+        redis = FakeAsyncRedis()
+        first, second = _leases(redis), _leases(redis)
+
+        await first.heartbeat()
+        await second.heartbeat()
+        # первый узнаёт о втором и отдаёт ему лишнее
+        await first.heartbeat()
+        await second.heartbeat()
+
+        first_shards, second_shards = first.current(), second.current()
+        assert first_shards is not None
+        assert second_shards is not None
+        assert len(first_shards.owned) == len(second_shards.owned) == 2
+        assert first_shards.owned | second_shards.owned == {0, 1, 2, 3}
+
+    async def test_dead_worker_shards_are_taken_over(self) -> None:
+        """Шарды упавшего воркера достаются живым после конца аренды"""
+        redis = FakeAsyncRedis()
+        alive, dead = _leases(redis), _leases(redis)
+        await dead.heartbeat()
+        await alive.heartbeat()
+        assert dead.current() == ShardSet(total=4, owned=frozenset({0, 1, 2, 3}))
+
+        await asyncio.sleep(0.25)
+        await alive.heartbeat()
+
+        assert alive.current() == ShardSet(total=4, owned=frozenset({0, 1, 2, 3}))
+        # не продлевавший аренду воркер сам перестаёт считать шарды своими
+        assert dead.current() == ShardSet(total=4, owned=frozenset())
+
+    async def test_release_hands_shards_over(self) -> None:
+        redis = FakeAsyncRedis()
+        first, second = _leases(redis), _leases(redis)
+        await first.heartbeat()
+
+        await first.release()
+        await second.heartbeat()
+
+        assert second.current() == ShardSet(total=4, owned=frozenset({0, 1, 2, 3}))
+
+    def test_single_shard_is_not_sharded(self) -> None:
+        assert _leases(FakeAsyncRedis(), shards=1).current() is None
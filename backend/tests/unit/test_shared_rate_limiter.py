@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from maxhack.core.enums.send_priority import SendPriority
+from maxhack.core.utils.rate_limiter import RateLimitError
+from maxhack.core.utils.shared_rate_limiter import SharedRateLimiter
+
+
+def _limiter(redis: FakeAsyncRedis, **kwargs: float) -> SharedRateLimiter:
+    return SharedRateLimiter(redis=redis, key="test:rate", **kwargs)  # type: ignore[arg-type]
+
+
+class TestSharedRateLimiter:
+    async def test_limit_is_shared(self) -> None:
+        """Два ограничителя на одном ключе делят один лимит"""
+        redis = FakeAsyncRedis()
+        first = _limiter(redis, max_calls=50, period=0.5)
+        second = _limiter(redis, max_calls=50, period=0.5)
+
+        started = time.monotonic()
+        await asyncio.gather(
+            *(limiter.acquire() for limiter in (first, second) for _ in range(40)),
+        )
+
+        # без резерва бёрста нет: все 80 слотов по 10 мс
+        assert time.monotonic() - started >= 79 * 0.01 * 0.9
+
+    async def test_at_most_max_calls_per_period(self) -> None:
+        """В любое окно ``period`` попадает не больше ``max_calls`` вызовов"""
+        redis = FakeAsyncRedis()
+        first = _limiter(redis, max_calls=10, period=0.5, interactive_reserve=2)
+        second = _limiter(redis, max_calls=10, period=0.5, interactive_reserve=2)
+        moments: list[float] = []
+
+        async def call(limiter: SharedRateLimiter, priority: SendPriority) -> None:
+            await limiter.acquire(priority)
+            moments.append(time.monotonic())
+
+        await asyncio.gather(
+            *(call(first, SendPriority.INTERACTIVE) for _ in range(12)),
+            *(call(second, SendPriority.BULK) for _ in range(12)),
+        )
+
+        # окно чуть короче периода: просыпаться позже своего слота можно
+        busiest = max(
+            sum(start <= moment < start + 0.45 for moment in moments)
+            for start in moments
+        )
+        assert busiest <= 10
+
+    async def test_bulk_leaves_reserve_for_interactive(self) -> None:
+        """Рассылка не трогает резерв, ответ пользователю проходит без очереди"""
+        redis = FakeAsyncRedis()
+        limiter = _limiter(redis, max_calls=10, period=10, interactive_reserve=2)
+
+        # из бёрста в 3 слота рассылке достаётся только один
+        await limiter.acquire(SendPriority.BULK)
+
+        started = time.monotonic()
+        await limiter.acquire(SendPriority.INTERACTIVE)
+        await limiter.acquire(SendPriority.INTERACTIVE)
+        assert time.monotonic() - started < 0.1
+
+        bulk = asyncio.create_task(limiter.acquire(SendPriority.BULK))
+        await asyncio.sleep(0.05)
+        assert not bulk.done()
+        bulk.cancel()
+
+    async def test_urgent_lane_goes_first(self) -> None:
+        """Когда лимит выбран, срочное напоминание обгоняет заблаговременное"""
+        redis = FakeAsyncRedis()
+        limiter = _limiter(redis, max_calls=10, period=2, interactive_reserve=3)
+        for _ in range(4):
+            await limiter.acquire(SendPriority.INTERACTIVE)
+
+        reminder = asyncio.create_task(limiter.acquire(SendPriority.REMINDER))
+        urgent = asyncio.create_task(limiter.acquire(SendPriority.URGENT))
+        done, _ = await asyncio.wait(
+            (reminder, urgent),
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+        assert done == {urgent}
+        await reminder
+
+    async def test_falls_back_to_local_limit(self) -> None:
+        """Без Redis работает локальный лимит"""
+        redis = FakeAsyncRedis()
+        limiter = _limiter(redis, max_calls=100, period=0.5)
+
+        async def broken(**_: object) -> None:
+            raise RedisConnectionError
+
+        limiter._script = broken  # type: ignore[assignment]  # noqa: SLF001
+
+        started = time.monotonic()
+        for _ in range(110):
+            await limiter.acquire()
+
+        assert time.monotonic() - started >= 10 * 0.005 * 0.9
+
+    def test_invalid_reserve(self) -> None:
+        with pytest.raises(RateLimitError):
+            _limiter(FakeAsyncRedis(), max_calls=2, interactive_reserve=2)
+
+    async def test_throttling_cuts_rate_and_pauses(self) -> None:
+        """Ответ 429 снижает общий лимит и ставит паузу для всех процессов"""
+        redis = FakeAsyncRedis()
+        first = _limiter(redis, max_calls=100, period=1)
+        second = _limiter(redis, max_calls=100, period=1)
+
+        await first.throttled(retry_after=0.2)
+        # повторный сигнал того же всплеска не снижает лимит ещё раз
+        await first.throttled(retry_after=0.2)
+
+        state = await second.state()
+        assert state.factor == pytest.approx(0.5, abs=0.01)
+        assert state.rate == pytest.approx(50, abs=1)
+        assert 0.1 < state.paused_for <= 0.2
+        assert state.throttled == 0
+
+        started = time.monotonic()
+        await second.acquire()
+        await second.acquire()
+        # пауза, а затем интервал уже не 10, а 20 мс
+        assert time.monotonic() - started >= 0.15 + 0.02 * 0.9
+
+    async def test_rate_recovers_linearly(self) -> None:
+        """После торможения лимит постепенно возвращается к полному"""
+        redis = FakeAsyncRedis()
+        limiter = _limiter(redis, max_calls=100, period=1, recovery=2)
+
+        await limiter.throttled(retry_after=0)
+        assert (await limiter.state()).factor < 0.6
+
+        await asyncio.sleep(0.1)
+        assert (await limiter.state()).factor == pytest.approx(0.7, abs=0.05)
+
+        await asyncio.sleep(0.2)
+        assert (await limiter.state()).factor == 1
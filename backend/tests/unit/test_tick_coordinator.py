@@ -0,0 +1,59 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from maxhack.scheduler.coordinator import TickCoordinator
+
+
+def _coordinator(redis: FakeAsyncRedis) -> TickCoordinator:
+    return TickCoordinator(redis=redis, key="test:ticks", lock_timeout=1)  # type: ignore[arg-type]
+
+
+class TestTickCoordinator:
+    async def test_overlapping_tick_is_skipped(self) -> None:
+        """Пока идёт тик, такой же тик другой реплики не начинается"""
+        redis = FakeAsyncRedis()
+        first, second = _coordinator(redis), _coordinator(redis)
+        release = asyncio.Event()
+
+        async def slow_tick() -> str:
+            await release.wait()
+            return "done"
+
+        running = asyncio.create_task(first.run("tick", slow_tick))
+        await asyncio.sleep(0.01)
+
+        assert await second.run("tick", slow_tick) is None
+        assert await first.run("tick", slow_tick) is None
+
+        release.set()
+        assert await running == "done"
+        # после окончания тик снова можно запустить
+        assert await second.run("tick", slow_tick) == "done"
+
+        [stats] = await second.stats()
+        assert stats.name == "tick"
+        assert stats.runs == 2
+        assert stats.overlaps == 2
+        assert stats.max_duration is not None
+        assert stats.max_duration >= 0.01
+
+    async def test_not_exclusive_ticks_run_in_parallel(self) -> None:
+        """Без ``exclusive`` мешает только тик того же процесса"""
+        redis = FakeAsyncRedis()
+        first, second = _coordinator(redis), _coordinator(redis)
+        release = asyncio.Event()
+
+        async def slow_tick() -> None:
+            await release.wait()
+
+        running = asyncio.create_task(first.run("tick", slow_tick, exclusive=False))
+        await asyncio.sleep(0.01)
+        parallel = asyncio.create_task(second.run("tick", slow_tick, exclusive=False))
+        await asyncio.sleep(0.01)
+
+        release.set()
+        await asyncio.gather(running, parallel)
+        [stats] = await first.stats()
+        assert stats.runs == 2
+        assert stats.overlaps == 0